@@ -0,0 +1,496 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the deck generator.
+
+Usage:
+    python benchmarks.py [NAME ...] [--scale N] [--json]
+
+--scale multiplies the workload (e.g. how many copies of the 11-slide deck
+go into one package). Each benchmark prints its wall time plus any extra
+metrics it reports.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from pptx.util import Inches
+import brand_pack
+import create_presentation as cp
+import deck_package
+import functools
+import io
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+BENCHMARKS = {}
+
+SLIDE_BUILDERS = [entry.build for entry in cp.select_slides()]
+
+def benchmark(name):
+    """Register a benchmark; it takes `scale` and returns a metrics dict"""
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+    return register
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+def _noise_png(size):
+    from PIL import Image
+    image = Image.frombytes('RGB', (size, size), os.urandom(size * size * 3))
+    buf = io.BytesIO()
+    image.save(buf, format='PNG')
+    return buf.getvalue()
+
+def build_deck(copies=1, media=0, brand=None):
+    """Build the Module 1 deck `copies` times over, plus `media` embedded images"""
+    prs = cp.new_presentation(brand)
+
+    for _ in range(copies):
+        for build in SLIDE_BUILDERS:
+            build(prs)
+
+    slides = list(prs.slides)
+    for i in range(media):
+        slide = slides[i % len(slides)]
+        slide.shapes.add_picture(io.BytesIO(_noise_png(512)), Inches(1), Inches(1))
+    return prs
+
+@functools.lru_cache(maxsize=None)
+def _save_fixture(scale):
+    return build_deck(copies=scale, media=2 * scale)
+
+def _timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def write_progress_export(path, rows, lessons=6):
+    """Write a synthetic tripwire_progress CSV export with `rows` rows"""
+    rng = random.Random(0)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('tripwire_user_id,lesson_id,video_progress_percent,is_completed,watch_time_seconds\n')
+        for i in range(rows):
+            progress = rng.randint(0, 100)
+            f.write(f"user-{i // lessons:06d},{67 + i % lessons},{progress},"
+                    f"{'true' if progress > 90 else 'false'},{rng.randint(0, 3600)}\n")
+
+def contrast_brand():
+    """A second brand differing from the default in every palette slot, font and margin"""
+    return brand_pack.compile_brand({
+        'name': 'BENCHMARK CONTRAST',
+        'palette': {
+            slot: f'#{0x102030 + 0x010101 * i:06X}'
+            for i, slot in enumerate(brand_pack.SCHEME_SLOTS)
+        },
+        'fonts': {'heading': 'Georgia', 'body': 'Verdana', 'mono': 'Consolas'},
+        'layout': {'margin': 0.6, 'content_left': 0.8, 'content_top': 1.0},
+    })
+
+def render_bytes(brand, copies=1):
+    """Render and save a deck reproducibly; identical inputs give identical bytes"""
+    prs = build_deck(copies=copies, brand=brand)
+    buf = io.BytesIO()
+    deck_package.save_presentation(prs, buf, workers=1, reproducible=True)
+    return buf.getvalue()
+
+def render_job(out, slides=None):
+    """A create_presentation._job()-style job writing `slides` to `out`"""
+    return {
+        'slides': slides, 'variant': None, 'out': out,
+        'transcripts': None, 'media': None, 'reproducible': False,
+    }
+
+def _pss_mb(pid):
+    """Proportional set size of a process (shared pages split between sharers), or None"""
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+
+def _first_job_seconds(start_method, out):
+    """Seconds from submitting to a fresh pool to its first one-slide deck coming back.
+
+    Workers start on the first submit; a forked pool's one-time preload in
+    the parent happens before that and is measured separately.
+    """
+    from deck_workers import DeckWorkerPool
+    with DeckWorkerPool(1, start_method=start_method) as pool:
+        start = time.perf_counter()
+        pool.submit(render_job(out, slides='1')).result()
+        return time.perf_counter() - start
+
+def _workers_pss_mb(workers, start_method, jobs):
+    """Total PSS of `workers` workers after they rendered `jobs`, or None off Linux"""
+    from deck_workers import DeckWorkerPool
+    with DeckWorkerPool(workers, start_method=start_method) as pool:
+        list(pool.map(jobs))
+        pss = [_pss_mb(child.pid) for child in multiprocessing.active_children()]
+    return None if None in pss else round(sum(pss), 1)
+
+_PEAK_RSS_SCRIPT = """
+import create_presentation as cp, resource, sys
+slides = [entry.number for entry in cp.select_slides()] * int(sys.argv[1])
+budget = None if sys.argv[3] == 'none' else int(sys.argv[3])
+for event in cp.iter_presentation(slides=slides, output_path=sys.argv[2], memory_budget=budget):
+    pass
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def build_peak_rss_mb(copies, out, memory_budget=None):
+    """Peak RSS of a fresh process rendering the deck `copies` times over into one package"""
+    result = subprocess.run(
+        [sys.executable, '-c', _PEAK_RSS_SCRIPT, str(copies), out, str(memory_budget).lower()],
+        cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+    )
+    return round(int(result.stdout) / 1024, 1)  # ru_maxrss is in KiB on Linux
+
+def _fill_slide(count, stock=False):
+    """Seconds to add `count` rectangles to one slide"""
+    prs = cp.Presentation()
+    layout = prs.slide_layouts[6]
+    slide = prs.slides.add_slide(layout) if stock else cp.add_slide(prs, layout)
+    seconds, _ = _timed(_add_rectangles, slide, count)
+    return seconds
+
+def _add_rectangles(slide, count):
+    for i in range(count):
+        cp.add_rectangle(slide, Inches(i % 12), Inches(i % 7), Inches(0.5), Inches(0.5), cp.CYBER_ACID)
+
+def _fill_deck(count, stock=False):
+    """Seconds to add `count` slides, each with one text box"""
+    prs = cp.Presentation()
+    layout = prs.slide_layouts[6]
+    start = time.perf_counter()
+    for i in range(count):
+        slide = prs.slides.add_slide(layout) if stock else cp.add_slide(prs, layout)
+        cp.add_text_box(slide, Inches(0.5), Inches(0.8), Inches(4), Inches(1), f"Slide {i + 1}")
+    return time.perf_counter() - start
+
+def _scaling(func, count, unit, **kwargs):
+    """Per-item cost at `count` and 4x `count`; growth near 1.0 means linear"""
+    small = func(count, **kwargs) / count
+    seconds = func(4 * count, **kwargs)
+    large = seconds / (4 * count)
+    prefix = 'stock_' if kwargs.get('stock') else ''
+    return seconds, {
+        f'{prefix}us_per_{unit}': round(large * 1e6, 1),
+        f'{prefix}growth': round(large / small, 2),
+    }
+
+# ============================================================================
+# BENCHMARKS
+# ============================================================================
+
+@benchmark('build')
+def bench_build(scale):
+    seconds, prs = _timed(build_deck, copies=scale)
+    return {'seconds': seconds, 'slides': len(prs.slides)}
+
+@benchmark('deck')
+def bench_deck(scale):
+    """The Module 1 deck end to end (render and save), `scale` times"""
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, 'deck.pptx')
+        start = time.perf_counter()
+        for _ in range(scale):
+            cp.create_presentation(output_path=out, verbose=False)
+        seconds = time.perf_counter() - start
+        size = os.path.getsize(out)
+    return {'seconds': seconds, 'bytes': size}
+
+@benchmark('save_pptx')
+def bench_save_pptx(scale):
+    prs = _save_fixture(scale)
+    buf = io.BytesIO()
+    seconds, _ = _timed(prs.save, buf)
+    return {'seconds': seconds, 'bytes': len(buf.getvalue())}
+
+@benchmark('save_serial')
+def bench_save_serial(scale):
+    prs = _save_fixture(scale)
+    buf = io.BytesIO()
+    seconds, _ = _timed(deck_package.save_presentation, prs, buf, workers=1)
+    return {'seconds': seconds, 'bytes': len(buf.getvalue())}
+
+@benchmark('save_parallel')
+def bench_save_parallel(scale):
+    prs = _save_fixture(scale)
+    buf = io.BytesIO()
+    seconds, _ = _timed(deck_package.save_presentation, prs, buf)
+    return {'seconds': seconds, 'bytes': len(buf.getvalue())}
+
+@benchmark('alloc_shapes')
+def bench_alloc_shapes(scale):
+    count = 50 * scale
+    seconds, metrics = _scaling(_fill_slide, count, 'shape')
+    _, stock = _scaling(_fill_slide, count, 'shape', stock=True)
+    return {'seconds': seconds, 'shapes': 4 * count, **metrics, **stock}
+
+@benchmark('alloc_slides')
+def bench_alloc_slides(scale):
+    count = 25 * scale
+    seconds, metrics = _scaling(_fill_deck, count, 'slide')
+    _, stock = _scaling(_fill_deck, count, 'slide', stock=True)
+    return {'seconds': seconds, 'slides': 4 * count, **metrics, **stock}
+
+@benchmark('analytics')
+def bench_analytics(scale):
+    import deck_analytics
+    rows = 10_000 * scale
+    with tempfile.TemporaryDirectory() as tmp:
+        export = os.path.join(tmp, 'progress.csv')
+        write_progress_export(export, rows)
+        seconds, slides = _timed(
+            deck_analytics.build_analytics_deck, export, os.path.join(tmp, 'analytics.pptx')
+        )
+    return {'seconds': seconds, 'rows': rows, 'slides': slides}
+
+@benchmark('threads')
+def bench_threads(scale):
+    """Decks in two brands rendered concurrently must match their serial renders"""
+    brands = [brand_pack.get_brand(), contrast_brand()]
+    expected = [render_bytes(brand) for brand in brands]
+    decks = [i % len(brands) for i in range(4 * scale)]
+
+    metrics = {}
+    seconds = 0
+    for threads in (1, 2, 4, 8):
+        with ThreadPoolExecutor(threads) as executor:
+            elapsed, outputs = _timed(
+                lambda: list(executor.map(lambda i: render_bytes(brands[i]), decks))
+            )
+        bled = sum(output != expected[i] for i, output in zip(decks, outputs))
+        if bled:
+            raise AssertionError(f"{bled} of {len(decks)} decks differ from their serial render "
+                                 f"with {threads} threads")
+        metrics[f'decks_per_s_{threads}t'] = round(len(decks) / elapsed, 1)
+        seconds += elapsed
+    return {'seconds': seconds, 'decks': 4 * len(decks), **metrics}
+
+@benchmark('workers')
+def bench_workers(scale):
+    """Spawned vs forked worker startup, and total worker PSS for 1-4 workers"""
+    import deck_workers
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return {'seconds': 0, 'skipped': 'no fork'}
+
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, 'deck.pptx')
+        for start_method in ('spawn', 'fork'):
+            metrics[f'{start_method}_first_ms'] = round(_first_job_seconds(start_method, out) * 1000, 1)
+        # Forked workers start right away because the parent already paid for this
+        metrics['preload_ms'] = round(_timed(deck_workers.preload)[0] * 1000, 1)
+
+        start = time.perf_counter()
+        for workers in (1, 2, 4):
+            jobs = [render_job(os.path.join(tmp, f'deck{i}.pptx')) for i in range(scale * workers)]
+            for start_method in ('spawn', 'fork'):
+                pss = _workers_pss_mb(workers, start_method, jobs)
+                if pss is not None:
+                    metrics[f'{start_method}_pss_mb_{workers}w'] = pss
+    return {'seconds': time.perf_counter() - start, **metrics}
+
+@benchmark('split')
+def bench_split(scale):
+    """One large deck rendered serially vs split across 1, 2 and 4 forked workers"""
+    from deck_workers import DeckWorkerPool
+    if 'fork' not in multiprocessing.get_all_start_methods():
+        return {'seconds': 0, 'skipped': 'no fork'}
+
+    slides = ','.join(['1-11'] * (4 * scale))  # scale 10: 440 slides
+    metrics = {'slides': 44 * scale, 'cpus': os.cpu_count()}
+    with tempfile.TemporaryDirectory() as tmp:
+        job = render_job(os.path.join(tmp, 'deck.pptx'), slides=slides)
+        start = time.perf_counter()
+        metrics['serial_s'] = round(_timed(cp.render_job, job)[0], 2)
+        for workers in (1, 2, 4):
+            with DeckWorkerPool(workers) as pool:
+                metrics[f'split_s_{workers}w'] = round(_timed(pool.render_deck, job)[0], 2)
+    return {'seconds': time.perf_counter() - start, **metrics}
+
+@benchmark('progressive')
+def bench_progressive(scale):
+    """Time to the first iter_presentation() event vs the whole build"""
+    first = []
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        for i in range(scale):
+            deck_start = time.perf_counter()
+            events = cp.iter_presentation(output_path=os.path.join(tmp, f'deck{i}.pptx'))
+            next(events)
+            first.append(time.perf_counter() - deck_start)
+            for _ in events:
+                pass
+        seconds = time.perf_counter() - start
+    return {
+        'seconds': seconds,
+        'first_event_ms': round(sorted(first)[len(first) // 2] * 1000, 1),
+        'deck_ms': round(seconds / scale * 1000, 1),
+    }
+
+@benchmark('spill')
+def bench_spill(scale):
+    """Peak RSS for 1x and 10x the slides, in memory vs spilled beyond a 32 MB budget"""
+    copies = 9 * scale  # scale 10: ~1,000 and ~10,000 slides
+    metrics = {}
+    start = time.perf_counter()
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, 'deck.pptx')
+        for label, budget in (('memory', None), ('spill', 32 * 2**20)):
+            for count in (copies, 10 * copies):
+                slides = count * len(SLIDE_BUILDERS)
+                metrics[f'{label}_peak_mb_{slides}'] = build_peak_rss_mb(count, out, budget)
+    return {'seconds': time.perf_counter() - start, **metrics}
+
+@benchmark('patch')
+def bench_patch(scale):
+    """Copy fix on one slide of a large deck, and on a batch of decks, vs plain file copies"""
+    import deck_patch
+    import shutil
+    edits = deck_patch.parse_edits([{'slide': 3, 'find': 'до 40 мин', 'text': 'до 45 мин'}])
+    with tempfile.TemporaryDirectory() as tmp:
+        big = os.path.join(tmp, 'big.pptx')
+        deck_package.save_presentation(build_deck(copies=10 * scale, media=2 * scale), big)
+        copy_seconds, _ = _timed(shutil.copyfile, big, os.path.join(tmp, 'copy.pptx'))
+        patch_seconds, _ = _timed(deck_patch.patch_deck, big, edits, os.path.join(tmp, 'patched.pptx'))
+        deck_mb = os.path.getsize(big) / 2**20
+
+        batch_dir = os.path.join(tmp, 'batch')
+        os.mkdir(batch_dir)
+        cp.create_presentation(output_path=os.path.join(batch_dir, 'deck0.pptx'), verbose=False)
+        for i in range(1, 10 * scale):
+            shutil.copyfile(os.path.join(batch_dir, 'deck0.pptx'), os.path.join(batch_dir, f'deck{i}.pptx'))
+        batch_seconds, _ = _timed(deck_patch.patch_decks, [batch_dir], edits)
+    return {
+        'seconds': patch_seconds + batch_seconds,
+        'deck_mb': round(deck_mb, 1),
+        'copy_ms': round(copy_seconds * 1000, 1),
+        'patch_ms': round(patch_seconds * 1000, 1),
+        'batch_decks': 10 * scale,
+        'batch_ms_per_deck': round(batch_seconds / (10 * scale) * 1000, 2),
+    }
+
+@benchmark('replay')
+def bench_replay(scale):
+    """Replay a recorded render trace (DECK_TRACE, or the Module 1 deck's) `scale` times"""
+    import deck_trace
+    with tempfile.TemporaryDirectory() as tmp:
+        trace = os.environ.get('DECK_TRACE')
+        if not trace:
+            trace = os.path.join(tmp, 'deck.trace.gz')
+            with deck_trace.record_trace(trace):
+                cp.render_slides(cp.new_presentation(), cp.select_slides())
+        start = time.perf_counter()
+        for _ in range(scale):
+            prs = deck_trace.replay_trace(trace)
+        seconds = time.perf_counter() - start
+        calls = sum(calls for calls, _ in deck_trace.trace_stats(trace).values())
+        trace_kb = os.path.getsize(trace) / 1024
+    return {
+        'seconds': seconds,
+        'slides': len(prs.slides),
+        'calls': calls,
+        'trace_kb': round(trace_kb, 1),
+        'ms_per_replay': round(seconds / scale * 1000, 1),
+    }
+
+@benchmark('import')
+def bench_import(scale):
+    """Import a directory of decks into build specs, then render the specs"""
+    import deck_import
+    import shutil
+    decks = 4 * scale
+    with tempfile.TemporaryDirectory() as tmp:
+        cp.create_presentation(output_path=os.path.join(tmp, 'deck0.pptx'), verbose=False)
+        for i in range(1, decks):
+            shutil.copyfile(os.path.join(tmp, 'deck0.pptx'), os.path.join(tmp, f'deck{i}.pptx'))
+        import_seconds, results = _timed(deck_import.import_decks, [tmp])
+        spec = cp.load_spec(results[0][1])
+        render_seconds, _ = _timed(cp.render_job, cp._job(cp.parse_args([]), spec))
+    return {
+        'seconds': import_seconds + render_seconds,
+        'decks': decks,
+        'shapes_per_deck': results[0][2][1],
+        'import_ms_per_deck': round(import_seconds / decks * 1000, 1),
+        'render_ms': round(render_seconds * 1000, 1),
+    }
+
+def _write_srt(path, lines):
+    with open(path, 'w', encoding='utf-8') as f:
+        for i, line in enumerate(lines):
+            f.write(f"{i + 1}\n00:{i // 60:02d}:{i % 60:02d},000 --> 00:{i // 60:02d}:{i % 60:02d},900\n{line}\n\n")
+
+@benchmark('variants')
+def bench_variants(scale):
+    """Cohort variants differing only in the last lesson's notes: shared prefix vs full builds"""
+    from deck_variants import render_variants
+    count = 5 * scale
+    with tempfile.TemporaryDirectory() as tmp:
+        jobs = []
+        for i in range(count):
+            transcript = os.path.join(tmp, f'lesson_1_6_{i}.srt')
+            _write_srt(transcript, [f'Cohort {i}, line {n}' for n in range(120)])
+            jobs.append(dict(render_job(os.path.join(tmp, f'v{i}.pptx')), transcripts={'1.6': transcript}))
+        shared_seconds, _ = _timed(render_variants, jobs)
+        full_seconds, _ = _timed(lambda: [cp.render_job(job) for job in jobs])
+    return {
+        'seconds': shared_seconds,
+        'variants': count,
+        'full_seconds': round(full_seconds, 3),
+        'speedup': round(full_seconds / shared_seconds, 2),
+    }
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def run(names=None, scale=10):
+    """Run benchmarks by name (all by default); return {name: metrics}"""
+    results = {}
+    for name in names or BENCHMARKS:
+        results[name] = BENCHMARKS[name](scale)
+    return results
+
+def format_metrics(metrics):
+    parts = [f"{metrics['seconds'] * 1000:9.1f} ms"]
+    parts += [f"{key}={value}" for key, value in metrics.items() if key != 'seconds']
+    return '  '.join(parts)
+
+def main(argv):
+    scale = 10
+    if '--scale' in argv:
+        i = argv.index('--scale')
+        scale = int(argv[i + 1])
+        argv = argv[:i] + argv[i + 2:]
+
+    as_json = '--json' in argv
+    argv = [arg for arg in argv if arg != '--json']
+
+    unknown = [name for name in argv if name not in BENCHMARKS]
+    if unknown:
+        print(f"Unknown benchmark(s): {', '.join(unknown)}")
+        print(f"Available: {', '.join(BENCHMARKS)}")
+        return 2
+
+    if as_json:
+        print(json.dumps(run(argv, scale)))
+        return 0
+
+    print(f"scale={scale}")
+    for name, metrics in run(argv, scale).items():
+        print(f"{name:<16} {format_metrics(metrics)}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
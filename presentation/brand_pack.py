@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Brand packs: palette, fonts and layout metrics loaded from JSON files.
+
+A pack is compiled once per process into an immutable Brand and cached by
+path + mtime, and the theme part it produces is cached per base template, so
+rendering another deck with a brand already in use is a dict lookup. Slide
+builders find the brand of the deck they are drawing on with
+render_context.brand_of().
+
+Pack format (layout values in inches; see brands/cyber_architecture.json):
+    {
+      "name": "CYBER-ARCHITECTURE v3.0",
+      "palette": {"dk1": "#030303", "accent1": "#00FF88", ...},
+      "fonts": {"heading": "Arial Black", "body": "Arial", "mono": "Courier New"},
+      "layout": {"margin": 0.4, "content_left": 0.5, "content_top": 0.8}
+    }
+"""
+
+from collections import namedtuple
+from deck_metrics import record_cache
+from deck_theme import SCHEME_SLOTS, apply_fonts, apply_palette, normalize_palette
+from pptx.util import Inches
+from threading import Lock
+from types import MappingProxyType
+import hashlib
+import json
+import os
+
+BRAND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'brands')
+DEFAULT_BRAND = 'cyber_architecture'
+
+# Font roles used by the shape helpers instead of literal typefaces
+HEADING = 'heading'
+BODY = 'body'
+MONO = 'mono'
+FONT_ROLES = (HEADING, BODY, MONO)
+
+Brand = namedtuple('Brand', 'name key palette fonts margin content_left content_top')
+
+_brands = {}           # (path, mtime_ns, size) -> Brand
+_theme_blobs = {}      # (brand.key, base theme bytes) -> themed bytes
+_lock = Lock()
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def compile_brand(data, key=None):
+    """Build an immutable Brand from a parsed pack"""
+    palette = normalize_palette(data['palette'])
+    missing = [slot for slot in SCHEME_SLOTS if slot not in palette]
+    if missing:
+        raise ValueError(f"Brand palette is missing slots: {', '.join(missing)}")
+
+    fonts = data['fonts']
+    missing = [role for role in FONT_ROLES if role not in fonts]
+    if missing:
+        raise ValueError(f"Brand fonts are missing roles: {', '.join(missing)}")
+
+    layout = data.get('layout', {})
+    if key is None:
+        key = hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest()
+    return Brand(
+        name=data['name'],
+        key=key,
+        palette=MappingProxyType(palette),
+        fonts=MappingProxyType({role: fonts[role] for role in FONT_ROLES}),
+        margin=Inches(layout.get('margin', 0.4)),
+        content_left=Inches(layout.get('content_left', 0.5)),
+        content_top=Inches(layout.get('content_top', 0.8)),
+    )
+
+def brand_path(name):
+    """Resolve a pack name ("cyber_architecture") or path to a file path"""
+    if os.path.sep in name or name.endswith('.json'):
+        return os.path.abspath(name)
+    return os.path.join(BRAND_DIR, f'{name}.json')
+
+def get_brand(name=DEFAULT_BRAND):
+    """Load and compile a brand pack, reusing the compiled Brand while the file is unchanged"""
+    path = brand_path(name)
+    stat = os.stat(path)
+    cache_key = (path, stat.st_mtime_ns, stat.st_size)
+
+    brand = _brands.get(cache_key)
+    record_cache('brand_pack', brand is not None)
+    if brand is None:
+        with open(path, 'rb') as f:
+            raw = f.read()
+        brand = compile_brand(json.loads(raw), key=hashlib.sha256(raw).hexdigest())
+        with _lock:
+            brand = _brands.setdefault(cache_key, brand)
+    return brand
+
+# ============================================================================
+# THEMES
+# ============================================================================
+
+def theme_blob(brand, base_blob):
+    """Theme part bytes for `brand`, compiled once per base template"""
+    cache_key = (brand.key, base_blob)
+    blob = _theme_blobs.get(cache_key)
+    record_cache('brand_theme', blob is not None)
+    if blob is None:
+        blob = apply_palette(base_blob, brand.palette, name=brand.name)
+        blob = apply_fonts(blob, major=brand.fonts[HEADING], minor=brand.fonts[BODY])
+        with _lock:
+            blob = _theme_blobs.setdefault(cache_key, blob)
+    return blob
@@ -17,10 +17,11 @@ const COLORS = {
   SIGNAL_RED: 'FF3366',      // Warnings
   HOLO_WHITE: 'FFFFFF',      // Main text
   TECH_GRAY: '9CA3AF',       // Secondary text
-  ACID_15: '0D2B1B',         // ~15% green on black
-  ACID_30: '154D2F',         // ~30% green on black
-  RED_10: '2B0D15',          // ~10% red on black
-  GREEN_10: '0D2B1B',        // ~10% green on black
+  // Tints below match the lumMod/lumOff tints create_presentation.py draws
+  ACID_15: '002614',         // ~15% green on black
+  ACID_30: '004D29',         // ~30% green on black
+  RED_10: '2E000B',          // ~10% red on black
+  GREEN_10: '002614',        // ~10% green on black
   SURFACE_90: '0C0C0C',      // Surface
   BORDER_SUBTLE: '202020',   // Subtle border
 };
@@ -1018,13 +1019,15 @@ async function createPresentation() {
   createSlide11LetsGo(pptx);
 
   // Save the presentation
-  const outputPath = path.join(__dirname, 'VIBE_CODING_MODULE1_INTRO.pptx');
+  // Optional output path: node create_presentation.cjs [OUT.pptx]
+  const outputPath = process.argv[2] || path.join(__dirname, 'VIBE_CODING_MODULE1_INTRO.pptx');
 
   try {
     await pptx.writeFile({ fileName: outputPath });
     console.log(`\nPresentation saved to: ${outputPath}`);
   } catch (err) {
     console.error('Error saving presentation:', err);
+    process.exitCode = 1;
   }
 }
 
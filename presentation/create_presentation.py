@@ -2,33 +2,98 @@
 """
 VIBE CODING STARTER - Module 1 Presentation Generator
 Brand: CYBER-ARCHITECTURE v3.0
+
+Usage:
+    python create_presentation.py                      # full deck
+    python create_presentation.py --slides 4-6         # lesson slides only
+    python create_presentation.py --variant PACK --out DECK.pptx
+    python create_presentation.py --spec build.json
+    python create_presentation.py --spec a.json --spec b.json --workers 4
+    python create_presentation.py --spec a.json --spec b.json --no-share-prefix
+    python create_presentation.py --spec legacy.spec.json   # imported: deck_import.py
+    python create_presentation.py --slides 1-11,1-11 --workers 4   # one deck, split
+    python create_presentation.py --progress           # JSON line per slide
+    python create_presentation.py --results progress.csv   # real numbers on slide 10
+    python create_presentation.py --trace build.trace.gz   # replay: deck_trace.py
+    python create_presentation.py --dry-run [--slides 4-6] > layout.json
+    python create_presentation.py --list
 """
 
 from pptx import Presentation
+from pptx.api import _default_pptx_path
 from pptx.util import Inches, Pt, Emu
-from pptx.dml.color import RgbColor
+from pptx.enum.dml import MSO_THEME_COLOR
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
+from pptx.chart.data import CategoryChartData
+from pptx.enum.chart import XL_CHART_TYPE, XL_LABEL_POSITION
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.parts.slide import SlidePart
 from pptx.oxml.ns import nsmap
 from pptx.oxml import parse_xml
+from deck_metrics import (
+    BYTES_WRITTEN, DECK_SLIDES, DECKS_RENDERED, RENDER_SECONDS, SAVE_SECONDS,
+    counted, dump_metrics, serve_metrics, worker_busy,
+)
+from brand_pack import BODY, DEFAULT_BRAND, HEADING, MONO, get_brand, theme_blob
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from deck_compose import parse_slide_ranges
+from deck_layout import LayoutDeck, LayoutSlide, TextRun, check_layout
+from deck_package import save_presentation, write_build_manifest
+from deck_spill import SlideSpool
+from deck_trace import record_trace, traced
+from lesson_media import add_lesson_media, load_media_map
+from lesson_notes import LESSON_SLIDES, add_lesson_notes, parse_transcript_args
+from render_context import RenderContext, bind_context, brand_of, context_of
+import argparse
+import asyncio
+import io
+import json
 import os
+import sys
+import time
 
 # ============================================================================
 # BRAND COLORS
 # ============================================================================
-CYBER_ACID = RgbColor(0x00, 0xFF, 0x88)      # #00FF88 - CTA, accents
-CYBER_VOID = RgbColor(0x03, 0x03, 0x03)      # #030303 - Background
-CYBER_SURFACE = RgbColor(0x0A, 0x0A, 0x0A)   # #0A0A0A - Cards
-SIGNAL_RED = RgbColor(0xFF, 0x33, 0x66)      # #FF3366 - Warnings
-HOLO_WHITE = RgbColor(0xFF, 0xFF, 0xFF)      # #FFFFFF - Main text
-TECH_GRAY = RgbColor(0x9C, 0xA3, 0xAF)       # #9CA3AF - Secondary text
-
-# Semi-transparent versions (simulated with solid colors for PPTX)
-ACID_15 = RgbColor(0x0D, 0x2B, 0x1B)         # ~15% green on black
-ACID_30 = RgbColor(0x15, 0x4D, 0x2F)         # ~30% green on black
-RED_10 = RgbColor(0x2B, 0x0D, 0x15)          # ~10% red on black
-GREEN_10 = RgbColor(0x0D, 0x2B, 0x1B)        # ~10% green on black
-SURFACE_90 = RgbColor(0x0C, 0x0C, 0x0C)      # Surface with slight transparency
+# Shapes reference theme color slots (<a:schemeClr>), never literal sRGB values.
+# The actual colors live only in ppt/theme/theme1.xml (from the brand pack), so a
+# stored deck can be re-skinned with deck_theme.reskin_deck() without a rebuild.
+CYBER_ACID = MSO_THEME_COLOR.ACCENT_1        # #00FF88 - CTA, accents
+CYBER_VOID = MSO_THEME_COLOR.DARK_1          # #030303 - Background
+CYBER_SURFACE = MSO_THEME_COLOR.DARK_2       # #0A0A0A - Cards
+SIGNAL_RED = MSO_THEME_COLOR.ACCENT_2        # #FF3366 - Warnings
+HOLO_WHITE = MSO_THEME_COLOR.LIGHT_1         # #FFFFFF - Main text
+TECH_GRAY = MSO_THEME_COLOR.LIGHT_2          # #9CA3AF - Secondary text
+
+# A theme color with its HSL lightness shifted (<a:lumMod>/<a:lumOff>): -0.85
+# keeps 15% of the lightness, +0.1 moves 10% of the way to white. Tints follow
+# a re-skin like their base slot, and leave the accent/hyperlink slots free.
+Tint = namedtuple('Tint', 'theme_color brightness')
+
+# Semi-transparent versions (simulated with solid tints for PPTX)
+ACID_15 = Tint(CYBER_ACID, -0.85)            # ~15% green on black
+ACID_30 = Tint(CYBER_ACID, -0.7)             # ~30% green on black
+RED_10 = Tint(SIGNAL_RED, -0.85)             # ~10% red on black
+GREEN_10 = ACID_15                           # ~10% green on black (same as ACID_15)
+SURFACE_90 = Tint(CYBER_SURFACE, 0.01)       # Surface with slight transparency
+CARD_EDGE = Tint(CYBER_SURFACE, 0.09)        # #202020 - Default card border
+TINTS = (ACID_15, ACID_30, RED_10, SURFACE_90, CARD_EDGE)
+
+def set_color(color_format, color):
+    """Point a ColorFormat (fill, line or font color) at a theme color or a Tint"""
+    color_format.theme_color = getattr(color, 'theme_color', color)
+    brightness = getattr(color, 'brightness', 0)
+    if brightness:
+        color_format.brightness = brightness
+
+def color_name(color):
+    """Theme color name of a color, with the tint appended ('ACCENT_1-0.85')"""
+    brightness = getattr(color, 'brightness', 0)
+    name = getattr(color, 'theme_color', color).name
+    return f'{name}{brightness:+g}' if brightness else name
 
 # ============================================================================
 # DIMENSIONS (16:9 - 1920x1080 in EMU)
@@ -36,27 +101,111 @@ SURFACE_90 = RgbColor(0x0C, 0x0C, 0x0C)      # Surface with slight transparency
 SLIDE_WIDTH = Inches(13.333)   # 1920px at 144dpi ~ 13.33"
 SLIDE_HEIGHT = Inches(7.5)     # 1080px at 144dpi ~ 7.5"
 
-# Margins
-MARGIN = Inches(0.4)           # ~32px minimum margin
-CONTENT_LEFT = Inches(0.5)
-CONTENT_TOP = Inches(0.8)
+# Margins and fonts come from the brand pack (brand_pack.py, brands/*.json).
+# These are defaults for new decks: helpers read the size of the deck they
+# draw on from its RenderContext (render_context.py).
 
 # ============================================================================
 # HELPER FUNCTIONS
 # ============================================================================
 
+_template_blob = None
+
+def template_blob():
+    """python-pptx's default template, read once per process (and shared by forked workers)"""
+    global _template_blob
+    if _template_blob is None:
+        with open(_default_pptx_path(), 'rb') as f:
+            _template_blob = f.read()
+    return _template_blob
+
+def new_presentation(brand=None, slide_width=SLIDE_WIDTH, slide_height=SLIDE_HEIGHT):
+    """Empty deck with the brand theme applied and its own RenderContext"""
+    prs = Presentation(io.BytesIO(template_blob()))
+    prs.slide_width = slide_width
+    prs.slide_height = slide_height
+    apply_brand_theme(prs, brand)
+    return prs
+
+def apply_brand_theme(prs, brand=None):
+    """Write the brand palette and fonts into the theme and bind a RenderContext to `prs`"""
+    brand = brand or get_brand()
+    theme_part = prs.slide_master.part.part_related_by(RT.THEME)
+    theme_part.blob = theme_blob(brand, theme_part.blob)
+    bind_context(prs, RenderContext(brand, prs.slide_width, prs.slide_height))
+    return brand
+
+def _font(slide, font_name):
+    """Typeface for a font role (HEADING/BODY/MONO); other names pass through"""
+    return brand_of(slide).fonts.get(font_name, font_name)
+
+def _run(slide, text, font_name, font_size, font_bold, font_color):
+    """Dry-run record of one text run, styled as the helper would style it"""
+    return TextRun(str(text), _font(slide, font_name), font_size, bool(font_bold), color_name(font_color))
+
+# ============================================================================
+# SLIDE ALLOCATION
+# ============================================================================
+# python-pptx picks every new slide id, slide rId and shape id by scanning what
+# is already there, which makes big generated decks quadratic. The generator
+# keeps its own counters instead: slide counters in the deck's RenderContext,
+# and a cached max shape id per slide (python-pptx's turbo-add mode).
+
+MAX_SLIDE_ID = 2147483647
+
+@traced
+def add_slide(prs, slide_layout):
+    """Append a slide without scanning existing slides, rels or shape ids.
+
+    Counters live in the deck's RenderContext, so add every slide of a deck through here
+    rather than mixing in prs.slides.add_slide().
+    """
+    if isinstance(prs, LayoutDeck):
+        return prs.add_slide()
+
+    ctx = context_of(prs)
+    slides = prs.slides
+
+    partname = PackURI(f'/ppt/slides/slide{ctx.next_slide_number}.xml')
+    slide_part = SlidePart.new(partname, prs.part.package, slide_layout.part)
+    # A new part can't already be related, so skip relate_to()'s lookup
+    rId = prs.part.rels._add_relationship(RT.SLIDE, slide_part)
+
+    if ctx.next_slide_id > MAX_SLIDE_ID:
+        slides._sldIdLst.add_sldId(rId)  # Ids exhausted: let python-pptx reuse a gap
+    else:
+        slides._sldIdLst._add_sldId(id=ctx.next_slide_id, rId=rId)
+        ctx.next_slide_id += 1
+    ctx.next_slide_number += 1
+
+    slide = slide_part.slide
+    slide.shapes.turbo_add_enabled = True
+    slide.shapes.clone_layout_placeholders(slide_layout)
+    return slide
+
+@counted
 def set_slide_background(slide, color):
     """Set solid background color for slide"""
+    if isinstance(slide, LayoutSlide):
+        slide.background = color_name(color)
+        return
+
     background = slide.background
     fill = background.fill
     fill.solid()
-    fill.fore_color.rgb = color
+    set_color(fill.fore_color, color)
 
+@counted
 def add_text_box(slide, left, top, width, height, text,
-                 font_name='Arial', font_size=28, font_bold=False,
+                 font_name=BODY, font_size=28, font_bold=False,
                  font_color=HOLO_WHITE, alignment=PP_ALIGN.LEFT,
                  vertical_anchor=MSO_ANCHOR.TOP):
     """Add a text box with specified formatting"""
+    if isinstance(slide, LayoutSlide):
+        return slide.record('text', left, top, width, height, text, [
+            _run(slide, text, font_name, font_size, font_bold, font_color),
+        ])
+
     txBox = slide.shapes.add_textbox(left, top, width, height)
     tf = txBox.text_frame
     tf.word_wrap = True
@@ -64,32 +213,38 @@ def add_text_box(slide, left, top, width, height, text,
 
     p = tf.paragraphs[0]
     p.text = text
-    p.font.name = font_name
+    p.font.name = _font(slide, font_name)
     p.font.size = Pt(font_size)
     p.font.bold = font_bold
-    p.font.color.rgb = font_color
+    set_color(p.font.color, font_color)
     p.alignment = alignment
 
     tf.vertical_anchor = vertical_anchor
 
     return txBox
 
+@counted
 def add_shape_with_text(slide, left, top, width, height, text,
                         shape_type=MSO_SHAPE.ROUNDED_RECTANGLE,
                         fill_color=None, line_color=None, line_width=Pt(1),
-                        font_name='Arial', font_size=28, font_bold=False,
+                        font_name=BODY, font_size=28, font_bold=False,
                         font_color=HOLO_WHITE, alignment=PP_ALIGN.CENTER):
     """Add a shape with centered text"""
+    if isinstance(slide, LayoutSlide):
+        return slide.record('shape', left, top, width, height, text, [
+            _run(slide, text, font_name, font_size, font_bold, font_color),
+        ])
+
     shape = slide.shapes.add_shape(shape_type, left, top, width, height)
 
     if fill_color:
         shape.fill.solid()
-        shape.fill.fore_color.rgb = fill_color
+        set_color(shape.fill.fore_color, fill_color)
     else:
         shape.fill.background()
 
     if line_color:
-        shape.line.color.rgb = line_color
+        set_color(shape.line.color, line_color)
         shape.line.width = line_width
     else:
         shape.line.fill.background()
@@ -98,184 +253,344 @@ def add_shape_with_text(slide, left, top, width, height, text,
     tf.word_wrap = True
     p = tf.paragraphs[0]
     p.text = text
-    p.font.name = font_name
+    p.font.name = _font(slide, font_name)
     p.font.size = Pt(font_size)
     p.font.bold = font_bold
-    p.font.color.rgb = font_color
+    set_color(p.font.color, font_color)
     p.alignment = alignment
     tf.vertical_anchor = MSO_ANCHOR.MIDDLE
 
     return shape
 
+@counted
 def add_rectangle(slide, left, top, width, height, fill_color=None,
                   line_color=None, line_width=Pt(1)):
     """Add a simple rectangle"""
+    if isinstance(slide, LayoutSlide):
+        return slide.record('rectangle', left, top, width, height)
+
     shape = slide.shapes.add_shape(MSO_SHAPE.RECTANGLE, left, top, width, height)
 
     if fill_color:
         shape.fill.solid()
-        shape.fill.fore_color.rgb = fill_color
+        set_color(shape.fill.fore_color, fill_color)
     else:
         shape.fill.background()
 
     if line_color:
-        shape.line.color.rgb = line_color
+        set_color(shape.line.color, line_color)
         shape.line.width = line_width
     else:
         shape.line.fill.background()
 
     return shape
 
+@counted
 def add_line(slide, start_x, start_y, end_x, end_y, color=CYBER_ACID, width=Pt(3)):
     """Add a line"""
+    if isinstance(slide, LayoutSlide):
+        return slide.record('line', start_x, start_y, end_x - start_x, end_y - start_y)
+
     line = slide.shapes.add_connector(
         1,  # straight connector
         start_x, start_y, end_x, end_y
     )
-    line.line.color.rgb = color
+    set_color(line.line.color, color)
     line.line.width = width
     return line
 
+@counted
 def add_badge(slide, text, right_offset=Inches(0.5), top=Inches(0.4)):
     """Add a lesson badge in top-right corner"""
     badge_width = Inches(1.8)
     badge_height = Inches(0.45)
-    left = SLIDE_WIDTH - badge_width - right_offset
+    left = context_of(slide).slide_width - badge_width - right_offset
 
     badge = add_shape_with_text(
         slide, left, top, badge_width, badge_height, text,
         shape_type=MSO_SHAPE.ROUNDED_RECTANGLE,
         fill_color=CYBER_ACID,
-        font_name='Courier New', font_size=18, font_bold=True,
+        font_name=MONO, font_size=18, font_bold=True,
         font_color=CYBER_VOID
     )
     return badge
 
+@counted
 def add_footer(slide, text="VIBE CODING STARTER • МОДУЛЬ 1"):
     """Add footer text at bottom"""
+    ctx = context_of(slide)
     add_text_box(
-        slide, CONTENT_LEFT, SLIDE_HEIGHT - Inches(0.6),
+        slide, ctx.brand.content_left, ctx.slide_height - Inches(0.6),
         Inches(6), Inches(0.4), text,
-        font_name='Courier New', font_size=14,
+        font_name=MONO, font_size=14,
         font_color=TECH_GRAY
     )
 
+@counted
 def add_card(slide, left, top, width, height, fill_color=SURFACE_90,
              border_color=None, border_width=Pt(1)):
     """Add a card (rounded rectangle with subtle styling)"""
+    if isinstance(slide, LayoutSlide):
+        return slide.record('card', left, top, width, height)
+
     card = slide.shapes.add_shape(
         MSO_SHAPE.ROUNDED_RECTANGLE, left, top, width, height
     )
     card.fill.solid()
-    card.fill.fore_color.rgb = fill_color
+    set_color(card.fill.fore_color, fill_color)
 
     if border_color:
-        card.line.color.rgb = border_color
+        set_color(card.line.color, border_color)
         card.line.width = border_width
     else:
-        card.line.color.rgb = RgbColor(0x20, 0x20, 0x20)
+        set_color(card.line.color, CARD_EDGE)
         card.line.width = Pt(1)
 
     return card
 
+@counted
 def add_number_indicator(slide, left, top, number, size=Inches(0.7)):
     """Add a square number indicator with green accent"""
+    if isinstance(slide, LayoutSlide):
+        return slide.record('number', left, top, size, size, str(number), [
+            _run(slide, number, HEADING, 36, True, CYBER_ACID),
+        ])
+
     # Background shape
     shape = slide.shapes.add_shape(
         MSO_SHAPE.ROUNDED_RECTANGLE, left, top, size, size
     )
     shape.fill.solid()
-    shape.fill.fore_color.rgb = ACID_15
-    shape.line.color.rgb = ACID_30
+    set_color(shape.fill.fore_color, ACID_15)
+    set_color(shape.line.color, ACID_30)
     shape.line.width = Pt(1)
 
     # Number text
     tf = shape.text_frame
     p = tf.paragraphs[0]
     p.text = str(number)
-    p.font.name = 'Arial Black'
+    p.font.name = _font(slide, HEADING)
     p.font.size = Pt(36)
     p.font.bold = True
-    p.font.color.rgb = CYBER_ACID
+    set_color(p.font.color, CYBER_ACID)
     p.alignment = PP_ALIGN.CENTER
     tf.vertical_anchor = MSO_ANCHOR.MIDDLE
 
     return shape
 
+@counted
 def add_step_circle(slide, left, top, number, size=Inches(0.5)):
     """Add a circular step number"""
+    if isinstance(slide, LayoutSlide):
+        return slide.record('step', left, top, size, size, str(number), [
+            _run(slide, number, HEADING, 22, True, CYBER_VOID),
+        ])
+
     circle = slide.shapes.add_shape(
         MSO_SHAPE.OVAL, left, top, size, size
     )
     circle.fill.solid()
-    circle.fill.fore_color.rgb = CYBER_ACID
+    set_color(circle.fill.fore_color, CYBER_ACID)
     circle.line.fill.background()
 
     tf = circle.text_frame
     p = tf.paragraphs[0]
     p.text = str(number)
-    p.font.name = 'Arial Black'
+    p.font.name = _font(slide, HEADING)
     p.font.size = Pt(22)
     p.font.bold = True
-    p.font.color.rgb = CYBER_VOID
+    set_color(p.font.color, CYBER_VOID)
     p.alignment = PP_ALIGN.CENTER
     tf.vertical_anchor = MSO_ANCHOR.MIDDLE
 
     return circle
 
+@counted
 def add_checkbox(slide, left, top, checked=True, size=Inches(0.35)):
     """Add a checkbox with checkmark"""
+    if isinstance(slide, LayoutSlide):
+        if not checked:
+            return slide.record('checkbox', left, top, size, size)
+        return slide.record('checkbox', left, top, size, size, '+', [
+            _run(slide, '+', BODY, 18, True, CYBER_ACID),
+        ])
+
     box = slide.shapes.add_shape(
         MSO_SHAPE.ROUNDED_RECTANGLE, left, top, size, size
     )
     box.fill.background()
-    box.line.color.rgb = CYBER_ACID
+    set_color(box.line.color, CYBER_ACID)
     box.line.width = Pt(2)
 
     if checked:
         tf = box.text_frame
         p = tf.paragraphs[0]
         p.text = "+"
-        p.font.name = 'Arial'
+        p.font.name = _font(slide, BODY)
         p.font.size = Pt(18)
         p.font.bold = True
-        p.font.color.rgb = CYBER_ACID
+        set_color(p.font.color, CYBER_ACID)
         p.alignment = PP_ALIGN.CENTER
         tf.vertical_anchor = MSO_ANCHOR.MIDDLE
 
     return box
 
+@counted
+def add_bar_chart(slide, left, top, width, height, categories, values,
+                  series_name='', number_format='0', bar_color=CYBER_ACID):
+    """Add a column chart styled for the dark brand background"""
+    if isinstance(slide, LayoutSlide):
+        text = '\n'.join(f"{c}\t{float(v):g}" for c, v in zip(categories, values))
+        return slide.record('chart', left, top, width, height, text, [
+            # Category axis labels, then data labels
+            _run(slide, '\n'.join(map(str, categories)), BODY, 14, False, TECH_GRAY),
+            _run(slide, '\n'.join(f"{float(v):g}" for v in values), BODY, 14, True, HOLO_WHITE),
+        ])
+
+    chart_data = CategoryChartData(number_format=number_format)
+    chart_data.categories = [str(c) for c in categories]
+    chart_data.add_series(series_name, [float(v) for v in values])
+
+    frame = slide.shapes.add_chart(
+        XL_CHART_TYPE.COLUMN_CLUSTERED, left, top, width, height, chart_data
+    )
+    chart = frame.chart
+    chart.has_legend = False
+    chart.font.name = _font(slide, BODY)
+    chart.font.size = Pt(14)
+    set_color(chart.font.color, TECH_GRAY)
+
+    plot = chart.plots[0]
+    plot.gap_width = 60
+    plot.has_data_labels = True
+    labels = plot.data_labels
+    labels.number_format = number_format
+    labels.number_format_is_linked = False
+    labels.position = XL_LABEL_POSITION.OUTSIDE_END
+    labels.font.bold = True
+    set_color(labels.font.color, HOLO_WHITE)
+
+    series = plot.series[0]
+    series.format.fill.solid()
+    set_color(series.format.fill.fore_color, bar_color)
+
+    value_axis = chart.value_axis
+    value_axis.visible = False
+    value_axis.has_major_gridlines = False
+    set_color(chart.category_axis.format.line.color, CARD_EDGE)
+
+    return frame
+
+@counted
+def add_data_table(slide, left, top, width, header, rows,
+                   col_widths=None, row_height=Inches(0.45), font_size=14,
+                   highlight_rows=()):
+    """Add a table: acid header row, surface body rows, optional highlighted rows"""
+    if isinstance(slide, LayoutSlide):
+        text = '\n'.join('\t'.join(map(str, values)) for values in [header, *rows])
+        runs = [_run(slide, value, MONO, font_size, True, CYBER_ACID) for value in header]
+        runs.extend(
+            _run(slide, value, BODY, font_size, False, HOLO_WHITE) for values in rows for value in values
+        )
+        return slide.record('table', left, top, width, row_height * (len(rows) + 1), text, runs)
+
+    frame = slide.shapes.add_table(
+        len(rows) + 1, len(header), left, top, width, row_height * (len(rows) + 1)
+    )
+    table = frame.table
+    if col_widths:
+        for column, col_width in zip(table.columns, col_widths):
+            column.width = col_width
+
+    for r, values in enumerate([header, *rows]):
+        table.rows[r].height = row_height
+        if r == 0:
+            fill, color = ACID_15, CYBER_ACID
+        elif r - 1 in highlight_rows:
+            fill, color = ACID_30, HOLO_WHITE
+        else:
+            fill, color = SURFACE_90, HOLO_WHITE
+
+        for c, value in enumerate(values):
+            cell = table.cell(r, c)
+            cell.fill.solid()
+            set_color(cell.fill.fore_color, fill)
+            cell.vertical_anchor = MSO_ANCHOR.MIDDLE
+            p = cell.text_frame.paragraphs[0]
+            p.text = str(value)
+            p.font.name = _font(slide, MONO if r == 0 else BODY)
+            p.font.size = Pt(font_size)
+            p.font.bold = r == 0
+            set_color(p.font.color, color)
+            p.alignment = PP_ALIGN.LEFT if c == 0 else PP_ALIGN.RIGHT
+
+    return frame
+
 # ============================================================================
 # SLIDE CREATORS
 # ============================================================================
-
+# Builders register themselves by slide number; a build runs only the ones
+# selected (see render_slides), so previewing one slide costs one slide.
+
+SlideEntry = namedtuple('SlideEntry', 'number title build')
+SLIDES = {}
+
+RESULTS_SLIDE = 10  # Takes the cohort numbers of a progress export (--results)
+
+def register_slide(number, title):
+    """Register a slide builder under its 1-based slide number"""
+    def register(build):
+        if number in SLIDES:
+            raise ValueError(f"Slide {number} is already registered")
+        SLIDES[number] = SlideEntry(number, title, build)
+        return build
+    return register
+
+def select_slides(numbers=None):
+    """Registered entries for the given slide numbers (all by default), in order"""
+    if numbers is None:
+        return [SLIDES[n] for n in sorted(SLIDES)]
+    unknown = [n for n in numbers if n not in SLIDES]
+    if unknown:
+        raise ValueError(f"No such slide(s): {', '.join(map(str, unknown))} (deck has {len(SLIDES)})")
+    return [SLIDES[n] for n in numbers]
+
+def render_slides(prs, entries, verbose=False):
+    """Run the builders of `entries` against `prs`"""
+    for entry in entries:
+        if verbose:
+            print(f"Creating Slide {entry.number}: {entry.title}...")
+        entry.build(prs)
+
+@register_slide(1, 'Title')
 def create_slide_1_title(prs):
     """Slide 1: Title slide"""
     slide_layout = prs.slide_layouts[6]  # Blank
-    slide = prs.slides.add_slide(slide_layout)
+    slide = add_slide(prs, slide_layout)
+    ctx = context_of(prs)
     set_slide_background(slide, CYBER_VOID)
 
     # Subtitle: VIBE CODING STARTER
     add_text_box(
         slide, Inches(0), Inches(1.8),
-        SLIDE_WIDTH, Inches(0.5), "VIBE CODING STARTER",
-        font_name='Courier New', font_size=22,
+        ctx.slide_width, Inches(0.5), "VIBE CODING STARTER",
+        font_name=MONO, font_size=22,
         font_color=CYBER_ACID, alignment=PP_ALIGN.CENTER
     )
 
     # Main title: БЫСТРЫЙ СТАРТ
     add_text_box(
         slide, Inches(0), Inches(2.5),
-        SLIDE_WIDTH, Inches(1.2), "БЫСТРЫЙ",
-        font_name='Arial Black', font_size=96,
+        ctx.slide_width, Inches(1.2), "БЫСТРЫЙ",
+        font_name=HEADING, font_size=96,
         font_color=HOLO_WHITE, alignment=PP_ALIGN.CENTER,
         font_bold=True
     )
 
     add_text_box(
         slide, Inches(0), Inches(3.5),
-        SLIDE_WIDTH, Inches(1.2), "СТАРТ",
-        font_name='Arial Black', font_size=96,
+        ctx.slide_width, Inches(1.2), "СТАРТ",
+        font_name=HEADING, font_size=96,
         font_color=HOLO_WHITE, alignment=PP_ALIGN.CENTER,
         font_bold=True
     )
@@ -283,14 +598,14 @@ def create_slide_1_title(prs):
     # Tagline
     add_text_box(
         slide, Inches(0), Inches(4.8),
-        SLIDE_WIDTH, Inches(0.6), "От нуля до первого проекта за 4 часа",
-        font_name='Arial', font_size=32,
+        ctx.slide_width, Inches(0.6), "От нуля до первого проекта за 4 часа",
+        font_name=BODY, font_size=32,
         font_color=TECH_GRAY, alignment=PP_ALIGN.CENTER
     )
 
     # Accent line
     line_width = Inches(2.5)
-    line_left = (SLIDE_WIDTH - line_width) / 2
+    line_left = (ctx.slide_width - line_width) / 2
     add_rectangle(
         slide, line_left, Inches(5.6),
         line_width, Pt(3),
@@ -299,17 +614,19 @@ def create_slide_1_title(prs):
 
     return slide
 
+@register_slide(2, 'Overview')
 def create_slide_2_overview(prs):
     """Slide 2: What awaits you in the module"""
     slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+    slide = add_slide(prs, slide_layout)
+    brand = brand_of(prs)
     set_slide_background(slide, CYBER_VOID)
 
     # Title
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.5),
+        slide, brand.content_left, Inches(0.5),
         Inches(10), Inches(0.9), "ЧТО ВАС ЖДЁТ В МОДУЛЕ",
-        font_name='Arial Black', font_size=56,
+        font_name=HEADING, font_size=56,
         font_color=HOLO_WHITE, font_bold=True
     )
 
@@ -324,32 +641,32 @@ def create_slide_2_overview(prs):
     for i, (num, title, desc) in enumerate(stats):
         # Card background
         card = add_card(
-            slide, CONTENT_LEFT, card_top + Inches(i * 1.3),
+            slide, brand.content_left, card_top + Inches(i * 1.3),
             Inches(5.5), Inches(1.1)
         )
 
         # Number indicator
         add_number_indicator(
-            slide, CONTENT_LEFT + Inches(0.2),
+            slide, brand.content_left + Inches(0.2),
             card_top + Inches(i * 1.3) + Inches(0.2),
             num, size=Inches(0.7)
         )
 
         # Title
         add_text_box(
-            slide, CONTENT_LEFT + Inches(1.1),
+            slide, brand.content_left + Inches(1.1),
             card_top + Inches(i * 1.3) + Inches(0.15),
             Inches(4), Inches(0.45), title,
-            font_name='Arial', font_size=26,
+            font_name=BODY, font_size=26,
             font_color=HOLO_WHITE, font_bold=True
         )
 
         # Description
         add_text_box(
-            slide, CONTENT_LEFT + Inches(1.1),
+            slide, brand.content_left + Inches(1.1),
             card_top + Inches(i * 1.3) + Inches(0.55),
             Inches(4), Inches(0.4), desc,
-            font_name='Arial', font_size=20,
+            font_name=BODY, font_size=20,
             font_color=TECH_GRAY
         )
 
@@ -363,28 +680,28 @@ def create_slide_2_overview(prs):
     add_text_box(
         slide, Inches(7.3), Inches(1.8),
         Inches(5), Inches(0.4), "РЕЗУЛЬТАТ МОДУЛЯ",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=CYBER_ACID
     )
 
     add_text_box(
         slide, Inches(7.3), Inches(2.4),
         Inches(5), Inches(0.5), "Базовые навыки",
-        font_name='Arial', font_size=28,
+        font_name=BODY, font_size=28,
         font_color=CYBER_ACID, font_bold=True
     )
 
     add_text_box(
         slide, Inches(7.3), Inches(2.9),
         Inches(5), Inches(0.5), "AI-программирования",
-        font_name='Arial', font_size=28,
+        font_name=BODY, font_size=28,
         font_color=CYBER_ACID, font_bold=True
     )
 
     add_text_box(
         slide, Inches(7.3), Inches(3.5),
         Inches(5), Inches(0.4), "и первый работающий проект",
-        font_name='Arial', font_size=24,
+        font_name=BODY, font_size=24,
         font_color=HOLO_WHITE
     )
 
@@ -393,17 +710,20 @@ def create_slide_2_overview(prs):
 
     return slide
 
+@register_slide(3, 'Program')
 def create_slide_3_program(prs):
     """Slide 3: Module program"""
     slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+    slide = add_slide(prs, slide_layout)
+    ctx = context_of(prs)
+    brand = ctx.brand
     set_slide_background(slide, CYBER_VOID)
 
     # Title
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.5),
+        slide, brand.content_left, Inches(0.5),
         Inches(10), Inches(0.9), "ПРОГРАММА МОДУЛЯ",
-        font_name='Arial Black', font_size=56,
+        font_name=HEADING, font_size=56,
         font_color=HOLO_WHITE, font_bold=True
     )
 
@@ -426,36 +746,36 @@ def create_slide_3_program(prs):
         # Row background
         if highlighted:
             row_bg = add_card(
-                slide, CONTENT_LEFT, top,
+                slide, brand.content_left, top,
                 Inches(11), row_height,
                 fill_color=ACID_15, border_color=ACID_30
             )
         else:
             row_bg = add_card(
-                slide, CONTENT_LEFT, top,
+                slide, brand.content_left, top,
                 Inches(11), row_height
             )
 
         # Left accent line
         add_rectangle(
-            slide, CONTENT_LEFT, top,
+            slide, brand.content_left, top,
             Pt(4), row_height,
             fill_color=CYBER_ACID
         )
 
         # Lesson number
         add_text_box(
-            slide, CONTENT_LEFT + Inches(0.2), top + Inches(0.2),
+            slide, brand.content_left + Inches(0.2), top + Inches(0.2),
             Inches(0.8), Inches(0.4), num,
-            font_name='Courier New', font_size=22,
+            font_name=MONO, font_size=22,
             font_color=CYBER_ACID, font_bold=True
         )
 
         # Lesson title
         add_text_box(
-            slide, CONTENT_LEFT + Inches(1.1), top + Inches(0.2),
+            slide, brand.content_left + Inches(1.1), top + Inches(0.2),
             Inches(7), Inches(0.4), title,
-            font_name='Arial', font_size=24,
+            font_name=BODY, font_size=24,
             font_color=HOLO_WHITE
         )
 
@@ -464,7 +784,7 @@ def create_slide_3_program(prs):
         add_text_box(
             slide, Inches(10), top + Inches(0.2),
             Inches(2), Inches(0.4), time,
-            font_name='Courier New', font_size=20,
+            font_name=MONO, font_size=20,
             font_color=time_color, alignment=PP_ALIGN.RIGHT
         )
 
@@ -472,18 +792,20 @@ def create_slide_3_program(prs):
     add_footer(slide)
 
     add_text_box(
-        slide, Inches(9), SLIDE_HEIGHT - Inches(0.6),
+        slide, Inches(9), ctx.slide_height - Inches(0.6),
         Inches(3.5), Inches(0.4), "ИТОГО: ~4 ЧАСА",
-        font_name='Courier New', font_size=16,
+        font_name=MONO, font_size=16,
         font_color=CYBER_ACID, alignment=PP_ALIGN.RIGHT
     )
 
     return slide
 
+@register_slide(4, 'Lesson 1.1')
 def create_slide_4_lesson_1_1(prs):
     """Slide 4: Lesson 1.1 - What is Vibe Coding"""
     slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+    slide = add_slide(prs, slide_layout)
+    brand = brand_of(prs)
     set_slide_background(slide, CYBER_VOID)
 
     # Badge
@@ -491,25 +813,25 @@ def create_slide_4_lesson_1_1(prs):
 
     # Time indicator
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.5),
+        slide, brand.content_left, Inches(0.5),
         Inches(3), Inches(0.4), "ДО 20 МИНУТ",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=CYBER_ACID
     )
 
     # Title
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.9),
+        slide, brand.content_left, Inches(0.9),
         Inches(10), Inches(0.8), "ЧТО ТАКОЕ VIBE CODING",
-        font_name='Arial Black', font_size=52,
+        font_name=HEADING, font_size=52,
         font_color=HOLO_WHITE, font_bold=True
     )
 
     # Left column - What you'll learn
     add_text_box(
-        slide, CONTENT_LEFT, Inches(1.9),
+        slide, brand.content_left, Inches(1.9),
         Inches(4), Inches(0.5), "Вы узнаете:",
-        font_name='Arial', font_size=24,
+        font_name=BODY, font_size=24,
         font_color=TECH_GRAY
     )
 
@@ -522,11 +844,11 @@ def create_slide_4_lesson_1_1(prs):
 
     for i, item in enumerate(checklist):
         top = Inches(2.5) + Inches(i * 0.65)
-        add_checkbox(slide, CONTENT_LEFT, top)
+        add_checkbox(slide, brand.content_left, top)
         add_text_box(
-            slide, CONTENT_LEFT + Inches(0.5), top - Inches(0.05),
+            slide, brand.content_left + Inches(0.5), top - Inches(0.05),
             Inches(5), Inches(0.5), item,
-            font_name='Arial', font_size=22,
+            font_name=BODY, font_size=22,
             font_color=HOLO_WHITE
         )
 
@@ -540,7 +862,7 @@ def create_slide_4_lesson_1_1(prs):
     add_text_box(
         slide, Inches(7.3), Inches(2.1),
         Inches(5), Inches(0.4), "ГЛАВНАЯ ФОРМУЛА",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=CYBER_ACID
     )
 
@@ -554,7 +876,7 @@ def create_slide_4_lesson_1_1(prs):
         add_text_box(
             slide, Inches(8.5), formula_top + Inches(i * 0.45),
             Inches(3), Inches(0.4), item,
-            font_name='Arial Black', font_size=size,
+            font_name=HEADING, font_size=size,
             font_color=color, alignment=PP_ALIGN.CENTER
         )
 
@@ -569,7 +891,7 @@ def create_slide_4_lesson_1_1(prs):
     add_text_box(
         slide, Inches(8.5), Inches(5.3),
         Inches(3), Inches(0.5), "= ЧИСТЫЙ КОД",
-        font_name='Arial Black', font_size=26,
+        font_name=HEADING, font_size=26,
         font_color=CYBER_ACID, alignment=PP_ALIGN.CENTER
     )
 
@@ -578,10 +900,12 @@ def create_slide_4_lesson_1_1(prs):
 
     return slide
 
+@register_slide(5, 'Lesson 1.2')
 def create_slide_5_lesson_1_2(prs):
     """Slide 5: Lesson 1.2 - Environment Setup"""
     slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+    slide = add_slide(prs, slide_layout)
+    brand = brand_of(prs)
     set_slide_background(slide, CYBER_VOID)
 
     # Badge
@@ -589,25 +913,25 @@ def create_slide_5_lesson_1_2(prs):
 
     # Time indicator
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.5),
+        slide, brand.content_left, Inches(0.5),
         Inches(3), Inches(0.4), "ДО 30 МИНУТ",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=CYBER_ACID
     )
 
     # Title
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.9),
+        slide, brand.content_left, Inches(0.9),
         Inches(10), Inches(0.8), "УСТАНОВКА ОКРУЖЕНИЯ",
-        font_name='Arial Black', font_size=52,
+        font_name=HEADING, font_size=52,
         font_color=HOLO_WHITE, font_bold=True
     )
 
     # Left column - Steps
     add_text_box(
-        slide, CONTENT_LEFT, Inches(1.9),
+        slide, brand.content_left, Inches(1.9),
         Inches(4), Inches(0.5), "Что установим:",
-        font_name='Arial', font_size=24,
+        font_name=BODY, font_size=24,
         font_color=TECH_GRAY
     )
 
@@ -619,19 +943,19 @@ def create_slide_5_lesson_1_2(prs):
 
     for i, (num, title, desc) in enumerate(steps):
         top = Inches(2.5) + Inches(i * 1.1)
-        add_step_circle(slide, CONTENT_LEFT, top)
+        add_step_circle(slide, brand.content_left, top, num)
 
         add_text_box(
-            slide, CONTENT_LEFT + Inches(0.7), top - Inches(0.05),
+            slide, brand.content_left + Inches(0.7), top - Inches(0.05),
             Inches(4), Inches(0.4), title,
-            font_name='Arial', font_size=24,
+            font_name=BODY, font_size=24,
             font_color=HOLO_WHITE, font_bold=True
         )
 
         add_text_box(
-            slide, CONTENT_LEFT + Inches(0.7), top + Inches(0.35),
+            slide, brand.content_left + Inches(0.7), top + Inches(0.35),
             Inches(4), Inches(0.35), desc,
-            font_name='Arial', font_size=20,
+            font_name=BODY, font_size=20,
             font_color=TECH_GRAY
         )
 
@@ -645,14 +969,14 @@ def create_slide_5_lesson_1_2(prs):
     add_text_box(
         slide, Inches(7.3), Inches(2.1),
         Inches(5), Inches(0.4), "РЕЗУЛЬТАТ УРОКА",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=CYBER_ACID
     )
 
     add_text_box(
         slide, Inches(7.3), Inches(2.7),
         Inches(5), Inches(0.8), "Полностью настроенное\nрабочее окружение",
-        font_name='Arial', font_size=26,
+        font_name=BODY, font_size=26,
         font_color=HOLO_WHITE
     )
 
@@ -661,14 +985,14 @@ def create_slide_5_lesson_1_2(prs):
         slide, Inches(7.5), Inches(3.9),
         Inches(3), Inches(0.5), "100% БЕСПЛАТНО",
         fill_color=CYBER_ACID,
-        font_name='Courier New', font_size=18, font_bold=True,
+        font_name=MONO, font_size=18, font_bold=True,
         font_color=CYBER_VOID
     )
 
     add_text_box(
         slide, Inches(7.3), Inches(4.7),
         Inches(5), Inches(0.4), "Все инструменты — open source",
-        font_name='Arial', font_size=18,
+        font_name=BODY, font_size=18,
         font_color=TECH_GRAY
     )
 
@@ -677,10 +1001,12 @@ def create_slide_5_lesson_1_2(prs):
 
     return slide
 
+@register_slide(6, 'Lesson 1.3')
 def create_slide_6_lesson_1_3(prs):
     """Slide 6: Lesson 1.3 - Git"""
     slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+    slide = add_slide(prs, slide_layout)
+    brand = brand_of(prs)
     set_slide_background(slide, CYBER_VOID)
 
     # Badge
@@ -688,67 +1014,67 @@ def create_slide_6_lesson_1_3(prs):
 
     # Time indicator
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.5),
+        slide, brand.content_left, Inches(0.5),
         Inches(3), Inches(0.4), "ДО 40 МИНУТ",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=CYBER_ACID
     )
 
     # Title
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.9),
+        slide, brand.content_left, Inches(0.9),
         Inches(10), Inches(0.8), "GIT — ТВОЯ СТРАХОВКА",
-        font_name='Arial Black', font_size=52,
+        font_name=HEADING, font_size=52,
         font_color=HOLO_WHITE, font_bold=True
     )
 
     # Left column
     add_text_box(
-        slide, CONTENT_LEFT, Inches(1.9),
+        slide, brand.content_left, Inches(1.9),
         Inches(4), Inches(0.5), "Зачем это нужно:",
-        font_name='Arial', font_size=24,
+        font_name=BODY, font_size=24,
         font_color=TECH_GRAY
     )
 
     # Without Git card (red)
     without_card = add_card(
-        slide, CONTENT_LEFT, Inches(2.5),
+        slide, brand.content_left, Inches(2.5),
         Inches(5.5), Inches(0.9),
         fill_color=RED_10, border_color=SIGNAL_RED
     )
 
     add_text_box(
-        slide, CONTENT_LEFT + Inches(0.2), Inches(2.55),
+        slide, brand.content_left + Inches(0.2), Inches(2.55),
         Inches(5), Inches(0.35), "БЕЗ GIT",
-        font_name='Courier New', font_size=16,
+        font_name=MONO, font_size=16,
         font_color=SIGNAL_RED
     )
 
     add_text_box(
-        slide, CONTENT_LEFT + Inches(0.2), Inches(2.95),
+        slide, brand.content_left + Inches(0.2), Inches(2.95),
         Inches(5), Inches(0.35), "Одна ошибка — код потерян",
-        font_name='Arial', font_size=20,
+        font_name=BODY, font_size=20,
         font_color=HOLO_WHITE
     )
 
     # With Git card (green)
     with_card = add_card(
-        slide, CONTENT_LEFT, Inches(3.6),
+        slide, brand.content_left, Inches(3.6),
         Inches(5.5), Inches(0.9),
         fill_color=GREEN_10, border_color=CYBER_ACID
     )
 
     add_text_box(
-        slide, CONTENT_LEFT + Inches(0.2), Inches(3.65),
+        slide, brand.content_left + Inches(0.2), Inches(3.65),
         Inches(5), Inches(0.35), "С GIT",
-        font_name='Courier New', font_size=16,
+        font_name=MONO, font_size=16,
         font_color=CYBER_ACID
     )
 
     add_text_box(
-        slide, CONTENT_LEFT + Inches(0.2), Inches(4.05),
+        slide, brand.content_left + Inches(0.2), Inches(4.05),
         Inches(5), Inches(0.35), "Всегда можно откатиться",
-        font_name='Arial', font_size=20,
+        font_name=BODY, font_size=20,
         font_color=HOLO_WHITE
     )
 
@@ -762,7 +1088,7 @@ def create_slide_6_lesson_1_3(prs):
     add_text_box(
         slide, Inches(7.3), Inches(2.1),
         Inches(5), Inches(0.4), "4 КОМАНДЫ НА СТАРТ",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=CYBER_ACID
     )
 
@@ -781,7 +1107,7 @@ def create_slide_6_lesson_1_3(prs):
             slide, Inches(7.3), top,
             Inches(2.2), Inches(0.45), cmd,
             fill_color=ACID_15,
-            font_name='Courier New', font_size=18,
+            font_name=MONO, font_size=18,
             font_color=CYBER_ACID
         )
 
@@ -789,16 +1115,16 @@ def create_slide_6_lesson_1_3(prs):
         add_text_box(
             slide, Inches(9.7), top + Inches(0.05),
             Inches(2.5), Inches(0.4), desc,
-            font_name='Arial', font_size=20,
+            font_name=BODY, font_size=20,
             font_color=HOLO_WHITE
         )
 
     # Result line
     add_text_box(
-        slide, CONTENT_LEFT, Inches(5.2),
+        slide, brand.content_left, Inches(5.2),
         Inches(11), Inches(0.4),
         "РЕЗУЛЬТАТ: Умение сохранять и откатывать изменения",
-        font_name='Arial', font_size=20,
+        font_name=BODY, font_size=20,
         font_color=CYBER_ACID
     )
 
@@ -807,10 +1133,12 @@ def create_slide_6_lesson_1_3(prs):
 
     return slide
 
+@register_slide(7, 'Lesson 1.4')
 def create_slide_7_lesson_1_4(prs):
     """Slide 7: Lesson 1.4 - Prompt Anatomy"""
     slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+    slide = add_slide(prs, slide_layout)
+    brand = brand_of(prs)
     set_slide_background(slide, CYBER_VOID)
 
     # Badge
@@ -818,25 +1146,25 @@ def create_slide_7_lesson_1_4(prs):
 
     # Time indicator
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.5),
+        slide, brand.content_left, Inches(0.5),
         Inches(3), Inches(0.4), "ДО 20 МИНУТ",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=CYBER_ACID
     )
 
     # Title
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.9),
+        slide, brand.content_left, Inches(0.9),
         Inches(10), Inches(0.8), "АНАТОМИЯ ПРОМПТА",
-        font_name='Arial Black', font_size=52,
+        font_name=HEADING, font_size=52,
         font_color=HOLO_WHITE, font_bold=True
     )
 
     # Left column - Structure
     add_text_box(
-        slide, CONTENT_LEFT, Inches(1.9),
+        slide, brand.content_left, Inches(1.9),
         Inches(4), Inches(0.5), "Структура промпта:",
-        font_name='Arial', font_size=24,
+        font_name=BODY, font_size=24,
         font_color=TECH_GRAY
     )
 
@@ -852,24 +1180,24 @@ def create_slide_7_lesson_1_4(prs):
 
         # Left accent
         add_rectangle(
-            slide, CONTENT_LEFT, top,
+            slide, brand.content_left, top,
             Pt(4), Inches(0.7),
             fill_color=CYBER_ACID
         )
 
         # Title
         add_text_box(
-            slide, CONTENT_LEFT + Inches(0.15), top + Inches(0.05),
+            slide, brand.content_left + Inches(0.15), top + Inches(0.05),
             Inches(4), Inches(0.35), title,
-            font_name='Courier New', font_size=18,
+            font_name=MONO, font_size=18,
             font_color=CYBER_ACID
         )
 
         # Description
         add_text_box(
-            slide, CONTENT_LEFT + Inches(0.15), top + Inches(0.38),
+            slide, brand.content_left + Inches(0.15), top + Inches(0.38),
             Inches(4), Inches(0.3), desc,
-            font_name='Arial', font_size=18,
+            font_name=BODY, font_size=18,
             font_color=TECH_GRAY
         )
 
@@ -884,14 +1212,14 @@ def create_slide_7_lesson_1_4(prs):
     add_text_box(
         slide, Inches(7.3), Inches(2.1),
         Inches(5), Inches(0.35), "ПЛОХО",
-        font_name='Courier New', font_size=16,
+        font_name=MONO, font_size=16,
         font_color=SIGNAL_RED
     )
 
     add_text_box(
         slide, Inches(7.3), Inches(2.55),
         Inches(5), Inches(0.5), '"Сделай мне сайт"',
-        font_name='Arial', font_size=22,
+        font_name=BODY, font_size=22,
         font_color=HOLO_WHITE
     )
 
@@ -905,7 +1233,7 @@ def create_slide_7_lesson_1_4(prs):
     add_text_box(
         slide, Inches(7.3), Inches(3.7),
         Inches(5), Inches(0.35), "ХОРОШО",
-        font_name='Courier New', font_size=16,
+        font_name=MONO, font_size=16,
         font_color=CYBER_ACID
     )
 
@@ -913,16 +1241,16 @@ def create_slide_7_lesson_1_4(prs):
         slide, Inches(7.3), Inches(4.15),
         Inches(5), Inches(1.2),
         '"Создай HTML калькулятор.\nИспользуй Vanilla JS.\nБез библиотек."',
-        font_name='Arial', font_size=20,
+        font_name=BODY, font_size=20,
         font_color=HOLO_WHITE
     )
 
     # Result line
     add_text_box(
-        slide, CONTENT_LEFT, Inches(6),
+        slide, brand.content_left, Inches(6),
         Inches(11), Inches(0.4),
         "РЕЗУЛЬТАТ: Умение формулировать задачи для AI",
-        font_name='Arial', font_size=20,
+        font_name=BODY, font_size=20,
         font_color=CYBER_ACID
     )
 
@@ -931,10 +1259,12 @@ def create_slide_7_lesson_1_4(prs):
 
     return slide
 
+@register_slide(8, 'Lesson 1.5')
 def create_slide_8_lesson_1_5(prs):
     """Slide 8: Lesson 1.5 - First Project"""
     slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+    slide = add_slide(prs, slide_layout)
+    brand = brand_of(prs)
     set_slide_background(slide, CYBER_VOID)
 
     # Badge
@@ -942,25 +1272,25 @@ def create_slide_8_lesson_1_5(prs):
 
     # Time indicator with highlight
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.5),
+        slide, brand.content_left, Inches(0.5),
         Inches(5), Inches(0.4), "ДО 60 МИНУТ • ГЛАВНЫЙ УРОК",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=CYBER_ACID
     )
 
     # Title
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.9),
+        slide, brand.content_left, Inches(0.9),
         Inches(11), Inches(0.8), "ПЕРВЫЙ ПРОЕКТ — КАЛЬКУЛЯТОР",
-        font_name='Arial Black', font_size=48,
+        font_name=HEADING, font_size=48,
         font_color=HOLO_WHITE, font_bold=True
     )
 
     # Left column - Steps
     add_text_box(
-        slide, CONTENT_LEFT, Inches(1.9),
+        slide, brand.content_left, Inches(1.9),
         Inches(5), Inches(0.5), "Полный цикл разработки:",
-        font_name='Arial', font_size=24,
+        font_name=BODY, font_size=24,
         font_color=TECH_GRAY
     )
 
@@ -974,28 +1304,28 @@ def create_slide_8_lesson_1_5(prs):
     for i, (num, title, desc) in enumerate(steps):
         top = Inches(2.5) + Inches(i * 0.9)
 
-        add_step_circle(slide, CONTENT_LEFT, top)
+        add_step_circle(slide, brand.content_left, top, num)
 
         add_text_box(
-            slide, CONTENT_LEFT + Inches(0.7), top - Inches(0.05),
+            slide, brand.content_left + Inches(0.7), top - Inches(0.05),
             Inches(2), Inches(0.4), title,
-            font_name='Arial', font_size=24,
+            font_name=BODY, font_size=24,
             font_color=HOLO_WHITE, font_bold=True
         )
 
         add_text_box(
-            slide, CONTENT_LEFT + Inches(0.7), top + Inches(0.35),
+            slide, brand.content_left + Inches(0.7), top + Inches(0.35),
             Inches(4), Inches(0.35), desc,
-            font_name='Arial', font_size=18,
+            font_name=BODY, font_size=18,
             font_color=TECH_GRAY
         )
 
         # Arrow down (except last)
         if i < 3:
             add_text_box(
-                slide, CONTENT_LEFT + Inches(0.15), top + Inches(0.65),
+                slide, brand.content_left + Inches(0.15), top + Inches(0.65),
                 Inches(0.3), Inches(0.3), "|",
-                font_name='Arial', font_size=20,
+                font_name=BODY, font_size=20,
                 font_color=CYBER_ACID, alignment=PP_ALIGN.CENTER
             )
 
@@ -1009,7 +1339,7 @@ def create_slide_8_lesson_1_5(prs):
     add_text_box(
         slide, Inches(7.3), Inches(2.1),
         Inches(5), Inches(0.4), "РЕЗУЛЬТАТ УРОКА",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=CYBER_ACID
     )
 
@@ -1017,14 +1347,14 @@ def create_slide_8_lesson_1_5(prs):
     add_text_box(
         slide, Inches(8.5), Inches(2.8),
         Inches(3), Inches(0.8), "[CALC]",
-        font_name='Courier New', font_size=36,
+        font_name=MONO, font_size=36,
         font_color=CYBER_ACID, alignment=PP_ALIGN.CENTER
     )
 
     add_text_box(
         slide, Inches(7.3), Inches(3.8),
         Inches(5), Inches(0.5), "Работающий калькулятор",
-        font_name='Arial', font_size=26,
+        font_name=BODY, font_size=26,
         font_color=HOLO_WHITE, font_bold=True,
         alignment=PP_ALIGN.CENTER
     )
@@ -1032,7 +1362,7 @@ def create_slide_8_lesson_1_5(prs):
     add_text_box(
         slide, Inches(7.3), Inches(4.5),
         Inches(5), Inches(0.5), "Первый проект в портфолио!",
-        font_name='Arial', font_size=22,
+        font_name=BODY, font_size=22,
         font_color=CYBER_ACID,
         alignment=PP_ALIGN.CENTER
     )
@@ -1042,10 +1372,12 @@ def create_slide_8_lesson_1_5(prs):
 
     return slide
 
+@register_slide(9, 'Lesson 1.6')
 def create_slide_9_lesson_1_6(prs):
     """Slide 9: Lesson 1.6 - What's Next"""
     slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+    slide = add_slide(prs, slide_layout)
+    brand = brand_of(prs)
     set_slide_background(slide, CYBER_VOID)
 
     # Badge
@@ -1053,25 +1385,25 @@ def create_slide_9_lesson_1_6(prs):
 
     # Time indicator
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.5),
+        slide, brand.content_left, Inches(0.5),
         Inches(3), Inches(0.4), "ДО 20 МИНУТ",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=CYBER_ACID
     )
 
     # Title
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.9),
+        slide, brand.content_left, Inches(0.9),
         Inches(10), Inches(0.8), "ЧТО ДАЛЬШЕ + БОНУС",
-        font_name='Arial Black', font_size=52,
+        font_name=HEADING, font_size=52,
         font_color=HOLO_WHITE, font_bold=True
     )
 
     # Left column - Checklist
     add_text_box(
-        slide, CONTENT_LEFT, Inches(1.9),
+        slide, brand.content_left, Inches(1.9),
         Inches(5), Inches(0.5), "Чеклист самопроверки:",
-        font_name='Arial', font_size=24,
+        font_name=BODY, font_size=24,
         font_color=TECH_GRAY
     )
 
@@ -1084,25 +1416,25 @@ def create_slide_9_lesson_1_6(prs):
 
     for i, item in enumerate(checklist):
         top = Inches(2.5) + Inches(i * 0.65)
-        add_checkbox(slide, CONTENT_LEFT, top)
+        add_checkbox(slide, brand.content_left, top)
         add_text_box(
-            slide, CONTENT_LEFT + Inches(0.5), top - Inches(0.05),
+            slide, brand.content_left + Inches(0.5), top - Inches(0.05),
             Inches(5), Inches(0.5), item,
-            font_name='Arial', font_size=20,
+            font_name=BODY, font_size=20,
             font_color=HOLO_WHITE
         )
 
     # Next step card
     next_card = add_card(
-        slide, CONTENT_LEFT, Inches(5.2),
+        slide, brand.content_left, Inches(5.2),
         Inches(5.5), Inches(0.8),
         fill_color=SURFACE_90, border_color=ACID_30
     )
 
     add_text_box(
-        slide, CONTENT_LEFT + Inches(0.2), Inches(5.35),
+        slide, brand.content_left + Inches(0.2), Inches(5.35),
         Inches(5), Inches(0.5), "Следующий шаг: Модуль 2: BUILDER ->",
-        font_name='Arial', font_size=20,
+        font_name=BODY, font_size=20,
         font_color=HOLO_WHITE
     )
 
@@ -1116,35 +1448,35 @@ def create_slide_9_lesson_1_6(prs):
     add_text_box(
         slide, Inches(7.3), Inches(2.1),
         Inches(5), Inches(0.4), "БОНУС К МОДУЛЮ",
-        font_name='Courier New', font_size=18,
+        font_name=MONO, font_size=18,
         font_color=SIGNAL_RED
     )
 
     add_text_box(
         slide, Inches(7.3), Inches(2.7),
         Inches(5), Inches(0.6), "10 промптов",
-        font_name='Arial', font_size=32,
+        font_name=BODY, font_size=32,
         font_color=HOLO_WHITE, font_bold=True
     )
 
     add_text_box(
         slide, Inches(7.3), Inches(3.3),
         Inches(5), Inches(0.4), "Готовые шаблоны",
-        font_name='Arial', font_size=22,
+        font_name=BODY, font_size=22,
         font_color=TECH_GRAY
     )
 
     add_text_box(
         slide, Inches(7.3), Inches(4),
         Inches(5), Inches(0.4), "+ Шаблон Memory Bank",
-        font_name='Arial', font_size=20,
+        font_name=BODY, font_size=20,
         font_color=HOLO_WHITE
     )
 
     add_text_box(
         slide, Inches(7.3), Inches(4.5),
         Inches(5), Inches(0.4), "+ Чеклист установки",
-        font_name='Arial', font_size=20,
+        font_name=BODY, font_size=20,
         font_color=HOLO_WHITE
     )
 
@@ -1153,17 +1485,20 @@ def create_slide_9_lesson_1_6(prs):
 
     return slide
 
+@register_slide(RESULTS_SLIDE, 'Results')
 def create_slide_10_results(prs):
-    """Slide 10: Module Results"""
+    """Slide 10: Module Results (cohort numbers are added when a progress export is given)"""
     slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+    slide = add_slide(prs, slide_layout)
+    ctx = context_of(prs)
+    brand = ctx.brand
     set_slide_background(slide, CYBER_VOID)
 
     # Title
     add_text_box(
-        slide, CONTENT_LEFT, Inches(0.5),
+        slide, brand.content_left, Inches(0.5),
         Inches(10), Inches(0.9), "РЕЗУЛЬТАТ МОДУЛЯ",
-        font_name='Arial Black', font_size=56,
+        font_name=HEADING, font_size=56,
         font_color=HOLO_WHITE, font_bold=True
     )
 
@@ -1176,9 +1511,9 @@ def create_slide_10_results(prs):
     ]
 
     positions = [
-        (CONTENT_LEFT, Inches(1.6)),
+        (brand.content_left, Inches(1.6)),
         (Inches(7), Inches(1.6)),
-        (CONTENT_LEFT, Inches(3.8)),
+        (brand.content_left, Inches(3.8)),
         (Inches(7), Inches(3.8)),
     ]
 
@@ -1200,7 +1535,7 @@ def create_slide_10_results(prs):
         add_text_box(
             slide, left + Inches(0.3), top + Inches(0.2),
             Inches(1), Inches(0.5), icon,
-            font_name='Courier New', font_size=24,
+            font_name=MONO, font_size=24,
             font_color=icon_color
         )
 
@@ -1209,7 +1544,7 @@ def create_slide_10_results(prs):
         add_text_box(
             slide, left + Inches(0.3), top + Inches(0.7),
             Inches(5), Inches(0.5), title,
-            font_name='Arial', font_size=24,
+            font_name=BODY, font_size=24,
             font_color=title_color, font_bold=True
         )
 
@@ -1217,7 +1552,7 @@ def create_slide_10_results(prs):
         add_text_box(
             slide, left + Inches(0.3), top + Inches(1.2),
             Inches(5), Inches(0.4), desc,
-            font_name='Arial', font_size=18,
+            font_name=BODY, font_size=18,
             font_color=TECH_GRAY
         )
 
@@ -1226,33 +1561,35 @@ def create_slide_10_results(prs):
 
     # Ready indicator
     add_text_box(
-        slide, Inches(8.5), SLIDE_HEIGHT - Inches(0.6),
+        slide, Inches(8.5), ctx.slide_height - Inches(0.6),
         Inches(4), Inches(0.4), "+ ГОТОВ К МОДУЛЮ 2",
-        font_name='Courier New', font_size=16,
+        font_name=MONO, font_size=16,
         font_color=CYBER_ACID, alignment=PP_ALIGN.RIGHT
     )
 
     return slide
 
+@register_slide(11, "Let's Go")
 def create_slide_11_lets_go(prs):
     """Slide 11: Let's Go!"""
     slide_layout = prs.slide_layouts[6]
-    slide = prs.slides.add_slide(slide_layout)
+    slide = add_slide(prs, slide_layout)
+    ctx = context_of(prs)
     set_slide_background(slide, CYBER_VOID)
 
     # Subtitle
     add_text_box(
         slide, Inches(0), Inches(1.5),
-        SLIDE_WIDTH, Inches(0.5), "МОДУЛЬ 1 • БЫСТРЫЙ СТАРТ",
-        font_name='Courier New', font_size=24,
+        ctx.slide_width, Inches(0.5), "МОДУЛЬ 1 • БЫСТРЫЙ СТАРТ",
+        font_name=MONO, font_size=24,
         font_color=CYBER_ACID, alignment=PP_ALIGN.CENTER
     )
 
     # Main title
     add_text_box(
         slide, Inches(0), Inches(2.3),
-        SLIDE_WIDTH, Inches(1.5), "ПОЕХАЛИ!",
-        font_name='Arial Black', font_size=120,
+        ctx.slide_width, Inches(1.5), "ПОЕХАЛИ!",
+        font_name=HEADING, font_size=120,
         font_color=HOLO_WHITE, alignment=PP_ALIGN.CENTER,
         font_bold=True
     )
@@ -1260,21 +1597,21 @@ def create_slide_11_lets_go(prs):
     # Tagline
     add_text_box(
         slide, Inches(0), Inches(4),
-        SLIDE_WIDTH, Inches(0.5), "Начинаем с урока 1.1",
-        font_name='Arial', font_size=32,
+        ctx.slide_width, Inches(0.5), "Начинаем с урока 1.1",
+        font_name=BODY, font_size=32,
         font_color=TECH_GRAY, alignment=PP_ALIGN.CENTER
     )
 
     # CTA Button
     button_width = Inches(5)
-    button_left = (SLIDE_WIDTH - button_width) / 2
+    button_left = (ctx.slide_width - button_width) / 2
 
     cta_button = add_shape_with_text(
         slide, button_left, Inches(4.8),
         button_width, Inches(0.7), "ЧТО ТАКОЕ VIBE CODING ->",
         shape_type=MSO_SHAPE.ROUNDED_RECTANGLE,
         fill_color=CYBER_ACID,
-        font_name='Arial', font_size=22, font_bold=True,
+        font_name=BODY, font_size=22, font_bold=True,
         font_color=CYBER_VOID
     )
 
@@ -1282,15 +1619,15 @@ def create_slide_11_lets_go(prs):
     dots_text = "* o o o o o"  # First active, rest inactive
     add_text_box(
         slide, Inches(0), Inches(5.8),
-        SLIDE_WIDTH, Inches(0.4), dots_text,
-        font_name='Arial', font_size=24,
+        ctx.slide_width, Inches(0.4), dots_text,
+        font_name=BODY, font_size=24,
         font_color=CYBER_ACID, alignment=PP_ALIGN.CENTER
     )
 
     add_text_box(
         slide, Inches(0), Inches(6.2),
-        SLIDE_WIDTH, Inches(0.3), "(6 уроков)",
-        font_name='Arial', font_size=16,
+        ctx.slide_width, Inches(0.3), "(6 уроков)",
+        font_name=BODY, font_size=16,
         font_color=TECH_GRAY, alignment=PP_ALIGN.CENTER
     )
 
@@ -1300,53 +1637,390 @@ def create_slide_11_lets_go(prs):
 # MAIN
 # ============================================================================
 
-def create_presentation():
-    """Create the full presentation"""
-    prs = Presentation()
-    prs.slide_width = SLIDE_WIDTH
-    prs.slide_height = SLIDE_HEIGHT
-
-    # Create all slides
-    print("Creating Slide 1: Title...")
-    create_slide_1_title(prs)
-
-    print("Creating Slide 2: Overview...")
-    create_slide_2_overview(prs)
-
-    print("Creating Slide 3: Program...")
-    create_slide_3_program(prs)
-
-    print("Creating Slide 4: Lesson 1.1...")
-    create_slide_4_lesson_1_1(prs)
-
-    print("Creating Slide 5: Lesson 1.2...")
-    create_slide_5_lesson_1_2(prs)
-
-    print("Creating Slide 6: Lesson 1.3...")
-    create_slide_6_lesson_1_3(prs)
-
-    print("Creating Slide 7: Lesson 1.4...")
-    create_slide_7_lesson_1_4(prs)
-
-    print("Creating Slide 8: Lesson 1.5...")
-    create_slide_8_lesson_1_5(prs)
-
-    print("Creating Slide 9: Lesson 1.6...")
-    create_slide_9_lesson_1_6(prs)
-
-    print("Creating Slide 10: Results...")
-    create_slide_10_results(prs)
-
-    print("Creating Slide 11: Let's Go...")
-    create_slide_11_lets_go(prs)
-
-    # Save
-    output_dir = os.path.dirname(os.path.abspath(__file__))
-    output_path = os.path.join(output_dir, "VIBE_CODING_MODULE1_INTRO.pptx")
-    prs.save(output_path)
-    print(f"\nPresentation saved to: {output_path}")
+OUTPUT_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_NAME = "VIBE_CODING_MODULE1_INTRO"
+
+def default_output_path(variant=None, slides=None):
+    """Full default-brand deck -> VIBE_CODING_MODULE1_INTRO.pptx; others get a suffix"""
+    suffixes = []
+    if variant and variant != DEFAULT_BRAND:
+        suffixes.append(variant)
+    if slides:
+        suffixes.append('slides-' + slides.replace(',', '_'))
+    return os.path.join(OUTPUT_DIR, '.'.join([OUTPUT_NAME, *suffixes, 'pptx']))
+
+SlideBuilt = namedtuple('SlideBuilt', 'index total number title seconds xml_bytes')
+DeckSaved = namedtuple('DeckSaved', 'path bytes seconds manifest_path')
+
+def iter_presentation(transcripts=None, reproducible=False, brand=None,
+                      slides=None, output_path=None, media=None, memory_budget=None,
+                      chunk=False, deck=None, results=None, measure_xml=False):
+    """Build the deck slide by slide, yielding progress as it goes.
+
+    Yields a SlideBuilt (1-based index, slide count, registry number, title,
+    build seconds, serialized slide XML size) as soon as each slide is done,
+    lesson notes and media included, then one DeckSaved once the package is
+    written. Measuring the XML size serializes the slide, so xml_bytes is
+    None unless `measure_xml` is set or a `memory_budget` needs it anyway.
+    Closing the generator early (break, .close()) cancels the build:
+    nothing is written. With `memory_budget` (bytes), finished slides beyond
+    the budget are spilled to a temporary file (see deck_spill.py).
+    With `chunk`, the slides are part of a deck assembled later
+    (deck_workers.render_chunk()), so the output isn't counted as a deck.
+    Other arguments are as for create_presentation().
+    """
+    results_table = None
+    if results and deck is None:
+        from deck_analytics import add_results_strip, load_table
+        results_table = load_table(results)
+    if deck is not None:
+        from deck_import import spec_entries
+        entries = spec_entries(deck, slides)
+        size = (Emu(deck['slide_width']), Emu(deck['slide_height']))
+    else:
+        entries = select_slides(slides)
+        size = (SLIDE_WIDTH, SLIDE_HEIGHT)
+    output_path = output_path or default_output_path()
+
+    # Lesson slides keep their notes and clips even when rendered out of a subset
+    positions = {entry.number: i for i, entry in enumerate(entries, start=1)}
+    lesson_slides = {} if deck is not None else {
+        lesson: positions[number]
+        for lesson, number in LESSON_SLIDES.items() if number in positions
+    }
+    lesson_at = {index: lesson for lesson, index in lesson_slides.items()}
+    transcripts = transcripts or {}
+    media = media or {}
+
+    with worker_busy():
+        render_start = time.perf_counter()
+        prs = new_presentation(brand, *size)
+        spool = SlideSpool(prs, memory_budget) if memory_budget is not None else None
+        try:
+            for index, entry in enumerate(entries, start=1):
+                slide_start = time.perf_counter()
+                slide = entry.build(prs)
+                lesson = lesson_at.get(index)
+                if lesson in transcripts:
+                    add_lesson_notes(prs, {lesson: transcripts[lesson]}, lesson_slides=lesson_slides)
+                if lesson in media:
+                    add_lesson_media(prs, {lesson: media[lesson]}, lesson_slides=lesson_slides)
+                if results_table is not None and entry.number == RESULTS_SLIDE:
+                    add_results_strip(slide, results_table)
+                seconds = time.perf_counter() - slide_start
+
+                xml_size = len(slide.part.blob) if measure_xml or spool is not None else None
+                if spool is not None:
+                    spool.finish(prs.slides._sldIdLst[-1].rId, slide, xml_size)
+                yield SlideBuilt(index, len(entries), entry.number, entry.title, seconds, xml_size)
+            RENDER_SECONDS.observe(time.perf_counter() - render_start)
+
+            # Save
+            save_start = time.perf_counter()
+            manifest = save_presentation(prs, output_path, reproducible=reproducible)
+            manifest_path = write_build_manifest(output_path, manifest) if manifest else None
+            save_seconds = time.perf_counter() - save_start
+            SAVE_SECONDS.observe(save_seconds)
+        finally:
+            if spool is not None:
+                spool.close()
+
+    size = os.path.getsize(output_path) if chunk else count_deck(output_path, len(prs.slides))
+    yield DeckSaved(output_path, size, save_seconds, manifest_path)
+
+def count_deck(path, slides):
+    """Count a finished deck of `slides` slides in the deck metrics; returns its size"""
+    size = os.path.getsize(path)
+    DECKS_RENDERED.inc()
+    DECK_SLIDES.observe(slides)
+    BYTES_WRITTEN.inc(size)
+    return size
+
+async def aiter_presentation(**kwargs):
+    """Async iterator over iter_presentation() events for event-loop callers.
+
+    Steps run on a worker thread (decks are isolated by their RenderContext).
+    Cancelling the consuming task lets the slide in progress finish, then
+    closes the build without writing anything.
+    """
+    events = iter_presentation(**kwargs)
+    # One thread per build: steps run in order, and close() queues behind
+    # the slide in progress instead of interrupting it
+    executor = ThreadPoolExecutor(1, thread_name_prefix='deck-render')
+    try:
+        while True:
+            event = await asyncio.wrap_future(executor.submit(next, events, None))
+            if event is None:
+                return
+            yield event
+    finally:
+        executor.submit(events.close)
+        executor.shutdown(wait=False)
+
+def create_presentation(transcripts=None, reproducible=False, brand=None,
+                        slides=None, output_path=None, verbose=True, media=None,
+                        memory_budget=None, deck=None, results=None):
+    """Create the presentation (all slides, or the 1-based numbers in `slides`).
+
+    `transcripts` optionally maps lesson numbers ("1.1") to SRT/VTT exports;
+    they are streamed into the speaker notes of the matching lesson slides.
+    With `reproducible`, identical inputs give a byte-identical deck and a
+    build manifest with per-part hashes is written next to it. `brand` is a
+    compiled brand pack (brand_pack.get_brand()); the default pack otherwise.
+    `media` maps lessons to clip URLs (lesson_media.load_media_map()); they
+    are linked, not embedded - run `lesson_media.py pack` for offline copies.
+    `memory_budget` (bytes) spills finished slides to disk for very large
+    decks. `deck` is an imported deck spec (deck_import.py) rendered instead
+    of the Module 1 slides. `results` is a student progress export
+    (deck_analytics.load_table()) whose cohort numbers go on the results
+    slide. For per-slide progress use iter_presentation().
+    """
+    events = iter_presentation(
+        transcripts, reproducible, brand, slides, output_path, media, memory_budget,
+        deck=deck, results=results,
+    )
+    for event in events:
+        if not verbose:
+            continue
+        if isinstance(event, SlideBuilt):
+            print(f"Slide {event.number}: {event.title} ({event.seconds * 1000:.0f} ms)")
+        else:
+            print(f"\nPresentation saved to: {event.path}")
+            if event.manifest_path:
+                print(f"Build manifest: {event.manifest_path}")
+    return event.path
+
+def layout_presentation(slides=None, brand=None, deck=None, results=None):
+    """Dry run: the deck's geometry and text as a LayoutDeck, without python-pptx shapes"""
+    results_table = None
+    if results and deck is None:
+        from deck_analytics import add_results_strip, load_table
+        results_table = load_table(results)
+    if deck is not None:
+        from deck_import import spec_entries
+        entries = spec_entries(deck, slides)
+        size = (Emu(deck['slide_width']), Emu(deck['slide_height']))
+    else:
+        entries = select_slides(slides)
+        size = (SLIDE_WIDTH, SLIDE_HEIGHT)
+    layout = LayoutDeck(RenderContext(brand or get_brand(), *size))
+    for entry in entries:
+        slide = entry.build(layout)
+        slide.number, slide.title = entry.number, entry.title
+        if results_table is not None and entry.number == RESULTS_SLIDE:
+            add_results_strip(slide, results_table)
+    return layout
+
+def load_spec(path):
+    """Read a build spec JSON file; relative paths resolve against its directory.
+
+    {"slides": "4-6", "variant": "cyber_architecture", "out": "preview.pptx",
+     "transcripts": {"1.1": "lesson_1_1.vtt"}, "media": "media.json",
+     "results": "progress.csv", "reproducible": true}
+
+    "deck" (an imported deck spec, or the path of a JSON file holding one)
+    replaces the Module 1 slides; see deck_import.py.
+    """
+    with open(path, encoding='utf-8') as f:
+        spec = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    if isinstance(spec.get('deck'), str):
+        with open(os.path.join(base, spec['deck']), encoding='utf-8') as f:
+            spec['deck'] = json.load(f)
+    if spec.get('deck') and not spec.get('out'):
+        spec['out'] = os.path.splitext(path)[0] + '.pptx'
+    if spec.get('out'):
+        spec['out'] = os.path.join(base, spec['out'])
+    for key in ('media', 'results'):
+        if spec.get(key):
+            spec[key] = os.path.join(base, spec[key])
+    if spec.get('transcripts'):
+        spec['transcripts'] = {
+            lesson: os.path.join(base, transcript)
+            for lesson, transcript in spec['transcripts'].items()
+        }
+    return spec
+
+def _parser():
+    parser = argparse.ArgumentParser(
+        description="Render the VIBE CODING STARTER Module 1 deck (or a slide range of it)."
+    )
+    parser.add_argument('--slides', help='slide numbers to render, e.g. "4-6" or "1,4-6"')
+    parser.add_argument('--variant', help=f'brand pack name or path (default: {DEFAULT_BRAND})')
+    parser.add_argument('--out', help='output .pptx path (.json with --dry-run)')
+    parser.add_argument('--spec', action='append', default=[],
+                        help='JSON build spec (repeatable); command-line options override it')
+    parser.add_argument('--notes', nargs='+', metavar='LESSON=PATH',
+                        help='lesson transcripts to write into speaker notes')
+    parser.add_argument('--media', metavar='PATH',
+                        help='JSON map of lesson videos/GIFs to link into lesson slides')
+    parser.add_argument('--results', metavar='EXPORT',
+                        help='student progress export (CSV/JSON/Parquet) for the numbers on the results slide')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='write the layout (rectangles and text) as JSON instead of a deck')
+    parser.add_argument('--list', action='store_true', help='list registered slides and exit')
+    parser.add_argument('--memory-budget', type=float, metavar='MB',
+                        help='spill finished slides to disk beyond MB of slide memory (see deck_spill.py)')
+    parser.add_argument('--progress', action='store_true',
+                        help='print one JSON line per finished slide and per saved deck')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='render specs (or the slides of a single deck) in N forked worker processes (see deck_workers.py)')
+    parser.add_argument('--no-share-prefix', action='store_true',
+                        help='render every spec in full instead of sharing common leading slides (see deck_variants.py)')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='record every primitive call to a replayable trace (see deck_trace.py)')
+    parser.add_argument('-q', '--quiet', action='store_true')
+    return parser
+
+def parse_args(argv):
+    return _parser().parse_args(argv)
+
+def _job(args, spec):
+    """Merge command-line options over one spec"""
+    slides = args.slides or spec.get('slides')
+    return {
+        'slides': str(slides) if slides else None,
+        'variant': args.variant or spec.get('variant'),
+        'out': args.out or spec.get('out'),
+        'transcripts': parse_transcript_args(args.notes) if args.notes else spec.get('transcripts'),
+        'media': args.media or spec.get('media'),
+        'results': args.results or spec.get('results'),
+        'memory_budget': spec.get('memory_budget') if args.memory_budget is None else args.memory_budget,
+        'reproducible': spec.get('reproducible', bool(os.environ.get('SOURCE_DATE_EPOCH'))),
+        'deck': spec.get('deck'),
+    }
+
+def _check_job(job):
+    """Raise ValueError if the job's slide selection can't be rendered"""
+    if not job['slides']:
+        return
+    numbers = parse_slide_ranges(job['slides'])
+    if job.get('deck') is not None:
+        from deck_import import spec_entries
+        spec_entries(job['deck'], numbers)
+    else:
+        select_slides(numbers)
+
+def _job_kwargs(job):
+    budget_mb = job.get('memory_budget')
+    return {
+        'transcripts': job['transcripts'],
+        'reproducible': job['reproducible'],
+        'brand': get_brand(job['variant']) if job['variant'] else None,
+        'slides': parse_slide_ranges(job['slides']) if job['slides'] else None,
+        'output_path': job['out'] or default_output_path(job['variant'], job['slides']),
+        'media': load_media_map(job['media']) if job['media'] else None,
+        'memory_budget': None if budget_mb is None else int(budget_mb * 2**20),
+        'deck': job.get('deck'),
+        'results': job.get('results'),
+    }
+
+def render_job(job, verbose=False):
+    """Render one job as built by _job(); return the output path"""
+    return create_presentation(verbose=verbose, **_job_kwargs(job))
+
+def _progress_job(job):
+    """Render one job, printing each iter_presentation() event as a JSON line"""
+    for event in iter_presentation(measure_xml=True, **_job_kwargs(job)):
+        print(json.dumps({'event': type(event).__name__, **event._asdict()}), flush=True)
+
+def _dry_run(args, jobs):
+    layouts = []
+    failed = False
+    for spec_path, job in jobs:
+        deck = layout_presentation(
+            slides=parse_slide_ranges(job['slides']) if job['slides'] else None,
+            brand=get_brand(job['variant']) if job['variant'] else None,
+            deck=job['deck'],
+            results=job.get('results'),
+        )
+        layout = deck.to_dict()
+        layout['problems'] = check_layout(deck)
+        if spec_path:
+            layout['spec'] = spec_path
+        for problem in layout['problems']:
+            print(f"{spec_path or 'deck'}: {problem}", file=sys.stderr)
+        failed = failed or bool(layout['problems'])
+        layouts.append(layout)
+
+    output = json.dumps(layouts[0] if len(layouts) == 1 else layouts, ensure_ascii=False, indent=1)
+    if args.out:
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+    return 1 if failed else 0
+
+def main(argv):
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if args.list:
+        for entry in select_slides():
+            print(f"{entry.number:>3}  {entry.title}")
+        return 0
+
+    jobs = []
+    for path in args.spec or [None]:
+        try:
+            job = _job(args, load_spec(path) if path else {})
+            _check_job(job)
+        except (OSError, ValueError) as e:
+            parser.error(f"{path}: {e}" if path else str(e))
+        jobs.append((path, job))
+    if args.dry_run:
+        return _dry_run(args, jobs)
+
+    if args.trace and (len(jobs) > 1 or args.workers > 1):
+        print("--trace records a single deck rendered in this process", file=sys.stderr)
+        return 2
+
+    pool = None
+    if not args.trace and args.workers > 1 and (len(jobs) > 1 or not args.progress):
+        from deck_workers import DeckWorkerPool
+        brands = {job['variant'] or DEFAULT_BRAND for _, job in jobs}
+        pool = DeckWorkerPool(args.workers, brands=brands)
+    # Only now: the pool forks its workers while this is the only thread
+    if os.environ.get('DECK_METRICS_PORT'):
+        serve_metrics(int(os.environ['DECK_METRICS_PORT']))
+
+    if args.trace:
+        with record_trace(args.trace) as recorder:
+            render_job(jobs[0][1], verbose=not args.quiet)
+        if not args.quiet:
+            print(f"Trace of {recorder.calls} call(s) written to: {args.trace}")
+    elif pool is not None:
+        with pool:
+            if len(jobs) > 1 and not args.no_share_prefix:
+                from deck_variants import render_variants
+                output_paths = render_variants([job for _, job in jobs], pool)
+            elif len(jobs) > 1:
+                output_paths = pool.map(job for _, job in jobs)
+            else:
+                output_paths = [pool.render_deck(jobs[0][1])]  # One deck: split its slides
+            for output_path in output_paths:
+                if not args.quiet:
+                    print(f"Presentation saved to: {output_path}")
+    elif args.progress:
+        for _, job in jobs:
+            _progress_job(job)
+    elif len(jobs) > 1 and not args.no_share_prefix:
+        from deck_variants import render_variants
+        for output_path in render_variants(job for _, job in jobs):
+            if not args.quiet:
+                print(f"Presentation saved to: {output_path}")
+    else:
+        for _, job in jobs:
+            render_job(job, verbose=not args.quiet)
 
-    return output_path
+    if os.environ.get('DECK_METRICS_FILE'):
+        dump_metrics(os.environ['DECK_METRICS_FILE'])
+    return 0
 
 if __name__ == "__main__":
-    create_presentation()
+    try:
+        sys.exit(main(sys.argv[1:]))
+    except BrokenPipeError:
+        # Output piped into `head` and the like: stop quietly, and keep the
+        # interpreter's final flush of stdout from failing again
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
@@ -0,0 +1,442 @@
+# -*- coding: utf-8 -*-
+"""
+Analytics slides (charts and tables) built from bulk data exports.
+
+Exports are loaded column-wise into NumPy arrays: CSV, JSON (a list of rows,
+the API's {"data": [...]} envelope, or JSON Lines) and Parquet when pyarrow
+is installed. Group-by, percentiles and top-N run vectorized over whole
+columns, so only the few aggregated numbers ever reach python-pptx.
+
+Default column names follow the tripwire_progress table and the
+funnel_analytics view (backend/src/routes/funnel-analytics.ts).
+
+The same progress export also feeds the real numbers on the Module 1
+results slide (create_presentation.py --results PROGRESS_EXPORT).
+
+Usage:
+    python deck_analytics.py PROGRESS_EXPORT [--funnel FUNNEL_EXPORT] [--out DECK.pptx]
+"""
+
+from brand_pack import BODY, HEADING, MONO
+from create_presentation import (
+    CYBER_ACID, CYBER_VOID, HOLO_WHITE, TECH_GRAY, ACID_15, Inches,
+    add_badge, add_bar_chart, add_card, add_data_table, add_footer, add_slide,
+    add_text_box, new_presentation, set_slide_background,
+)
+from deck_package import save_presentation
+from render_context import brand_of, context_of
+import csv
+import json
+import numpy as np
+import os
+import sys
+import time
+
+PROGRESS_COLUMNS = {
+    'user': 'tripwire_user_id',
+    'lesson': 'lesson_id',
+    'progress': 'video_progress_percent',
+    'completed': 'is_completed',
+    'watch_time': 'watch_time_seconds',
+}
+
+NAME_COLUMNS = ('full_name', 'name', 'email')
+# Lesson labels: lesson_id is a database id, not the lesson's number in the course
+LESSON_COLUMNS = ('lesson_number', 'lesson_title', 'title')
+
+FUNNEL_STAGES = [
+    ('proftest_count', 'Профтест'),
+    ('express_visit_count', 'Экспресс: визит'),
+    ('express_submit_count', 'Экспресс: заявка'),
+    ('purchase_count', 'Покупка'),
+]
+
+_TRUE = ('true', 't', 'yes', '1')
+_BOOL = _TRUE + ('false', 'f', 'no', '0')
+
+# ============================================================================
+# LOADING
+# ============================================================================
+
+def _column_array(values, name=None):
+    """Best-effort typed array: float (None/'' -> nan), bool, else str.
+
+    Label columns (LESSON_COLUMNS) stay text: lesson "1.10" is not 1.1.
+    """
+    if name in LESSON_COLUMNS:
+        return np.array(['' if v is None else _key_str(v) for v in values])
+    try:
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        pass
+
+    text = np.array(['' if v is None else str(v) for v in values])
+    lowered = np.char.lower(np.char.strip(text))
+    if np.isin(lowered, _BOOL + ('',)).all():
+        return np.isin(lowered, _TRUE)
+    try:
+        return np.where(lowered == '', 'nan', lowered).astype(np.float64)
+    except ValueError:
+        return text
+
+def _columns_from_rows(header, rows):
+    columns = list(zip(*rows)) or [()] * len(header)
+    return {name: _column_array(list(values), name) for name, values in zip(header, columns)}
+
+def _load_csv(path):
+    with open(path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader)
+        return _columns_from_rows(header, reader)
+
+def _load_json(path):
+    with open(path, encoding='utf-8-sig') as f:
+        text = f.read()
+    try:
+        records = json.loads(text)
+    except json.JSONDecodeError:
+        records = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(records, dict):
+        records = records.get('data', [])
+    if not records:
+        return {}
+
+    header = list(records[0])
+    return _columns_from_rows(header, ([record.get(k) for k in header] for record in records))
+
+def _load_parquet(path):
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Reading Parquet exports needs pyarrow (pip install pyarrow)") from None
+    table = pq.read_table(path)
+    return {
+        name: _column_array(table.column(name).to_numpy(zero_copy_only=False), name)
+        for name in table.column_names
+    }
+
+def load_table(path):
+    """Load an export as {column: ndarray}"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == '.parquet':
+        return _load_parquet(path)
+    if ext in ('.json', '.jsonl', '.ndjson'):
+        return _load_json(path)
+    return _load_csv(path)
+
+# ============================================================================
+# AGGREGATION
+# ============================================================================
+
+def group_by(keys, values=None, agg='sum'):
+    """Aggregate `values` per distinct key; return (groups, aggregates).
+
+    agg is 'count', 'sum' or 'mean'; nan values are ignored.
+    """
+    groups, inverse = np.unique(keys, return_inverse=True)
+    if agg == 'count':
+        return groups, np.bincount(inverse, minlength=len(groups))
+
+    values = np.asarray(values, dtype=np.float64)
+    valid = ~np.isnan(values)
+    sums = np.bincount(inverse[valid], weights=values[valid], minlength=len(groups))
+    if agg == 'sum':
+        return groups, sums
+    if agg == 'mean':
+        counts = np.bincount(inverse[valid], minlength=len(groups))
+        return groups, sums / np.maximum(counts, 1)
+    raise ValueError(f"Unknown aggregation: {agg}")
+
+def percentiles(values, qs=(50, 90)):
+    """{q: value} for the requested percentiles, ignoring nan"""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if not len(values):
+        return {q: float('nan') for q in qs}
+    return dict(zip(qs, np.percentile(values, qs).tolist()))
+
+def top_n(keys, values, n=10):
+    """The `n` largest values with their keys, largest first"""
+    n = min(n, len(values))
+    if n <= 0:
+        return keys[:0], values[:0]
+    idx = np.argpartition(-values, n - 1)[:n]
+    idx = idx[np.argsort(-values[idx], kind='stable')]
+    return keys[idx], values[idx]
+
+def progress_summary(table, columns=PROGRESS_COLUMNS):
+    """Per-lesson completion, watch-time percentiles and student count.
+
+    Lessons are in course order when the export has lesson numbers, else in
+    id order.
+    """
+    lessons, completion = group_by(
+        table[columns['lesson']], table[columns['completed']], agg='mean'
+    )
+    if 'lesson_number' in table and len(lessons):
+        numbers = _first_values(table, columns['lesson'], 'lesson_number', lessons)
+        order = sorted(range(len(lessons)), key=lambda i: _lesson_order(numbers[i]))
+        lessons, completion = lessons[order], completion[order]
+    watch = percentiles(table[columns['watch_time']] / 60, qs=(50, 90))
+    return {
+        'lessons': lessons,
+        'completion_pct': completion * 100,
+        'students': len(np.unique(table[columns['user']])),
+        'rows': len(table[columns['user']]),
+        'watch_minutes_p50': watch[50],
+        'watch_minutes_p90': watch[90],
+    }
+
+def module_summary(table, columns=PROGRESS_COLUMNS):
+    """Students, how many completed every lesson in the export, median watch time"""
+    users, completed = group_by(table[columns['user']], table[columns['completed']], agg='sum')
+    lessons = len(np.unique(table[columns['lesson']]))
+    finished = int(np.count_nonzero(completed >= lessons)) if lessons else 0
+    return {
+        'students': len(users),
+        'finished': finished,
+        'finished_pct': finished / len(users) * 100 if len(users) else 0.0,
+        'watch_minutes_p50': percentiles(table[columns['watch_time']] / 60, qs=(50,))[50],
+    }
+
+def leaderboard(table, n=10, columns=PROGRESS_COLUMNS):
+    """Top students by completed lessons, ties broken by mean video progress.
+
+    Returns [(label, completed, mean_progress)].
+    """
+    users, completed = group_by(table[columns['user']], table[columns['completed']], agg='sum')
+    _, progress = group_by(table[columns['user']], table[columns['progress']], agg='mean')
+
+    # Progress is 0..100, so this score orders by completed first, progress second
+    score = completed * 101 + progress
+    positions, _ = top_n(np.arange(len(users)), score, n)
+
+    labels = _user_labels(table, users[positions], columns['user'])
+    return [
+        (label, int(completed[i]), float(progress[i]))
+        for label, i in zip(labels, positions)
+    ]
+
+def _short_ids(ids):
+    """Display forms of ids: long ones cut to the shortest prefix (8 characters
+    or more) that keeps them apart"""
+    ids = [str(i) for i in ids]
+    width = 8
+    while True:
+        labels = [i if len(i) <= max(16, width) else i[:width] + '…' for i in ids]
+        if len(set(labels)) == len(set(ids)) or width >= max(map(len, ids)):
+            return labels
+        width += 4
+
+def _lesson_order(number):
+    """Sort key for lesson numbers: "1.2" before "1.10", text after numbers"""
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part) for part in str(number).split('.')]
+
+def _key_str(key):
+    """Display form of an id or number: 12.0 -> '12', 1.3 -> '1.3', strings unchanged"""
+    if isinstance(key, (float, np.floating)) and float(key).is_integer():
+        return str(int(key))
+    return str(key)
+
+def _first_values(table, key_column, value_column, keys):
+    """value_column at each key's first row"""
+    # np.unique's first-occurrence index picks one row per key
+    ids, first = np.unique(table[key_column], return_index=True)
+    return table[value_column][first[np.searchsorted(ids, keys)]]
+
+def _user_labels(table, users, user_column):
+    name_column = next((name for name in NAME_COLUMNS if name in table), None)
+    if name_column is None:
+        return _short_ids(users)
+    return [str(name) for name in _first_values(table, user_column, name_column, users)]
+
+def _lesson_labels(table, lessons, lesson_column):
+    """Chart labels for lesson ids: the export's lesson number or title, else the id itself"""
+    label_column = next((name for name in LESSON_COLUMNS if name in table), None)
+    if label_column is None:
+        return [f"ID {label}" for label in _short_ids(map(_key_str, lessons))]
+    values = _first_values(table, lesson_column, label_column, lessons)
+    if label_column == 'lesson_number':
+        return [f"Урок {_key_str(value)}" for value in values]
+    return [str(value) for value in values]
+
+def funnel_summary(table, stages=FUNNEL_STAGES):
+    """[(label, total, conversion_from_previous_pct)] for stages present in the export"""
+    summary = []
+    previous = None
+    for column, label in stages:
+        if column not in table:
+            continue
+        total = float(np.nansum(table[column]))
+        conversion = total / previous * 100 if previous else None
+        summary.append((label, total, conversion))
+        previous = total
+    return summary
+
+# ============================================================================
+# SLIDES
+# ============================================================================
+
+def _title(slide, text, badge):
+    set_slide_background(slide, CYBER_VOID)
+    add_text_box(
+        slide, brand_of(slide).content_left, Inches(0.5),
+        Inches(10), Inches(0.9), text,
+        font_name=HEADING, font_size=48,
+        font_color=HOLO_WHITE, font_bold=True
+    )
+    add_badge(slide, badge)
+
+def _stat_card(slide, left, top, value, label, highlighted=False):
+    if highlighted:
+        add_card(
+            slide, left, top, Inches(4), Inches(1.5),
+            fill_color=ACID_15, border_color=CYBER_ACID
+        )
+    else:
+        add_card(slide, left, top, Inches(4), Inches(1.5))
+    add_text_box(
+        slide, left + Inches(0.3), top + Inches(0.15),
+        Inches(3.5), Inches(0.7), value,
+        font_name=HEADING, font_size=32,
+        font_color=CYBER_ACID if highlighted else HOLO_WHITE, font_bold=True
+    )
+    add_text_box(
+        slide, left + Inches(0.3), top + Inches(0.85),
+        Inches(3.5), Inches(0.4), label,
+        font_name=BODY, font_size=16,
+        font_color=TECH_GRAY
+    )
+
+def create_progress_slide(prs, table, columns=PROGRESS_COLUMNS):
+    """Completion by lesson plus headline numbers"""
+    summary = progress_summary(table, columns)
+    slide = add_slide(prs, prs.slide_layouts[6])
+    left = brand_of(prs).content_left
+    _title(slide, "ПРОГРЕСС СТУДЕНТОВ", "[DATA]")
+
+    add_text_box(
+        slide, left, Inches(1.4),
+        Inches(7.5), Inches(0.4), "Завершили урок, %",
+        font_name=MONO, font_size=16,
+        font_color=TECH_GRAY
+    )
+    add_bar_chart(
+        slide, left, Inches(1.8), Inches(7.8), Inches(4.8),
+        _lesson_labels(table, summary['lessons'], columns['lesson']),
+        summary['completion_pct'], series_name='Завершили, %'
+    )
+
+    cards_left = Inches(8.8)
+    _stat_card(slide, cards_left, Inches(1.8), f"{summary['students']:,}".replace(',', ' '), "студентов", True)
+    _stat_card(slide, cards_left, Inches(3.5), f"{summary['watch_minutes_p50']:.0f} мин", "медиана просмотра")
+    _stat_card(slide, cards_left, Inches(5.2), f"{summary['watch_minutes_p90']:.0f} мин", "90-й перцентиль")
+
+    add_footer(slide, f"VIBE CODING STARTER • {summary['rows']} записей")
+    return slide
+
+def add_results_strip(slide, table, columns=PROGRESS_COLUMNS):
+    """Cohort numbers from a progress export under the results grid of slide 10"""
+    summary = module_summary(table, columns)
+    ctx = context_of(slide)
+    left = ctx.brand.content_left
+    students = f"{summary['students']:,}".replace(',', ' ')
+    add_text_box(
+        slide, left, Inches(5.85), ctx.slide_width - 2 * left, Inches(0.5),
+        f"{students} студентов • {summary['finished']} ({summary['finished_pct']:.0f}%) "
+        f"прошли все уроки • медиана просмотра {summary['watch_minutes_p50']:.0f} мин",
+        font_name=MONO, font_size=18,
+        font_color=CYBER_ACID
+    )
+
+def create_leaderboard_slide(prs, table, n=10, columns=PROGRESS_COLUMNS):
+    """Top-N students table"""
+    rows = leaderboard(table, n, columns)
+    slide = add_slide(prs, prs.slide_layouts[6])
+    ctx = context_of(prs)
+    left = ctx.brand.content_left
+    _title(slide, "ЛИДЕРБОРД", f"[TOP {n}]")
+
+    add_data_table(
+        slide, left, Inches(1.5), ctx.slide_width - 2 * left,
+        ["#", "СТУДЕНТ", "УРОКОВ ПРОЙДЕНО", "СРЕДНИЙ ПРОГРЕСС"],
+        [
+            (rank, label, completed, f"{progress:.0f}%")
+            for rank, (label, completed, progress) in enumerate(rows, start=1)
+        ],
+        col_widths=[Inches(0.8), Inches(6.3), Inches(2.6), Inches(2.633)],
+        highlight_rows=(0,)
+    )
+
+    add_footer(slide, "VIBE CODING STARTER")
+    return slide
+
+def create_funnel_slide(prs, table, stages=FUNNEL_STAGES):
+    """Funnel totals chart plus stage-to-stage conversion table"""
+    summary = funnel_summary(table, stages)
+    slide = add_slide(prs, prs.slide_layouts[6])
+    ctx = context_of(prs)
+    left = ctx.brand.content_left
+    _title(slide, "ВОРОНКА", "[FUNNEL]")
+
+    add_bar_chart(
+        slide, left, Inches(1.6), Inches(7.2), Inches(5),
+        [label for label, _, _ in summary], [total for _, total, _ in summary],
+        series_name='Всего'
+    )
+    add_data_table(
+        slide, Inches(8), Inches(1.8), ctx.slide_width - Inches(8) - left,
+        ["ЭТАП", "ВСЕГО", "CR"],
+        [
+            (label, f"{total:.0f}", '—' if conversion is None else f"{conversion:.1f}%")
+            for label, total, conversion in summary
+        ],
+        col_widths=[Inches(2.4), Inches(1.2), Inches(1.233)],
+        font_size=13,
+        highlight_rows=(len(summary) - 1,)
+    )
+
+    add_footer(slide, "VIBE CODING STARTER")
+    return slide
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def build_analytics_deck(progress_path, out_path, funnel_path=None, brand=None):
+    """Render the analytics deck; return the number of slides"""
+    prs = new_presentation(brand)
+
+    progress = load_table(progress_path)
+    create_progress_slide(prs, progress)
+    create_leaderboard_slide(prs, progress)
+    if funnel_path:
+        create_funnel_slide(prs, load_table(funnel_path))
+
+    save_presentation(prs, out_path)
+    return len(prs.slides)
+
+def main(argv):
+    if not argv or argv[0] in ('-h', '--help'):
+        print(__doc__.strip())
+        return 2
+
+    out_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ANALYTICS.pptx')
+    funnel_path = None
+    args = list(argv)
+    for flag in ('--funnel', '--out'):
+        if flag in args:
+            i = args.index(flag)
+            if flag == '--funnel':
+                funnel_path = args[i + 1]
+            else:
+                out_path = args[i + 1]
+            del args[i:i + 2]
+
+    start = time.perf_counter()
+    slides = build_analytics_deck(args[0], out_path, funnel_path)
+    print(f"{slides} slides saved to: {out_path} ({time.perf_counter() - start:.2f} s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,467 @@
+# -*- coding: utf-8 -*-
+"""
+Assemble decks from already-built packages, and split them back apart.
+
+Works at the OPC part level: slide parts and media are copied as raw zip
+entries, and only relationship files, presentation.xml and
+[Content_Types].xml are regenerated. Masters, layouts, themes and media that
+are shared between the input decks are stored once.
+
+Usage:
+    python deck_compose.py compose OUT.pptx DECK.pptx[:SLIDES] [DECK.pptx[:SLIDES] ...]
+    python deck_compose.py split DECK.pptx OUT_DIR NAME=SLIDES [NAME=SLIDES ...]
+
+SLIDES is a list of 1-based slide numbers and ranges, e.g. "1-3,5".
+"""
+
+from deck_package import (
+    CONTENT_TYPES_PART, CT_RELATIONSHIPS, CT_XML, NS, PRESENTATION_PART, ROOT_RELS_PART,
+    ContentTypes, PackageWriter, atomic_write, read_rels, relative_target, rels_name,
+    serialize_rels, slide_part_names,
+)
+from lxml import etree
+import hashlib
+import os
+import re
+import sys
+import zipfile
+
+CT_PREFIX = 'application/vnd.openxmlformats-officedocument.presentationml.'
+CT_SLIDE = CT_PREFIX + 'slide+xml'
+CT_SLIDE_LAYOUT = CT_PREFIX + 'slideLayout+xml'
+CT_SLIDE_MASTER = CT_PREFIX + 'slideMaster+xml'
+CT_NOTES_SLIDE = CT_PREFIX + 'notesSlide+xml'
+CT_NOTES_MASTER = CT_PREFIX + 'notesMaster+xml'
+
+RT_PREFIX = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/'
+RT_SLIDE = RT_PREFIX + 'slide'
+RT_SLIDE_LAYOUT = RT_PREFIX + 'slideLayout'
+RT_SLIDE_MASTER = RT_PREFIX + 'slideMaster'
+RT_NOTES_MASTER = RT_PREFIX + 'notesMaster'
+RT_HANDOUT_MASTER = RT_PREFIX + 'handoutMaster'
+RT_OFFICE_DOCUMENT = RT_PREFIX + 'officeDocument'
+RT_EXTENDED_PROPERTIES = RT_PREFIX + 'extended-properties'
+
+EXTENDED_PROPERTIES_NS = 'http://schemas.openxmlformats.org/officeDocument/2006/extended-properties'
+
+# Slide master and slide layout ids share one number space starting here
+MIN_MASTER_ID = 2147483648
+MIN_SLIDE_ID = 256
+
+_NUMBERED_NAME_RE = re.compile(r'^(.*?)(\d*)(\.[^./]+)?$')
+
+def _p(tag):
+    return f"{{{NS['p']}}}{tag}"
+
+_R_ID = f"{{{NS['r']}}}id"
+
+# ============================================================================
+# SLIDE SELECTION
+# ============================================================================
+
+def parse_slide_ranges(spec):
+    """Parse "1-3,5" into [1, 2, 3, 5]; ValueError for anything else"""
+    numbers = []
+    for chunk in spec.split(','):
+        chunk = chunk.strip()
+        if not chunk:
+            continue
+        first, _, last = chunk.partition('-')
+        try:
+            first = int(first)
+            last = int(last) if last else first
+        except ValueError:
+            raise ValueError(f"Bad slide range: {chunk!r} (expected e.g. \"1-3,5\")") from None
+        if first < 1 or last < first:
+            raise ValueError(f"Bad slide range: {chunk!r} (slides are numbered from 1)")
+        numbers.extend(range(first, last + 1))
+    if not numbers:
+        raise ValueError(f"No slides in {spec!r}")
+    return numbers
+
+# ============================================================================
+# SOURCE PACKAGES
+# ============================================================================
+
+class _SourceDeck:
+    """An input package opened for reading and raw entry copies"""
+
+    def __init__(self, key, path):
+        self.key = key
+        self.path = path
+        self.zf = zipfile.ZipFile(path)
+        self.fp = open(path, 'rb')
+        self.content_types = ContentTypes.from_zip(self.zf)
+        self._rels = {}
+        self._digests = {}
+
+    def close(self):
+        self.zf.close()
+        self.fp.close()
+
+    def __contains__(self, name):
+        return name in self.zf.NameToInfo
+
+    def read(self, name):
+        return self.zf.read(name)
+
+    def content_type(self, name):
+        return self.content_types.get(name)
+
+    def rels(self, name):
+        if name not in self._rels:
+            self._rels[name] = read_rels(self.zf, name)
+        return self._rels[name]
+
+    def related(self, name, reltype):
+        for rel_type, target, is_external in self.rels(name).values():
+            if rel_type == reltype and not is_external:
+                return target
+        return None
+
+    def digest(self, name, _stack=()):
+        """Structural digest of a part and everything it relates to.
+
+        Built from content type, CRC and size (no decompression) plus the
+        digests of related parts, so equal digests mean equal subgraphs.
+        A relationship back to a part already on `_stack` is recorded as a
+        cycle marker instead of being followed.
+        """
+        if name in _stack:
+            return f'cycle:{len(_stack) - _stack.index(name)}'
+        if name in self._digests:
+            return self._digests[name]
+        if name not in self:
+            return 'missing'
+
+        info = self.zf.getinfo(name)
+        h = hashlib.sha1(f'{self.content_type(name)}|{info.CRC}|{info.file_size}'.encode())
+        for r_id, (reltype, target, is_external) in sorted(self.rels(name).items()):
+            target_digest = target if is_external else self.digest(target, _stack + (name,))
+            h.update(f'|{r_id}|{reltype}|{target_digest}'.encode())
+
+        self._digests[name] = h.hexdigest()
+        return self._digests[name]
+
+# ============================================================================
+# COMPOSER
+# ============================================================================
+
+class _Composer:
+    """Plans the output package: part names, relationships and raw copies"""
+
+    def __init__(self):
+        self.entries = []            # (out_name, source deck or None, source name, data)
+        self.content_types = ContentTypes({'rels': CT_RELATIONSHIPS, 'xml': CT_XML})
+        self.part_map = {}           # (deck key, source name) -> out name
+        self.by_digest = {}          # digest -> (out name, deck, source name)
+        self.families = {}           # family digest -> (out master, {rId: out layout}, deck, name)
+        self.used_names = {PRESENTATION_PART}
+        self.counters = {}
+        self.masters = []
+        self.master_ids = {}
+        self.next_master_id = MIN_MASTER_ID
+        self.notes_master = None
+        self.slides = []
+
+    def _allocate(self, name):
+        prefix, number, suffix = _NUMBERED_NAME_RE.match(name).groups()
+        suffix = suffix or ''
+        if not number and name not in self.used_names:
+            self.used_names.add(name)
+            return name
+
+        n = self.counters.get((prefix, suffix), 1)
+        while f'{prefix}{n}{suffix}' in self.used_names:
+            n += 1
+        self.counters[(prefix, suffix)] = n + 1
+        out_name = f'{prefix}{n}{suffix}'
+        self.used_names.add(out_name)
+        return out_name
+
+    def _next_master_id(self):
+        master_id = self.next_master_id
+        self.next_master_id += 1
+        return master_id
+
+    def _copy(self, deck, name, out_name, data=None):
+        """Schedule a part (raw copy unless `data` is given) and rewrite its rels"""
+        self.content_types.add(out_name, deck.content_type(name))
+        self.entries.append((out_name, deck, name, data))
+
+        rels = deck.rels(name)
+        if not rels:
+            return
+
+        out_rels = []
+        for r_id, (reltype, target, is_external) in rels.items():
+            if is_external:
+                out_rels.append((r_id, reltype, target, True))
+                continue
+            out_target = self._import(deck, target)
+            if out_target is not None:
+                out_rels.append((r_id, reltype, relative_target(out_name, out_target), False))
+        self.entries.append((rels_name(out_name), None, None, serialize_rels(out_rels)))
+
+    def _import(self, deck, name):
+        """Return the output name for a related part, copying it if needed"""
+        key = (deck.key, name)
+        if key in self.part_map:
+            return self.part_map[key]
+        if name not in deck:
+            return None
+
+        content_type = deck.content_type(name)
+        if content_type == CT_SLIDE_MASTER:
+            return self._import_master(deck, name)
+        if content_type == CT_SLIDE_LAYOUT:
+            self._import_master(deck, deck.related(name, RT_SLIDE_MASTER))
+            return self.part_map[key]
+        if content_type == CT_SLIDE:
+            # Link to a slide that is not part of the output
+            return None
+        if content_type == CT_NOTES_MASTER and self.notes_master:
+            self.part_map[key] = self.notes_master
+            return self.notes_master
+        if content_type == CT_NOTES_SLIDE:
+            out_name = self.part_map[key] = self._allocate(name)
+            self._copy(deck, name, out_name)
+            return out_name
+
+        digest = deck.digest(name)
+        hit = self.by_digest.get(digest)
+        if hit and hit[1].read(hit[2]) == deck.read(name):
+            self.part_map[key] = hit[0]
+            return hit[0]
+
+        out_name = self.part_map[key] = self._allocate(name)
+        self.by_digest[digest] = (out_name, deck, name)
+        if content_type == CT_NOTES_MASTER:
+            self.notes_master = out_name
+        self._copy(deck, name, out_name)
+        return out_name
+
+    def _import_master(self, deck, master_name):
+        """Import a slide master together with all of its layouts"""
+        rels = deck.rels(master_name)
+        info = deck.zf.getinfo(master_name)
+        h = hashlib.sha1(f'{info.CRC}|{info.file_size}'.encode())
+        for r_id, (reltype, target, is_external) in sorted(rels.items()):
+            target_digest = target if is_external else deck.digest(target, (master_name,))
+            h.update(f'|{r_id}|{reltype}|{target_digest}'.encode())
+        family = h.hexdigest()
+
+        layouts = {
+            r_id: target for r_id, (reltype, target, is_external) in rels.items()
+            if reltype == RT_SLIDE_LAYOUT and not is_external
+        }
+
+        existing = self.families.get(family)
+        if existing and existing[2].read(existing[3]) == deck.read(master_name):
+            out_master, out_layouts = existing[:2]
+            self.part_map[(deck.key, master_name)] = out_master
+            for r_id, layout in layouts.items():
+                self.part_map[(deck.key, layout)] = out_layouts[r_id]
+            return out_master
+
+        out_master = self.part_map[(deck.key, master_name)] = self._allocate(master_name)
+        out_layouts = {}
+        for r_id, layout in layouts.items():
+            out_layouts[r_id] = self.part_map[(deck.key, layout)] = self._allocate(layout)
+        self.families[family] = (out_master, out_layouts, deck, master_name)
+
+        # Master and layout ids must be unique across every master in the deck
+        self.master_ids[out_master] = self._next_master_id()
+        root = etree.fromstring(deck.read(master_name))
+        for layout_id in root.iterfind('p:sldLayoutIdLst/p:sldLayoutId', NS):
+            layout_id.set('id', str(self._next_master_id()))
+        data = etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+        self._copy(deck, master_name, out_master, data=data)
+        for r_id, layout in layouts.items():
+            self._copy(deck, layout, out_layouts[r_id])
+        self.masters.append(out_master)
+        return out_master
+
+    def add_slide(self, deck, slide_name):
+        key = (deck.key, slide_name)
+        if key in self.part_map:
+            raise ValueError(f"Slide selected twice: {deck.path} {slide_name}")
+
+        out_name = self.part_map[key] = self._allocate(slide_name)
+        self.slides.append(out_name)
+        self._copy(deck, slide_name, out_name)
+
+    def _presentation_xml(self, base, new_rels):
+        root = etree.fromstring(base.read(PRESENTATION_PART))
+        for tag in ('sldMasterIdLst', 'notesMasterIdLst', 'handoutMasterIdLst', 'sldIdLst'):
+            for el in root.findall(_p(tag)):
+                root.remove(el)
+
+        used_r_ids = {r_id for r_id, _, _, _ in new_rels}
+        counter = iter(range(1, 1 << 30))
+
+        def next_r_id():
+            while True:
+                r_id = f'rId{next(counter)}'
+                if r_id not in used_r_ids:
+                    used_r_ids.add(r_id)
+                    return r_id
+
+        lists = []
+        master_lst = etree.Element(_p('sldMasterIdLst'))
+        for out_master in self.masters:
+            r_id = next_r_id()
+            new_rels.append((r_id, RT_SLIDE_MASTER, relative_target(PRESENTATION_PART, out_master), False))
+            etree.SubElement(master_lst, _p('sldMasterId'), {'id': str(self.master_ids[out_master]), _R_ID: r_id})
+        lists.append(master_lst)
+
+        if self.notes_master:
+            r_id = next_r_id()
+            new_rels.append((r_id, RT_NOTES_MASTER, relative_target(PRESENTATION_PART, self.notes_master), False))
+            notes_lst = etree.Element(_p('notesMasterIdLst'))
+            etree.SubElement(notes_lst, _p('notesMasterId'), {_R_ID: r_id})
+            lists.append(notes_lst)
+
+        sld_lst = etree.Element(_p('sldIdLst'))
+        for i, out_slide in enumerate(self.slides):
+            r_id = next_r_id()
+            new_rels.append((r_id, RT_SLIDE, relative_target(PRESENTATION_PART, out_slide), False))
+            etree.SubElement(sld_lst, _p('sldId'), {'id': str(MIN_SLIDE_ID + i), _R_ID: r_id})
+        if self.slides:
+            lists.append(sld_lst)
+
+        # These lists are the first children of <p:presentation>, in this order
+        root[0:0] = lists
+        return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+    def _app_xml(self, data):
+        root = etree.fromstring(data)
+        slides = root.find(f'{{{EXTENDED_PROPERTIES_NS}}}Slides')
+        if slides is not None:
+            slides.text = str(len(self.slides))
+        return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+    def finish(self, base):
+        """Plan presentation.xml and package-level parts from the base deck"""
+        # Presentation-level parts other than masters and slides (presProps,
+        # viewProps, theme, tableStyles, ...) come from the base deck
+        skipped = (RT_SLIDE, RT_SLIDE_MASTER, RT_NOTES_MASTER, RT_HANDOUT_MASTER)
+        pres_rels = []
+        for r_id, (reltype, target, is_external) in base.rels(PRESENTATION_PART).items():
+            if reltype in skipped:
+                continue
+            if is_external:
+                pres_rels.append((r_id, reltype, target, True))
+                continue
+            out_target = self._import(base, target)
+            if out_target is not None:
+                pres_rels.append((r_id, reltype, relative_target(PRESENTATION_PART, out_target), False))
+
+        self.content_types.add(PRESENTATION_PART, base.content_type(PRESENTATION_PART))
+        self.entries.append((PRESENTATION_PART, None, None, self._presentation_xml(base, pres_rels)))
+        self.entries.append((rels_name(PRESENTATION_PART), None, None, serialize_rels(pres_rels)))
+
+        root_rels = []
+        for r_id, (reltype, target, is_external) in base.rels('').items():
+            if is_external:
+                root_rels.append((r_id, reltype, target, True))
+            elif reltype == RT_OFFICE_DOCUMENT:
+                root_rels.append((r_id, reltype, PRESENTATION_PART, False))
+            elif target in base:
+                out_name = self._allocate(target)
+                data = None
+                if reltype == RT_EXTENDED_PROPERTIES:
+                    data = self._app_xml(base.read(target))
+                self.content_types.add(out_name, base.content_type(target))
+                self.entries.append((out_name, base, target, data))
+                root_rels.append((r_id, reltype, out_name, False))
+        return serialize_rels(root_rels)
+
+# ============================================================================
+# COMPOSE / SPLIT
+# ============================================================================
+
+def compose_decks(sources, out_path, date_time=None):
+    """Merge decks into one at the part level.
+
+    `sources` is a list of (path, slide_numbers) pairs; slide_numbers is a
+    list of 1-based slide numbers, or None for every slide. Package-level
+    settings (slide size, presProps, docProps) come from the first deck.
+    `date_time` pins the zip entry timestamps (local time by default).
+    """
+    decks = []
+    try:
+        composer = _Composer()
+        for key, (path, slide_numbers) in enumerate(sources):
+            deck = _SourceDeck(key, path)
+            decks.append(deck)
+            slide_names = slide_part_names(deck.zf)
+            for number in slide_numbers or range(1, len(slide_names) + 1):
+                if not 1 <= number <= len(slide_names):
+                    raise ValueError(f"{path} has no slide {number}")
+                composer.add_slide(deck, slide_names[number - 1])
+
+        root_rels = composer.finish(decks[0])
+
+        with atomic_write(out_path) as f, PackageWriter(f, date_time) as writer:
+            writer.write(CONTENT_TYPES_PART, composer.content_types.to_xml())
+            writer.write(ROOT_RELS_PART, root_rels)
+            for out_name, deck, name, data in composer.entries:
+                if data is None:
+                    writer.copy_entry(deck.fp, deck.zf.getinfo(name), out_name)
+                else:
+                    writer.write(out_name, data)
+    finally:
+        for deck in decks:
+            deck.close()
+
+    return out_path
+
+def split_deck(path, groups, out_dir):
+    """Write one deck per group of slides; `groups` maps name -> slide numbers"""
+    os.makedirs(out_dir, exist_ok=True)
+    out_paths = []
+    for name, slide_numbers in groups.items():
+        out_path = os.path.join(out_dir, f"{name}.pptx")
+        compose_decks([(path, slide_numbers)], out_path)
+        out_paths.append(out_path)
+    return out_paths
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def _parse_source(arg):
+    path, sep, spec = arg.rpartition(':')
+    if not sep or not spec or not re.fullmatch(r'[\d,\- ]+', spec):
+        return arg, None
+    return path, parse_slide_ranges(spec)
+
+def main(argv):
+    try:
+        return _main(argv)
+    except ValueError as e:
+        print(f"deck_compose.py: error: {e}", file=sys.stderr)
+        return 2
+
+def _main(argv):
+    if len(argv) >= 3 and argv[0] == 'compose':
+        out_path = compose_decks([_parse_source(arg) for arg in argv[2:]], argv[1])
+        print(f"Composed: {out_path}")
+        return 0
+
+    if len(argv) >= 4 and argv[0] == 'split':
+        groups = {}
+        for arg in argv[3:]:
+            name, _, spec = arg.partition('=')
+            groups[name] = parse_slide_ranges(spec)
+        for out_path in split_deck(argv[1], groups, argv[2]):
+            print(f"Split: {out_path}")
+        return 0
+
+    print(__doc__.strip())
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,791 @@
+# -*- coding: utf-8 -*-
+"""
+Import hand-made .pptx decks as generator build specs.
+
+Each slide part is stream-parsed straight out of the zip (no python-pptx
+objects) and every shape is mapped back to the shape helper that would draw
+it: cards, badges, number indicators, step circles, checkboxes, text boxes,
+rectangles, lines, tables and column charts. Colors - literal or from the
+deck's own theme - are matched to the nearest slot of the target brand
+palette, and typefaces to the brand's font roles, so the rebuilt deck follows
+the brand and can be re-skinned like any generated one.
+
+An imported deck is a build spec (see create_presentation.load_spec()) whose
+"deck" holds the slides, so it renders through the normal pipeline:
+
+    {"out": "intro.imported.pptx",
+     "deck": {"format": "deck-spec", "version": 1, "source": "intro.pptx",
+              "slide_width": 12192000, "slide_height": 6858000,
+              "slides": [{"title": "Intro", "background": "DARK_1",
+                          "shapes": [{"primitive": "add_card", "left": 457200, ...}],
+                          "skipped": [{"kind": "picture", ...}]}]}}
+
+Geometry is in EMU; colors are theme color names (MSO_THEME_COLOR), or
+[name, brightness] for the generator's tints (create_presentation.Tint), and
+arguments equal to the helper's default are left out. Shapes that have no
+helper (pictures, custom geometry, other charts) are listed under "skipped"
+for hand migration. Directories are imported in parallel worker processes.
+
+Usage:
+    python deck_import.py DECK_OR_DIR [...] [--out-dir DIR] [--variant PACK] [--workers N]
+    python create_presentation.py --spec intro.spec.json [--spec ...] [--workers N]
+"""
+
+from brand_pack import BODY, DEFAULT_BRAND, HEADING, get_brand
+from concurrent.futures import ProcessPoolExecutor
+from deck_package import NS, expand_deck_paths, read_rels, slide_part_names
+from deck_parity import COLOR_MAP, read_theme_colors
+from deck_theme import THEME_PART, apply_brightness, resolve_luminance
+from lxml import etree
+from pptx.enum.dml import MSO_THEME_COLOR
+from pptx.enum.shapes import MSO_SHAPE
+from pptx.enum.text import MSO_ANCHOR, PP_ALIGN
+from pptx.util import Emu, Inches
+import argparse
+import inspect
+import json
+import multiprocessing
+import os
+import sys
+import zipfile
+
+SPEC_FORMAT = 'deck-spec'
+SPEC_VERSION = 1
+
+NS_C = 'http://schemas.openxmlformats.org/drawingml/2006/chart'
+
+# Brand palette slot -> theme color the helpers take
+SLOT_COLORS = {
+    'dk1': 'DARK_1', 'lt1': 'LIGHT_1', 'dk2': 'DARK_2', 'lt2': 'LIGHT_2',
+    'accent1': 'ACCENT_1', 'accent2': 'ACCENT_2', 'accent3': 'ACCENT_3',
+    'accent4': 'ACCENT_4', 'accent5': 'ACCENT_5', 'accent6': 'ACCENT_6',
+    'hlink': 'HYPERLINK', 'folHlink': 'FOLLOWED_HYPERLINK',
+}
+COLOR_SLOTS = {name: slot for slot, name in SLOT_COLORS.items()}
+
+# Helpers a spec may call, and how their arguments are decoded
+PRIMITIVES = (
+    'add_text_box', 'add_shape_with_text', 'add_rectangle', 'add_line', 'add_badge',
+    'add_card', 'add_number_indicator', 'add_step_circle', 'add_checkbox',
+    'add_bar_chart', 'add_data_table',
+)
+COLOR_ARGS = {'fill_color', 'line_color', 'border_color', 'font_color', 'color', 'bar_color'}
+LENGTH_ARGS = {
+    'left', 'top', 'width', 'height', 'start_x', 'start_y', 'end_x', 'end_y',
+    'size', 'right_offset', 'line_width', 'border_width', 'row_height',
+}
+ENUM_ARGS = {'alignment': PP_ALIGN, 'vertical_anchor': MSO_ANCHOR, 'shape_type': MSO_SHAPE}
+
+# Recognizing helper shapes: sizes the helpers draw at, with room for hand-made copies
+SQUARE_TOLERANCE = Inches(0.02)
+MAX_CHECKBOX = Inches(0.5)
+MAX_BADGE_HEIGHT = Inches(0.6)
+BADGE_BAND = Inches(1.2)  # Badges sit in the top band, right half
+TITLE_PLACEHOLDERS = ('title', 'ctrTitle')
+TITLE_FONT_SIZE = 40
+
+IMPORT_WORKERS = None  # os.cpu_count()
+
+def _a(tag):
+    return f"{{{NS['a']}}}{tag}"
+
+def _p(tag):
+    return f"{{{NS['p']}}}{tag}"
+
+def _c(tag):
+    return f"{{{NS_C}}}{tag}"
+
+_SHAPE_TAGS = (_p('sp'), _p('cxnSp'), _p('graphicFrame'), _p('pic'), _p('grpSp'))
+_SP_TREE = _p('spTree')
+_COLOR_TAGS = {_a('srgbClr'), _a('schemeClr'), _a('sysClr'), _a('prstClr')}
+_R_ID = f"{{{NS['r']}}}id"
+_R_EMBED = f"{{{NS['r']}}}embed"
+
+# ============================================================================
+# BRAND MATCHING
+# ============================================================================
+
+def _rgb(hex_value):
+    return tuple(int(hex_value[i:i + 2], 16) for i in (0, 2, 4))
+
+def _distance(a, b):
+    """Perceptually weighted RGB distance ("redmean")"""
+    mean_red = (a[0] + b[0]) / 2
+    dr, dg, db = a[0] - b[0], a[1] - b[1], a[2] - b[2]
+    return (2 + mean_red / 256) * dr * dr + 4 * dg * dg + (2 + (255 - mean_red) / 256) * db * db
+
+class BrandMatcher:
+    """Maps a source deck's colors and typefaces onto a brand"""
+
+    def __init__(self, brand, theme_colors=None, theme_fonts=None):
+        import create_presentation as cp
+        # Candidates: the palette slots, then the tints the helpers draw with
+        self.palette = [(SLOT_COLORS[slot], _rgb(value)) for slot, value in brand.palette.items()]
+        for tint in cp.TINTS:
+            base = brand.palette[COLOR_SLOTS[tint.theme_color.name]]
+            self.palette.append((_encode_color(tint), _rgb(apply_brightness(base, tint.brightness))))
+        self.theme_colors = theme_colors or {}
+        self.fonts = {typeface: role for role, typeface in brand.fonts.items()}
+        # Theme font references, and the source theme's own typefaces
+        self.fonts.update({'+mj-lt': HEADING, '+mn-lt': BODY})
+        for role, typeface in (theme_fonts or {}).items():
+            self.fonts.setdefault(typeface, role)
+        self._cache = {}
+        self.approximate = 0
+
+    def color(self, elem):
+        """Spec color for a color element (<a:srgbClr>, <a:schemeClr>, ...)"""
+        if elem.tag == _a('schemeClr'):
+            slot = elem.get('val')
+            hex_value = self.theme_colors.get(COLOR_MAP.get(slot, slot))
+        elif elem.tag == _a('sysClr'):
+            hex_value = elem.get('lastClr')
+        elif elem.tag == _a('srgbClr'):
+            hex_value = elem.get('val')
+        else:
+            hex_value = None
+        if not hex_value:
+            return None
+
+        hex_value = resolve_luminance(hex_value.upper(), elem)
+        match = self._cache.get(hex_value)
+        if match is None:
+            rgb = _rgb(hex_value)
+            color, value = min(self.palette, key=lambda candidate: _distance(rgb, candidate[1]))
+            match = self._cache[hex_value] = (color, value != rgb)
+        if match[1]:
+            self.approximate += 1
+        return match[0]
+
+    def font(self, typeface):
+        return self.fonts.get(typeface, typeface)
+
+def read_theme_fonts(zf):
+    """{role: typeface} of the deck theme's major (heading) and minor (body) fonts"""
+    if THEME_PART not in zf.NameToInfo:
+        return {}
+    root = etree.fromstring(zf.read(THEME_PART))
+    fonts = {}
+    for role, tag in ((HEADING, 'majorFont'), (BODY, 'minorFont')):
+        latin = root.find(f'.//a:fontScheme/a:{tag}/a:latin', NS)
+        if latin is not None and latin.get('typeface'):
+            fonts[role] = latin.get('typeface')
+    return fonts
+
+# ============================================================================
+# SHAPE PROPERTIES
+# ============================================================================
+
+def _first_color(parent, matcher):
+    color = next((child for child in parent if child.tag in _COLOR_TAGS), None)
+    return matcher.color(color) if color is not None else None
+
+def _fill(sp_pr, style, matcher):
+    """Fill color name; None for no fill. Falls back to the shape style's fillRef."""
+    if sp_pr is not None:
+        if sp_pr.find('a:noFill', NS) is not None:
+            return None
+        solid = sp_pr.find('a:solidFill', NS)
+        if solid is not None:
+            return _first_color(solid, matcher)
+        if sp_pr.find('a:gradFill', NS) is not None or sp_pr.find('a:blipFill', NS) is not None:
+            return None
+    ref = style.find('a:fillRef', NS) if style is not None else None
+    if ref is not None and ref.get('idx') != '0':
+        return _first_color(ref, matcher)
+    return None
+
+def _line(sp_pr, style, matcher):
+    """(line color name or None, width in EMU or None)"""
+    ln = sp_pr.find('a:ln', NS) if sp_pr is not None else None
+    width = int(ln.get('w')) if ln is not None and ln.get('w') else None
+    if ln is not None:
+        if ln.find('a:noFill', NS) is not None:
+            return None, None
+        solid = ln.find('a:solidFill', NS)
+        if solid is not None:
+            return _first_color(solid, matcher), width
+    ref = style.find('a:lnRef', NS) if style is not None else None
+    if ref is not None and ref.get('idx') != '0':
+        return _first_color(ref, matcher), width
+    return None, None
+
+def _text(elem):
+    """Shape text: paragraphs and line breaks become newlines"""
+    paragraphs = []
+    for para in elem.iter(_a('p')):
+        parts = []
+        for child in para:
+            if child.tag in (_a('r'), _a('fld')):
+                parts.append(''.join(t.text or '' for t in child.iter(_a('t'))))
+            elif child.tag == _a('br'):
+                parts.append('\n')
+        paragraphs.append(''.join(parts))
+    return '\n'.join(paragraphs).strip()
+
+def _font_props(elem, matcher):
+    """Helper font arguments from a shape's first run (run properties, else paragraph defaults)"""
+    para = next(elem.iter(_a('p')), None)
+    if para is None:
+        return {}
+    candidates = []
+    run = para.find('a:r', NS)
+    if run is not None and run.find('a:rPr', NS) is not None:
+        candidates.append(run.find('a:rPr', NS))
+    if para.find('a:pPr/a:defRPr', NS) is not None:
+        candidates.append(para.find('a:pPr/a:defRPr', NS))
+
+    props = {}
+    for r_pr in candidates:
+        if 'font_size' not in props and r_pr.get('sz'):
+            size = int(r_pr.get('sz')) / 100
+            props['font_size'] = int(size) if size.is_integer() else size
+        if 'font_bold' not in props and r_pr.get('b') is not None:
+            props['font_bold'] = r_pr.get('b') in ('1', 'true')
+        latin = r_pr.find('a:latin', NS)
+        if 'font_name' not in props and latin is not None and latin.get('typeface'):
+            props['font_name'] = matcher.font(latin.get('typeface'))
+        solid = r_pr.find('a:solidFill', NS)
+        if 'font_color' not in props and solid is not None:
+            color = _first_color(solid, matcher)
+            if color:
+                props['font_color'] = color
+
+    p_pr = para.find('a:pPr', NS)
+    if p_pr is not None and p_pr.get('algn'):
+        props['alignment'] = PP_ALIGN.from_xml(p_pr.get('algn')).name
+    return props
+
+def _anchor(elem):
+    body_pr = next(elem.iter(_a('bodyPr')), None)
+    if body_pr is None or not body_pr.get('anchor'):
+        return None
+    return MSO_ANCHOR.from_xml(body_pr.get('anchor')).name
+
+# ============================================================================
+# GEOMETRY
+# ============================================================================
+
+class Transform:
+    """Maps a group's child coordinates to slide coordinates"""
+
+    def __init__(self, dx=0, dy=0, sx=1.0, sy=1.0):
+        self.dx, self.dy, self.sx, self.sy = dx, dy, sx, sy
+
+    def apply(self, x, y, cx, cy):
+        return (round(self.dx + x * self.sx), round(self.dy + y * self.sy),
+                round(cx * self.sx), round(cy * self.sy))
+
+    def child(self, xfrm):
+        """Transform for the children of a group with this <a:xfrm>"""
+        x, y, cx, cy = _xfrm_box(xfrm)
+        ch_off, ch_ext = xfrm.find('a:chOff', NS), xfrm.find('a:chExt', NS)
+        ch_x = int(ch_off.get('x', 0)) if ch_off is not None else x
+        ch_y = int(ch_off.get('y', 0)) if ch_off is not None else y
+        ch_cx = int(ch_ext.get('cx', 0)) if ch_ext is not None else cx
+        ch_cy = int(ch_ext.get('cy', 0)) if ch_ext is not None else cy
+        sx = cx / ch_cx if ch_cx else 1.0
+        sy = cy / ch_cy if ch_cy else 1.0
+        gx, gy, _, _ = self.apply(x, y, 0, 0)
+        return Transform(gx - ch_x * sx * self.sx, gy - ch_y * sy * self.sy,
+                         sx * self.sx, sy * self.sy)
+
+IDENTITY = Transform()
+
+def _xfrm_box(xfrm):
+    off, ext = xfrm.find('a:off', NS), xfrm.find('a:ext', NS)
+    return (
+        int(off.get('x', 0)) if off is not None else 0,
+        int(off.get('y', 0)) if off is not None else 0,
+        int(ext.get('cx', 0)) if ext is not None else 0,
+        int(ext.get('cy', 0)) if ext is not None else 0,
+    )
+
+def _placeholder(elem):
+    ph = elem.find('./*/p:nvPr/p:ph', NS)
+    if ph is None:
+        return None
+    return ph.get('type', 'body'), ph.get('idx')
+
+class PlaceholderGeometry:
+    """Geometry that placeholders without their own <a:xfrm> inherit from layout and master"""
+
+    def __init__(self, zf):
+        self.zf = zf
+        self._parts = {}
+
+    def _boxes(self, part_name):
+        """(placeholder boxes of a layout or master part, its parent part name)"""
+        if part_name not in self._parts:
+            boxes = []
+            root = etree.fromstring(self.zf.read(part_name))
+            for sp in root.iterfind('.//p:sp', NS):
+                key, xfrm = _placeholder(sp), sp.find('p:spPr/a:xfrm', NS)
+                if key is not None and xfrm is not None:
+                    boxes.append((key, _xfrm_box(xfrm)))
+            parent = next((
+                target for reltype, target, is_external in read_rels(self.zf, part_name).values()
+                if not is_external and reltype.endswith(('/slideLayout', '/slideMaster'))
+            ), None)
+            self._parts[part_name] = (boxes, parent)
+        return self._parts[part_name]
+
+    def box(self, slide_part, key):
+        ph_type, idx = key
+        types = {ph_type, {'ctrTitle': 'title', 'subTitle': 'body'}.get(ph_type, ph_type)}
+        _, part_name = self._boxes(slide_part)
+        while part_name:
+            boxes, parent = self._boxes(part_name)
+            match = next((box for (t, i), box in boxes if idx is not None and i == idx), None) \
+                or next((box for (t, i), box in boxes if t in types), None)
+            if match:
+                return match
+            part_name = parent
+        return None
+
+# ============================================================================
+# SHAPES
+# ============================================================================
+
+def _square(cx, cy):
+    return abs(cx - cy) <= SQUARE_TOLERANCE
+
+def _number(text):
+    return int(text) if text.isdigit() and len(text) <= 3 else None
+
+def map_autoshape(elem, box, matcher, slide_width, placeholder=None):
+    """(primitive, arguments) for a <p:sp>, or ('skip', info)"""
+    left, top, width, height = box
+    sp_pr, style = elem.find('p:spPr', NS), elem.find('p:style', NS)
+    text = _text(elem)
+    geom = sp_pr.find('a:prstGeom', NS) if sp_pr is not None else None
+    prst = geom.get('prst') if geom is not None else ('rect' if placeholder else None)
+    is_text_box = placeholder is not None or elem.find('p:nvSpPr/p:cNvSpPr', NS).get('txBox') in ('1', 'true')
+    fill = _fill(sp_pr, style, matcher)
+    line, line_width = _line(sp_pr, style, matcher)
+    number = _number(text)
+    geometry = {'left': left, 'top': top, 'width': width, 'height': height}
+
+    if prst is None:
+        return 'skip', {'kind': 'custom geometry', 'text': text, **geometry}
+
+    if is_text_box or (prst == 'rect' and text and fill is None and line is None):
+        if not text:
+            return None
+        font = _font_props(elem, matcher)
+        if placeholder and placeholder[0] in TITLE_PLACEHOLDERS:
+            font.setdefault('font_name', HEADING)
+            font.setdefault('font_size', TITLE_FONT_SIZE)
+        if font.get('alignment') == 'LEFT':
+            del font['alignment']  # Text boxes are left-aligned already
+        anchor = _anchor(elem)
+        if anchor:
+            font['vertical_anchor'] = anchor
+        return 'add_text_box', {**geometry, 'text': text, **font}
+
+    if prst == 'ellipse' and number is not None and fill is not None and _square(width, height):
+        return 'add_step_circle', {'left': left, 'top': top, 'number': number, 'size': width}
+
+    if prst == 'roundRect' and _square(width, height):
+        if number is not None and fill is not None:
+            return 'add_number_indicator', {'left': left, 'top': top, 'number': number, 'size': width}
+        if text in ('', '+', '✓', '✔') and fill is None and line is not None and width <= MAX_CHECKBOX:
+            return 'add_checkbox', {'left': left, 'top': top, 'checked': bool(text), 'size': width}
+
+    if (prst == 'roundRect' and text and '\n' not in text and fill is not None
+            and height <= MAX_BADGE_HEIGHT and top + height <= BADGE_BAND and left > slide_width // 2):
+        return 'add_badge', {'text': text, 'right_offset': slide_width - left - width, 'top': top}
+
+    if text:
+        return 'add_shape_with_text', {
+            **geometry, 'text': text, 'shape_type': MSO_SHAPE.from_xml(prst).name,
+            'fill_color': fill, 'line_color': line, 'line_width': line_width,
+            **_font_props(elem, matcher),
+        }
+
+    if prst == 'roundRect' and fill is not None:
+        return 'add_card', {**geometry, 'fill_color': fill, 'border_color': line, 'border_width': line_width}
+
+    if prst == 'rect':
+        return 'add_rectangle', {**geometry, 'fill_color': fill, 'line_color': line, 'line_width': line_width}
+
+    return 'add_shape_with_text', {
+        **geometry, 'text': '', 'shape_type': MSO_SHAPE.from_xml(prst).name,
+        'fill_color': fill, 'line_color': line, 'line_width': line_width,
+    }
+
+def map_connector(elem, box, matcher):
+    left, top, width, height = box
+    xfrm = elem.find('p:spPr/a:xfrm', NS)
+    flip_h = xfrm is not None and xfrm.get('flipH') in ('1', 'true')
+    flip_v = xfrm is not None and xfrm.get('flipV') in ('1', 'true')
+    color, width_emu = _line(elem.find('p:spPr', NS), elem.find('p:style', NS), matcher)
+    return 'add_line', {
+        'start_x': left + width if flip_h else left, 'start_y': top + height if flip_v else top,
+        'end_x': left if flip_h else left + width, 'end_y': top if flip_v else top + height,
+        'color': color, 'width': width_emu,
+    }
+
+def map_table(tbl, box, matcher):
+    left, top, width, _ = box
+    rows = [[_text(tc) for tc in tr.iterfind('a:tc', NS)] for tr in tbl.iterfind('a:tr', NS)]
+    if not rows:
+        return None
+    col_widths = [int(col.get('w', 0)) for col in tbl.iterfind('a:tblGrid/a:gridCol', NS)]
+    first_row = tbl.find('a:tr', NS)
+
+    # Body rows filled differently from most body rows are highlighted
+    fills = []
+    for tr in tbl.iterfind('a:tr', NS):
+        solid = tr.find('a:tc/a:tcPr/a:solidFill', NS)
+        fills.append(_first_color(solid, matcher) if solid is not None else None)
+    body_fills = fills[1:]
+    usual = max(set(body_fills), key=body_fills.count) if body_fills else None
+    body_cell = tbl.find('a:tr[2]/a:tc', NS) if len(rows) > 1 else first_row.find('a:tc', NS)
+    font = _font_props(body_cell, matcher) if body_cell is not None else {}
+    return 'add_data_table', {
+        'left': left, 'top': top, 'width': width, 'header': rows[0], 'rows': rows[1:],
+        'col_widths': col_widths or None,
+        'row_height': int(first_row.get('h')) if first_row.get('h') else None,
+        'font_size': font.get('font_size'),
+        'highlight_rows': [i for i, fill in enumerate(body_fills) if fill != usual],
+    }
+
+def _cache_points(elem):
+    """Values of a chart string/number cache, by point index"""
+    points = sorted(
+        (int(pt.get('idx', 0)), pt.findtext(_c('v')))
+        for pt in elem.iter(_c('pt'))
+    ) if elem is not None else []
+    return [value for _, value in points]
+
+def map_chart(zf, chart_part, box, matcher):
+    """add_bar_chart for a one-series column chart, else ('skip', info)"""
+    left, top, width, height = box
+    geometry = {'left': left, 'top': top, 'width': width, 'height': height}
+    root = etree.fromstring(zf.read(chart_part))
+    plot_area = root.find(f'{_c("chart")}/{_c("plotArea")}')
+    plots = [elem for elem in plot_area if elem.tag.endswith('Chart')] if plot_area is not None else []
+    bar = plots[0] if len(plots) == 1 and plots[0].tag == _c('barChart') else None
+    series = bar.findall(_c('ser')) if bar is not None else []
+    bar_dir = bar.find(_c('barDir')) if bar is not None else None
+    if len(series) != 1 or (bar_dir is not None and bar_dir.get('val') != 'col'):
+        return 'skip', {'kind': 'chart', **geometry}
+
+    ser = series[0]
+    values = [float(v) for v in _cache_points(ser.find(_c('val')))]
+    format_code = ser.findtext(f'{_c("val")}/{_c("numRef")}/{_c("numCache")}/{_c("formatCode")}')
+    solid = ser.find(f'{_c("spPr")}/{_a("solidFill")}')
+    return 'add_bar_chart', {
+        **geometry,
+        'categories': _cache_points(ser.find(_c('cat'))),
+        'values': [int(v) if v.is_integer() else v for v in values],
+        'series_name': ''.join(_cache_points(ser.find(_c('tx')))),
+        'number_format': format_code if format_code and format_code != 'General' else None,
+        'bar_color': _first_color(solid, matcher) if solid is not None else None,
+    }
+
+# ============================================================================
+# SLIDES
+# ============================================================================
+
+_DEFAULTS = {}
+
+def _compact(primitive, kwargs):
+    """Drop None and arguments equal to the helper's defaults; encode enums by name"""
+    if primitive not in _DEFAULTS:
+        import create_presentation as cp
+        _DEFAULTS[primitive] = {
+            name: param.default for name, param in inspect.signature(getattr(cp, primitive)).parameters.items()
+            if param.default is not inspect.Parameter.empty
+        }
+    defaults = _DEFAULTS[primitive]
+    shape = {'primitive': primitive}
+    for name, value in kwargs.items():
+        if value is None:
+            continue
+        default = defaults.get(name, inspect.Parameter.empty)
+        if name in COLOR_ARGS and default is not inspect.Parameter.empty:
+            default = _encode_color(default)
+        elif name in ENUM_ARGS:
+            default = getattr(default, 'name', default)
+        elif name in LENGTH_ARGS and default is not inspect.Parameter.empty:
+            default = int(default)
+        if value == default or (isinstance(default, tuple) and value == list(default)):
+            continue
+        shape[name] = value
+    return shape
+
+def import_slide(zf, part_name, matcher, placeholders, slide_width):
+    """{"title", "background", "shapes", "skipped"} for one slide part, stream-parsed"""
+    rels = read_rels(zf, part_name)
+    slide = {'title': None, 'background': None, 'shapes': [], 'skipped': []}
+    title = None
+
+    def visit(elem, transform):
+        nonlocal title
+        c_nv_pr = next(elem.iter(_p('cNvPr')), None)
+        name = c_nv_pr.get('name', '') if c_nv_pr is not None else ''
+
+        if elem.tag == _p('grpSp'):
+            xfrm = elem.find('p:grpSpPr/a:xfrm', NS)
+            inner = transform.child(xfrm) if xfrm is not None else transform
+            for child in elem:
+                if child.tag in _SHAPE_TAGS:
+                    visit(child, inner)
+            return
+
+        xfrm = elem.find('p:spPr/a:xfrm', NS) if elem.tag != _p('graphicFrame') else elem.find('p:xfrm', NS)
+        key = _placeholder(elem)
+        if xfrm is not None:
+            box = transform.apply(*_xfrm_box(xfrm))
+        elif key is not None:
+            box = placeholders.box(part_name, key)
+        else:
+            box = None
+        if box is None:
+            if key is None or _text(elem):
+                slide['skipped'].append({'kind': 'no geometry', 'name': name, 'text': _text(elem)})
+            return
+
+        if elem.tag == _p('sp'):
+            result = map_autoshape(elem, box, matcher, slide_width, key)
+            if result and key and key[0] in TITLE_PLACEHOLDERS and title is None:
+                title = result[1].get('text')
+        elif elem.tag == _p('cxnSp'):
+            result = map_connector(elem, box, matcher)
+        elif elem.tag == _p('graphicFrame'):
+            tbl = next(elem.iter(_a('tbl')), None)
+            chart = next(elem.iter(_c('chart')), None)
+            if tbl is not None:
+                result = map_table(tbl, box, matcher)
+            elif chart is not None and chart.get(_R_ID) in rels:
+                result = map_chart(zf, rels[chart.get(_R_ID)][1], box, matcher)
+            else:
+                result = 'skip', {'kind': 'graphic frame'}
+        else:
+            blip = next(elem.iter(_a('blip')), None)
+            rel = rels.get(blip.get(_R_EMBED)) if blip is not None else None
+            result = 'skip', {'kind': 'picture', 'target': rel[1] if rel else None}
+
+        if result is None:
+            return
+        primitive, kwargs = result
+        if primitive == 'skip':
+            x, y, cx, cy = box
+            slide['skipped'].append({'name': name, 'left': x, 'top': y, 'width': cx, 'height': cy, **kwargs})
+        else:
+            slide['shapes'].append(_compact(primitive, kwargs))
+
+    with zf.open(part_name) as f:
+        for _, elem in etree.iterparse(f, events=('end',), tag=(_p('bg'), *_SHAPE_TAGS)):
+            if elem.tag == _p('bg'):
+                solid = elem.find('p:bgPr/a:solidFill', NS)
+                if solid is not None:
+                    slide['background'] = _first_color(solid, matcher)
+                continue
+            if elem.getparent().tag != _SP_TREE:
+                continue  # Shapes inside groups are visited with their group
+            visit(elem, IDENTITY)
+            # Drop finished shapes so memory stays flat on large slides
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    if title is None:
+        # No title placeholder: the largest text on the slide
+        texts = [shape for shape in slide['shapes'] if shape.get('text')]
+        title = max(texts, key=lambda shape: shape.get('font_size', 0))['text'] if texts else ''
+    slide['title'] = title.split('\n')[0][:80]
+    if not slide['skipped']:
+        del slide['skipped']
+    return slide
+
+def import_deck(path, brand=None):
+    """Deck spec (the "deck" of a build spec) for the .pptx at `path`"""
+    brand = brand or get_brand()
+    with zipfile.ZipFile(path) as zf:
+        matcher = BrandMatcher(brand, read_theme_colors(zf), read_theme_fonts(zf))
+        presentation = etree.fromstring(zf.read('ppt/presentation.xml'))
+        sld_sz = presentation.find('p:sldSz', NS)
+        slide_width, slide_height = int(sld_sz.get('cx')), int(sld_sz.get('cy'))
+        placeholders = PlaceholderGeometry(zf)
+        slides = [
+            import_slide(zf, part_name, matcher, placeholders, slide_width)
+            for part_name in slide_part_names(zf)
+        ]
+    return {
+        'format': SPEC_FORMAT, 'version': SPEC_VERSION,
+        'source': os.path.basename(path),
+        'slide_width': slide_width, 'slide_height': slide_height,
+        'approximate_colors': matcher.approximate,
+        'slides': slides,
+    }
+
+def spec_path_for(deck_path, out_dir=None):
+    stem = os.path.splitext(os.path.basename(deck_path))[0]
+    return os.path.join(out_dir or os.path.dirname(os.path.abspath(deck_path)), f'{stem}.spec.json')
+
+def spec_paths(paths, out_dir=None):
+    """[(deck path, spec path)] for decks and directories of decks.
+
+    Specs go next to their decks by default. With `out_dir`, a deck given
+    directly gets its spec there by file name, and decks found in a
+    directory keep their path relative to it. Raises ValueError if two
+    different decks would get the same spec.
+    """
+    specs, owners = [], {}
+    for path in paths:
+        root = os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path))
+        for deck in expand_deck_paths([path]):
+            spec_dir = out_dir and os.path.join(out_dir, os.path.dirname(os.path.relpath(deck, root)))
+            spec_path = os.path.abspath(spec_path_for(deck, spec_dir))
+            if spec_path in owners:
+                if owners[spec_path] != deck:
+                    raise ValueError(f"{owners[spec_path]} and {deck} would both be imported into {spec_path}")
+                continue  # Same deck given twice
+            owners[spec_path] = deck
+            specs.append((deck, spec_path))
+    return specs
+
+def write_spec(deck_path, spec_path, variant=None):
+    """Import one deck into a build spec file; returns (slides, shapes, skipped, approximate colors)"""
+    deck = import_deck(deck_path, get_brand(variant) if variant else None)
+    stem = os.path.splitext(os.path.basename(deck_path))[0]
+    spec = {'out': f'{stem}.imported.pptx'}
+    if variant:
+        spec['variant'] = variant
+    spec['deck'] = deck
+    with open(spec_path, 'w', encoding='utf-8') as f:
+        json.dump(spec, f, ensure_ascii=False, indent=1)
+        f.write('\n')
+    return (
+        len(deck['slides']),
+        sum(len(slide['shapes']) for slide in deck['slides']),
+        sum(len(slide.get('skipped', ())) for slide in deck['slides']),
+        deck['approximate_colors'],
+    )
+
+def _write_spec(args):
+    deck_path, spec_path, variant = args
+    try:
+        return deck_path, spec_path, write_spec(deck_path, spec_path, variant)
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+        return deck_path, spec_path, e
+
+def import_decks(paths, out_dir=None, variant=None, workers=IMPORT_WORKERS):
+    """Import every deck in `paths` (decks or directories) into build specs.
+
+    Decks are parsed in parallel worker processes (the mapping is pure
+    Python, so threads would serialize on the GIL). Returns
+    [(deck path, spec path, (slides, shapes, skipped, approximate colors)
+    or the exception raised)] in path order; see spec_paths() for where
+    specs go.
+    """
+    jobs = [(deck, spec_path, variant) for deck, spec_path in spec_paths(paths, out_dir)]
+    if not jobs:
+        return []
+    for spec_dir in {os.path.dirname(spec_path) for _, spec_path, _ in jobs}:
+        os.makedirs(spec_dir, exist_ok=True)
+    workers = min(workers or os.cpu_count(), len(jobs))
+    if workers <= 1:
+        return [_write_spec(job) for job in jobs]
+    start_method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context(start_method)) as executor:
+        return list(executor.map(_write_spec, jobs))
+
+# ============================================================================
+# RENDERING
+# ============================================================================
+
+def _encode_color(color):
+    """Spec form of a helper color: theme color name, or [name, brightness] for a Tint"""
+    if color is None:
+        return None
+    if hasattr(color, 'brightness'):
+        return [color.theme_color.name, color.brightness]
+    return color.name
+
+def _decode_color(value):
+    import create_presentation as cp
+    if isinstance(value, list):
+        return cp.Tint(MSO_THEME_COLOR[value[0]], value[1])
+    return MSO_THEME_COLOR[value]
+
+def decode_shape(shape):
+    """(helper name, keyword arguments) for one spec shape"""
+    kwargs = {}
+    for name, value in shape.items():
+        if name == 'primitive':
+            continue
+        if name in COLOR_ARGS:
+            value = _decode_color(value)
+        elif name in ENUM_ARGS:
+            value = ENUM_ARGS[name][value]
+        elif name in LENGTH_ARGS:
+            value = Emu(value)
+        elif name == 'col_widths':
+            value = [Emu(w) for w in value]
+        kwargs[name] = value
+    if shape['primitive'] not in PRIMITIVES:
+        raise ValueError(f"Unknown primitive in deck spec: {shape['primitive']}")
+    return shape['primitive'], kwargs
+
+def spec_entries(deck, numbers=None):
+    """SlideEntry builders for the slides of a deck spec (all, or the 1-based `numbers`)"""
+    import create_presentation as cp
+    if deck.get('format') != SPEC_FORMAT or deck.get('version') != SPEC_VERSION:
+        raise ValueError(f"Not a version {SPEC_VERSION} deck spec")
+
+    def builder(data):
+        shapes = [decode_shape(shape) for shape in data['shapes']]
+
+        def build(prs):
+            slide = cp.add_slide(prs, prs.slide_layouts[6])  # Blank
+            if data.get('background'):
+                cp.set_slide_background(slide, _decode_color(data['background']))
+            for primitive, kwargs in shapes:
+                getattr(cp, primitive)(slide, **kwargs)
+            return slide
+        return build
+
+    slides = deck['slides']
+    numbers = numbers or range(1, len(slides) + 1)
+    unknown = [n for n in numbers if not 1 <= n <= len(slides)]
+    if unknown:
+        raise ValueError(f"No such slide(s): {', '.join(map(str, unknown))} (deck has {len(slides)})")
+    return [cp.SlideEntry(n, slides[n - 1]['title'], builder(slides[n - 1])) for n in numbers]
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Import .pptx decks as generator build specs')
+    parser.add_argument('paths', nargs='+', metavar='DECK_OR_DIR')
+    parser.add_argument('--out-dir', help='write specs here, in the layout of the given directories '
+                        '(default: next to each deck)')
+    parser.add_argument('--variant', help=f'brand pack to match colors and fonts to (default: {DEFAULT_BRAND})')
+    parser.add_argument('--workers', type=int, help='worker processes (default: one per CPU)')
+    args = parser.parse_args(argv)
+
+    try:
+        results = import_decks(args.paths, args.out_dir, args.variant, args.workers)
+    except ValueError as e:
+        print(f"deck_import.py: error: {e}", file=sys.stderr)
+        return 2
+    failed = imported = 0
+    for deck, spec_path, result in results:
+        if isinstance(result, Exception):
+            print(f"Failed: {deck}: {result}", file=sys.stderr)
+            failed += 1
+            continue
+        slides, shapes, skipped, approximate = result
+        print(f"{deck} -> {spec_path}: {slides} slide(s), {shapes} shape(s), "
+              f"{skipped} skipped, {approximate} approximate color(s)")
+        imported += 1
+    print(f"\n{imported} deck(s) imported, {failed} failed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Full-text search across generated decks.
+
+Slide parts are stream-parsed straight out of the zip (no python-pptx objects)
+and every text-bearing shape goes into an on-disk inverted index (SQLite).
+Re-indexing only touches decks whose size or mtime changed.
+
+Usage:
+    python deck_index.py index [DIR_OR_DECK ...]
+    python deck_index.py search "git push"
+"""
+
+from collections import namedtuple
+from deck_metrics import record_cache
+from deck_package import NS, expand_deck_paths, slide_part_names
+import os
+import re
+import sqlite3
+import sys
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+
+DEFAULT_INDEX_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '.deck_index.sqlite'
+)
+
+ShapeText = namedtuple('ShapeText', 'slide shape_id name x y cx cy text')
+SearchHit = namedtuple('SearchHit', 'deck slide shape_id name text')
+
+_WORD_RE = re.compile(r'\w+')
+_SPACE_RE = re.compile(r'\s+')
+
+_SP = f"{{{NS['p']}}}sp"
+_GRAPHIC_FRAME = f"{{{NS['p']}}}graphicFrame"
+_C_NV_PR = f"{{{NS['p']}}}cNvPr"
+_PARA = f"{{{NS['a']}}}p"
+_TEXT = f"{{{NS['a']}}}t"
+
+# ============================================================================
+# TEXT EXTRACTION
+# ============================================================================
+
+def tokenize(text):
+    """Lower-cased word tokens (Unicode-aware, so Cyrillic works)"""
+    return _WORD_RE.findall(text.casefold())
+
+def normalize_text(text):
+    """Case- and whitespace-insensitive form used for phrase matching"""
+    return _SPACE_RE.sub(' ', text.casefold()).strip()
+
+def shape_text(elem):
+    """Text of a shape element, one line per paragraph"""
+    paragraphs = [
+        ''.join(t.text or '' for t in p.iter(_TEXT))
+        for p in elem.iter(_PARA)
+    ]
+    return '\n'.join(paragraphs).strip()
+
+def _shape_text(elem, slide_no):
+    c_nv_pr = next(elem.iter(_C_NV_PR), None)
+    text = shape_text(elem)
+    if c_nv_pr is None or not text:
+        return None
+
+    # The shape's own transform only: a:ext also names extension list entries
+    xfrm = elem.find('p:xfrm' if elem.tag == _GRAPHIC_FRAME else 'p:spPr/a:xfrm', NS)
+    off = xfrm.find('a:off', NS) if xfrm is not None else None
+    ext = xfrm.find('a:ext', NS) if xfrm is not None else None
+    return ShapeText(
+        slide_no,
+        int(c_nv_pr.get('id', 0)), c_nv_pr.get('name', ''),
+        int(off.get('x', 0)) if off is not None else 0,
+        int(off.get('y', 0)) if off is not None else 0,
+        int(ext.get('cx', 0)) if ext is not None else 0,
+        int(ext.get('cy', 0)) if ext is not None else 0,
+        text,
+    )
+
+def iter_slide_shapes(zf, part_name, slide_no):
+    """Stream text-bearing shapes out of one slide part"""
+    with zf.open(part_name) as f:
+        for _, elem in ET.iterparse(f, events=('end',)):
+            if elem.tag in (_SP, _GRAPHIC_FRAME):
+                shape = _shape_text(elem, slide_no)
+                if shape is not None:
+                    yield shape
+                elem.clear()
+
+def iter_deck_text(path):
+    """Yield ShapeText for every text-bearing shape in a deck, slide by slide"""
+    with zipfile.ZipFile(path) as zf:
+        for slide_no, part_name in enumerate(slide_part_names(zf), start=1):
+            yield from iter_slide_shapes(zf, part_name, slide_no)
+
+# ============================================================================
+# INDEX
+# ============================================================================
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decks (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shapes (
+    id INTEGER PRIMARY KEY,
+    deck_id INTEGER NOT NULL,
+    slide INTEGER NOT NULL,
+    shape_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    x INTEGER, y INTEGER, cx INTEGER, cy INTEGER,
+    text TEXT NOT NULL,
+    norm_text TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS shapes_deck ON shapes (deck_id);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT NOT NULL,
+    shape_rowid INTEGER NOT NULL,
+    deck_id INTEGER NOT NULL,
+    PRIMARY KEY (term, shape_rowid)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS postings_deck ON postings (deck_id);
+"""
+
+class DeckIndex:
+    """Incremental inverted index of deck text stored in SQLite"""
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _drop_deck(self, deck_id):
+        self.db.execute("DELETE FROM postings WHERE deck_id = ?", (deck_id,))
+        self.db.execute("DELETE FROM shapes WHERE deck_id = ?", (deck_id,))
+        self.db.execute("DELETE FROM decks WHERE id = ?", (deck_id,))
+
+    def _add_deck(self, path, stat):
+        cur = self.db.execute(
+            "INSERT INTO decks (path, size, mtime_ns) VALUES (?, ?, ?)",
+            (path, stat.st_size, stat.st_mtime_ns)
+        )
+        deck_id = cur.lastrowid
+
+        for shape in iter_deck_text(path):
+            cur = self.db.execute(
+                "INSERT INTO shapes (deck_id, slide, shape_id, name, x, y, cx, cy, text, norm_text)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (deck_id, *shape, normalize_text(shape.text))
+            )
+            shape_rowid = cur.lastrowid
+            self.db.executemany(
+                "INSERT OR IGNORE INTO postings (term, shape_rowid, deck_id) VALUES (?, ?, ?)",
+                [(term, shape_rowid, deck_id) for term in set(tokenize(shape.text))]
+            )
+
+    def update(self, paths):
+        """Index new or changed decks; return (indexed, skipped, removed)"""
+        known = {
+            path: (deck_id, size, mtime_ns)
+            for deck_id, path, size, mtime_ns
+            in self.db.execute("SELECT id, path, size, mtime_ns FROM decks")
+        }
+        indexed = skipped = removed = 0
+
+        for path in expand_deck_paths(paths):
+            stat = os.stat(path)
+            entry = known.get(path)
+            unchanged = entry is not None and entry[1:] == (stat.st_size, stat.st_mtime_ns)
+            record_cache('deck_index', unchanged)
+            if unchanged:
+                skipped += 1
+                continue
+
+            with self.db:
+                if entry:
+                    self._drop_deck(entry[0])
+                self._add_deck(path, stat)
+            indexed += 1
+
+        with self.db:
+            for path, (deck_id, _, _) in known.items():
+                if not os.path.exists(path):
+                    self._drop_deck(deck_id)
+                    removed += 1
+
+        return indexed, skipped, removed
+
+    def search(self, query, limit=50):
+        """Return SearchHit list for shapes containing the query phrase"""
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+
+        placeholders = ', '.join('?' * len(terms))
+        rows = self.db.execute(
+            f"""
+            SELECT d.path, s.slide, s.shape_id, s.name, s.text, s.norm_text
+            FROM postings p
+            JOIN shapes s ON s.id = p.shape_rowid
+            JOIN decks d ON d.id = s.deck_id
+            WHERE p.term IN ({placeholders})
+            GROUP BY p.shape_rowid
+            HAVING COUNT(*) = ?
+            ORDER BY d.path, s.slide, s.shape_id
+            """,
+            (*terms, len(terms))
+        )
+
+        phrase = normalize_text(query)
+        hits = []
+        for deck, slide, shape_id, name, text, norm_text in rows:
+            if phrase in norm_text:
+                hits.append(SearchHit(deck, slide, shape_id, name, text))
+                if len(hits) >= limit:
+                    break
+        return hits
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv):
+    if not argv or argv[0] not in ('index', 'search'):
+        print(__doc__.strip())
+        return 2
+
+    with DeckIndex() as index:
+        if argv[0] == 'index':
+            paths = argv[1:] or [os.path.dirname(os.path.abspath(__file__))]
+            indexed, skipped, removed = index.update(paths)
+            print(f"Indexed: {indexed}, unchanged: {skipped}, removed: {removed}")
+            return 0
+
+        start = time.perf_counter()
+        hits = index.search(' '.join(argv[1:]))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+
+        for hit in hits:
+            text = hit.text.replace('\n', ' / ')
+            print(f"{os.path.basename(hit.deck)}  slide {hit.slide}  [{hit.name}]  {text}")
+        print(f"\n{len(hits)} hit(s) in {elapsed_ms:.1f} ms")
+        return 0 if hits else 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
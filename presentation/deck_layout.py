@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+"""
+Geometry-only dry runs of the slide builders.
+
+LayoutDeck stands in for a Presentation: add_slide() hands out LayoutSlide
+objects, and the shape helpers in create_presentation.py append a
+ShapeRecord (kind, rectangle in EMU, text, and a TextRun per run: typeface,
+size in points, bold, theme color) to them instead of creating python-pptx
+shapes. No XML is built and nothing is zipped.
+
+Run through create_presentation.py:
+    python create_presentation.py --dry-run [--slides 4-6] [--out layout.json]
+    python create_presentation.py --dry-run --spec a.json --spec b.json ...
+"""
+
+from collections import namedtuple
+
+ShapeRecord = namedtuple('ShapeRecord', 'kind x y cx cy text runs')
+TextRun = namedtuple('TextRun', 'text font size bold color')
+
+class _AnyLayout:
+    """prs.slide_layouts stand-in: every index is the (unused) blank layout"""
+
+    def __getitem__(self, index):
+        return None
+
+class LayoutSlide:
+    """Shapes recorded for one slide"""
+
+    __slots__ = ('number', 'title', 'context', 'background', 'shapes')
+
+    def __init__(self, number, context):
+        self.number = number
+        self.title = None
+        self.context = context
+        self.background = None
+        self.shapes = []
+
+    def record(self, kind, x, y, cx, cy, text=None, runs=()):
+        shape = ShapeRecord(kind, int(x), int(y), int(cx), int(cy), text, list(runs))
+        self.shapes.append(shape)
+        return shape
+
+    def to_dict(self):
+        return {
+            'number': self.number,
+            'title': self.title,
+            'background': self.background,
+            'shapes': [
+                dict(shape._asdict(), runs=[run._asdict() for run in shape.runs])
+                for shape in self.shapes
+            ],
+        }
+
+class LayoutDeck:
+    """Presentation stand-in collecting LayoutSlides"""
+
+    slide_layouts = _AnyLayout()
+
+    def __init__(self, context):
+        self.context = context
+        self.slides = []
+
+    def add_slide(self):
+        slide = LayoutSlide(len(self.slides) + 1, self.context)
+        self.slides.append(slide)
+        return slide
+
+    def to_dict(self):
+        return {
+            'brand': self.context.brand.name,
+            'width': int(self.context.slide_width),
+            'height': int(self.context.slide_height),
+            'slides': [slide.to_dict() for slide in self.slides],
+        }
+
+def check_layout(deck):
+    """Return a list of problems: shapes outside the slide or with no area"""
+    problems = []
+    width, height = deck.context.slide_width, deck.context.slide_height
+    for slide in deck.slides:
+        for i, shape in enumerate(slide.shapes):
+            if shape.kind == 'line':
+                continue
+            where = f"slide {slide.number} shape {i + 1} ({shape.kind}"
+            where += f" {shape.text[:30]!r})" if shape.text else ")"
+            if shape.cx <= 0 or shape.cy <= 0:
+                problems.append(f"{where}: empty size {shape.cx}x{shape.cy}")
+            elif (shape.x < 0 or shape.y < 0
+                  or shape.x + shape.cx > width
+                  or shape.y + shape.cy > height):
+                problems.append(f"{where}: outside the slide")
+    return problems
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+Prometheus-style metrics for the deck generator.
+
+Hot paths never take a lock: every thread updates its own cell and cells
+are only summed when metrics are collected. Metrics can be served on a
+local HTTP endpoint (/metrics) or dumped to a file at the end of a batch run.
+Pool workers send what each task recorded back with its result
+(metrics_delta()), and the parent adds it to its own (merge_metrics()).
+
+Environment (read by create_presentation.py when run as a script):
+    DECK_METRICS_PORT   serve /metrics on 127.0.0.1:PORT while running
+    DECK_METRICS_FILE   write the final metrics to this file
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from deck_package import atomic_write
+from deck_trace import traced
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread, get_ident
+import functools
+import time
+
+REGISTRY = []
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SLIDE_BUCKETS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+
+# ============================================================================
+# METRIC TYPES
+# ============================================================================
+
+class _Cells:
+    """Per-thread accumulators; only the owning thread writes its cell"""
+
+    def __init__(self, size):
+        self._size = size
+        self._cells = {}
+        self._lock = Lock()
+
+    def get(self):
+        cell = self._cells.get(get_ident())
+        if cell is None:
+            cell = [0] * self._size
+            with self._lock:
+                self._cells[get_ident()] = cell
+        return cell
+
+    def total(self):
+        with self._lock:
+            cells = list(self._cells.values())
+        return [sum(values) for values in zip(*cells)] or [0] * self._size
+
+class _Metric:
+    kind = 'untyped'
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help_text = help_text
+        self.labelnames = labelnames
+        self._children = {}
+        self._lock = Lock()
+        REGISTRY.append(self)
+
+    def labels(self, *values):
+        """Return the child metric for one combination of label values"""
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _label_str(self, values, extra=()):
+        pairs = list(zip(self.labelnames, values)) + list(extra)
+        if not pairs:
+            return ''
+        return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} {self.kind}']
+        children = self._children if self.labelnames else {(): self.labels()}
+        for values, child in sorted(children.items()):
+            lines.extend(self._sample_lines(values, child))
+        return lines
+
+class _CounterChild:
+    def __init__(self):
+        self._cells = _Cells(1)
+
+    def inc(self, amount=1):
+        self._cells.get()[0] += amount
+
+    @property
+    def value(self):
+        return self._cells.total()[0]
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+    def _sample_lines(self, values, child):
+        return [f'{self.name}{self._label_str(values)} {child.value:g}']
+
+class _GaugeChild(_CounterChild):
+    def dec(self, amount=1):
+        self._cells.get()[0] -= amount
+
+class Gauge(Counter):
+    kind = 'gauge'
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def dec(self, amount=1):
+        self.labels().dec(amount)
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self._buckets = buckets
+        # One slot per bucket plus +Inf, then sum and count
+        self._cells = _Cells(len(buckets) + 3)
+
+    def observe(self, value):
+        cell = self._cells.get()
+        cell[bisect_left(self._buckets, value)] += 1
+        cell[-2] += value
+        cell[-1] += 1
+
+    @contextmanager
+    def time(self):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start)
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        super().__init__(name, help_text, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def time(self):
+        return self.labels().time()
+
+    def _sample_lines(self, values, child):
+        totals = child._cells.total()
+        lines = []
+        cumulative = 0
+        for le, count in zip(self.buckets + ('+Inf',), totals):
+            cumulative += count
+            lines.append(f'{self.name}_bucket{self._label_str(values, [("le", le)])} {cumulative}')
+        lines.append(f'{self.name}_sum{self._label_str(values)} {totals[-2]:g}')
+        lines.append(f'{self.name}_count{self._label_str(values)} {totals[-1]}')
+        return lines
+
+# ============================================================================
+# GENERATOR METRICS
+# ============================================================================
+
+DECKS_RENDERED = Counter('deck_rendered_total', 'Decks rendered')
+DECK_SLIDES = Histogram('deck_slides', 'Slides per rendered deck', buckets=SLIDE_BUCKETS)
+RENDER_SECONDS = Histogram('deck_render_seconds', 'Time spent building slides for one deck')
+SAVE_SECONDS = Histogram('deck_save_seconds', 'Time spent writing one deck to disk')
+BYTES_WRITTEN = Counter('deck_bytes_written_total', 'Bytes of .pptx output written')
+PRIMITIVE_CALLS = Counter('deck_primitive_calls_total', 'Shape helper calls', ('helper',))
+CACHE_REQUESTS = Counter('deck_cache_requests_total', 'Cache lookups', ('cache', 'result'))
+WORKERS_BUSY = Gauge('deck_workers_busy', 'Workers currently rendering a deck')
+WORKER_BUSY_SECONDS = Counter('deck_worker_busy_seconds_total', 'Total time workers spent rendering')
+UPLOADS = Counter('deck_uploads_total', 'Deck publish results', ('result',))
+UPLOAD_BYTES = Counter('deck_upload_bytes_total', 'Bytes sent to object storage')
+
+def counted(func):
+    """Count calls of a shape helper in deck_primitive_calls_total.
+
+    Counted helpers are render primitives, so they are also traced (deck_trace).
+    """
+    inc = PRIMITIVE_CALLS.labels(func.__name__).inc
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        inc()
+        return func(*args, **kwargs)
+    return traced(wrapper)
+
+def record_cache(cache, hit):
+    """Count one lookup in a named cache (hit ratio = hit / (hit + miss))"""
+    CACHE_REQUESTS.labels(cache, 'hit' if hit else 'miss').inc()
+
+@contextmanager
+def worker_busy():
+    """Mark the current worker as busy for worker-utilization metrics"""
+    WORKERS_BUSY.inc()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        WORKER_BUSY_SECONDS.inc(time.perf_counter() - start)
+        WORKERS_BUSY.dec()
+
+# ============================================================================
+# ACROSS PROCESSES
+# ============================================================================
+
+def snapshot_metrics():
+    """{(metric name, label values): totals} for every metric of this process"""
+    return {
+        (metric.name, values): child._cells.total()
+        for metric in REGISTRY for values, child in list(metric._children.items())
+    }
+
+def metrics_delta(before):
+    """What every metric gained since `before` (a snapshot_metrics() result)"""
+    delta = {}
+    for key, totals in snapshot_metrics().items():
+        base = before.get(key)
+        if base is not None:
+            totals = [value - old for value, old in zip(totals, base)]
+        if any(totals):
+            delta[key] = totals
+    return delta
+
+def merge_metrics(delta):
+    """Add a metrics_delta() recorded in another process (a pool worker) to this one"""
+    metrics = {metric.name: metric for metric in REGISTRY}
+    for (name, values), totals in delta.items():
+        cell = metrics[name].labels(*values)._cells.get()
+        for i, value in enumerate(totals):
+            cell[i] += value
+
+# ============================================================================
+# EXPOSITION
+# ============================================================================
+
+def render_metrics():
+    """All registered metrics in Prometheus text exposition format"""
+    lines = []
+    for metric in REGISTRY:
+        lines.extend(metric.collect())
+    return '\n'.join(lines) + '\n'
+
+def dump_metrics(path):
+    """Write metrics to `path` atomically (for node_exporter textfile or batch runs).
+
+    A new file gets the umask-based mode, so a collector running as another
+    user can read it.
+    """
+    with atomic_write(path) as f:
+        f.write(render_metrics().encode('utf-8'))
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = render_metrics().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+def serve_metrics(port, host='127.0.0.1'):
+    """Serve /metrics from a daemon thread; returns the server"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    Thread(target=server.serve_forever, name='deck-metrics', daemon=True).start()
+    return server
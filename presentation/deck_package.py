@@ -0,0 +1,506 @@
+# -*- coding: utf-8 -*-
+"""
+Low-level OPC helpers for reading and writing .pptx packages as plain zips.
+
+The readers work on zip entry names (no leading slash) and never build
+python-pptx objects, so tools that only need a few parts of a deck stay
+cheap. save_presentation() is a drop-in for prs.save() that compresses parts
+on a thread pool.
+"""
+
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from xml.sax.saxutils import quoteattr
+import glob
+import hashlib
+import json
+import os
+import posixpath
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+import zlib
+
+# ============================================================================
+# NAMESPACES
+# ============================================================================
+NS = {
+    'a': 'http://schemas.openxmlformats.org/drawingml/2006/main',
+    'p': 'http://schemas.openxmlformats.org/presentationml/2006/main',
+    'r': 'http://schemas.openxmlformats.org/officeDocument/2006/relationships',
+    'pr': 'http://schemas.openxmlformats.org/package/2006/relationships',
+    'ct': 'http://schemas.openxmlformats.org/package/2006/content-types',
+}
+
+RT_SLIDE = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/slide'
+
+PRESENTATION_PART = 'ppt/presentation.xml'
+CONTENT_TYPES_PART = '[Content_Types].xml'
+ROOT_RELS_PART = '_rels/.rels'
+
+CT_RELATIONSHIPS = 'application/vnd.openxmlformats-package.relationships+xml'
+CT_XML = 'application/xml'
+
+# Compression per part type (by extension): None stores the part as-is, an int
+# is a zlib level. Images and video are already compressed; XML deflates well
+# even at the fastest level.
+DEFAULT_COMPRESSION = {
+    'png': None, 'jpg': None, 'jpeg': None, 'gif': None,
+    'mp4': None, 'm4v': None, 'mov': None,
+    'xml': 1, 'rels': 1,
+}
+DEFAULT_LEVEL = 6
+
+ZIP_EPOCH = 315532800  # 1980-01-01T00:00:00Z
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+
+# ============================================================================
+# PART NAMES
+# ============================================================================
+
+def rels_name(part_name):
+    """Return the .rels entry name for a part ('ppt/slides/slide1.xml' ->
+    'ppt/slides/_rels/slide1.xml.rels')"""
+    directory, filename = posixpath.split(part_name)
+    return posixpath.join(directory, '_rels', filename + '.rels')
+
+def relative_target(part_name, target_name):
+    """Inverse of resolve_target(): target path relative to the source part"""
+    return posixpath.relpath(target_name, posixpath.dirname(part_name) or '.')
+
+def resolve_target(part_name, target):
+    """Resolve a relationship target relative to its source part"""
+    if target.startswith('/'):
+        return target[1:]
+    base = posixpath.dirname(part_name)
+    return posixpath.normpath(posixpath.join(base, target))
+
+def expand_deck_paths(paths):
+    """Expand directories into the .pptx files they contain"""
+    decks = []
+    for path in paths:
+        if os.path.isdir(path):
+            decks.extend(sorted(glob.glob(os.path.join(path, '**', '*.pptx'), recursive=True)))
+        else:
+            decks.append(path)
+    return [os.path.abspath(deck) for deck in decks]
+
+# ============================================================================
+# RELATIONSHIPS
+# ============================================================================
+
+def read_rels(zf, part_name):
+    """Return {rId: (reltype, target_part_name, is_external)} for a part"""
+    name = rels_name(part_name)
+    if name not in zf.NameToInfo:
+        return {}
+
+    rels = {}
+    root = ET.fromstring(zf.read(name))
+    for rel in root.iterfind('pr:Relationship', NS):
+        is_external = rel.get('TargetMode') == 'External'
+        target = rel.get('Target')
+        if not is_external:
+            target = resolve_target(part_name, target)
+        rels[rel.get('Id')] = (rel.get('Type'), target, is_external)
+    return rels
+
+def slide_part_names(zf):
+    """Return slide part names in presentation order (sldIdLst order)"""
+    rels = read_rels(zf, PRESENTATION_PART)
+    root = ET.fromstring(zf.read(PRESENTATION_PART))
+    sld_id_lst = root.find('p:sldIdLst', NS)
+    if sld_id_lst is None:
+        return []
+
+    r_id_attr = f"{{{NS['r']}}}id"
+    return [rels[sld_id.get(r_id_attr)][1] for sld_id in sld_id_lst]
+
+def serialize_rels(rels):
+    """Return .rels XML for [(rId, reltype, target, is_external)]"""
+    lines = [XML_DECLARATION, f'<Relationships xmlns="{NS["pr"]}">']
+    for r_id, reltype, target, is_external in rels:
+        mode = ' TargetMode="External"' if is_external else ''
+        lines.append(
+            f'<Relationship Id={quoteattr(r_id)} Type={quoteattr(reltype)}'
+            f' Target={quoteattr(target)}{mode}/>'
+        )
+    lines.append('</Relationships>')
+    return ''.join(lines).encode('utf-8')
+
+# ============================================================================
+# CONTENT TYPES
+# ============================================================================
+
+class ContentTypes:
+    """[Content_Types].xml as Default (by extension) and Override (by part) maps"""
+
+    def __init__(self, defaults=None, overrides=None):
+        self.defaults = dict(defaults or {})
+        self.overrides = dict(overrides or {})
+
+    @classmethod
+    def from_zip(cls, zf):
+        root = ET.fromstring(zf.read(CONTENT_TYPES_PART))
+        defaults = {
+            el.get('Extension').lower(): el.get('ContentType')
+            for el in root.iterfind('ct:Default', NS)
+        }
+        overrides = {
+            el.get('PartName').lstrip('/'): el.get('ContentType')
+            for el in root.iterfind('ct:Override', NS)
+        }
+        return cls(defaults, overrides)
+
+    def get(self, part_name):
+        if part_name in self.overrides:
+            return self.overrides[part_name]
+        ext = posixpath.splitext(part_name)[1][1:].lower()
+        return self.defaults.get(ext)
+
+    def add(self, part_name, content_type):
+        """Register a part, preferring a Default entry when the extension allows"""
+        ext = posixpath.splitext(part_name)[1][1:].lower()
+        if ext and self.defaults.setdefault(ext, content_type) == content_type:
+            self.overrides.pop(part_name, None)
+        else:
+            self.overrides[part_name] = content_type
+
+    def to_xml(self):
+        lines = [XML_DECLARATION, f'<Types xmlns="{NS["ct"]}">']
+        for ext, content_type in sorted(self.defaults.items()):
+            lines.append(f'<Default Extension={quoteattr(ext)} ContentType={quoteattr(content_type)}/>')
+        for part_name, content_type in sorted(self.overrides.items()):
+            lines.append(f'<Override PartName={quoteattr("/" + part_name)} ContentType={quoteattr(content_type)}/>')
+        lines.append('</Types>')
+        return ''.join(lines).encode('utf-8')
+
+# ============================================================================
+# ZIP WRITER
+# ============================================================================
+
+_LOCAL_HEADER = struct.Struct('<4s2B4HL2L2H')
+_CENTRAL_HEADER = struct.Struct('<4s4B4HL2L5H2L')
+_END_RECORD = struct.Struct('<4s4H2LH')
+_UTF8_FLAG = 0x800
+
+def read_raw_entry(fp, info):
+    """Return the still-compressed bytes of a zip entry"""
+    fp.seek(info.header_offset)
+    header = fp.read(_LOCAL_HEADER.size)
+    name_len, extra_len = struct.unpack('<2H', header[26:30])
+    fp.seek(info.header_offset + _LOCAL_HEADER.size + name_len + extra_len)
+    return fp.read(info.compress_size)
+
+class PackageWriter:
+    """Minimal zip writer that can also take already-compressed entries.
+
+    zipfile.ZipFile always (re)compresses what it writes; this writer lets
+    callers copy entries from another package as raw deflate streams, which
+    keeps zip-level operations close to plain file-copy speed.
+    """
+
+    def __init__(self, file, date_time=None):
+        self._own_file = isinstance(file, str)
+        self._fp = open(file, 'wb') if self._own_file else file
+        self._entries = []
+        self._names = set()
+        self._dos_time, self._dos_date = _dos_date_time(date_time or time.localtime()[:6])
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def __contains__(self, name):
+        return name in self._names
+
+    def write(self, name, data, level=DEFAULT_LEVEL):
+        """Compress and add one entry (`level` None stores it uncompressed)"""
+        self.write_compressed(name, *compress_entry(data, level))
+
+    def write_compressed(self, name, raw, crc, file_size, compress_type):
+        """Add an entry whose data is already compressed with `compress_type`"""
+        if name in self._names:
+            raise ValueError(f"Duplicate zip entry: {name}")
+        if len(self._entries) >= 0xFFFF or self._fp.tell() + len(raw) >= 0xFFFFFFFF:
+            raise ValueError("Package too large for a non-ZIP64 archive")
+
+        encoded = name.encode('utf-8')
+        flags = _UTF8_FLAG if not encoded.isascii() else 0
+        offset = self._fp.tell()
+        self._fp.write(_LOCAL_HEADER.pack(
+            b'PK\x03\x04', 20, 0, flags, compress_type,
+            self._dos_time, self._dos_date, crc & 0xFFFFFFFF,
+            len(raw), file_size, len(encoded), 0
+        ))
+        self._fp.write(encoded)
+        self._fp.write(raw)
+        self._entries.append((encoded, flags, compress_type, crc, len(raw), file_size, offset))
+        self._names.add(name)
+
+    def copy_entry(self, fp, info, name=None):
+        """Copy an entry from an open source zip file without recompressing"""
+        self.write_compressed(
+            name or info.filename, read_raw_entry(fp, info),
+            info.CRC, info.file_size, info.compress_type
+        )
+
+    def abort(self):
+        """Stop without writing the central directory: the output is not a valid zip"""
+        if self._fp is not None and self._own_file:
+            self._fp.close()
+        self._fp = None
+
+    def close(self):
+        if self._fp is None:
+            return
+        cd_offset = self._fp.tell()
+        for encoded, flags, compress_type, crc, compress_size, file_size, offset in self._entries:
+            self._fp.write(_CENTRAL_HEADER.pack(
+                b'PK\x01\x02', 20, 0, 20, 0, flags, compress_type,
+                self._dos_time, self._dos_date, crc & 0xFFFFFFFF,
+                compress_size, file_size, len(encoded), 0, 0, 0, 0, 0, offset
+            ))
+            self._fp.write(encoded)
+        cd_size = self._fp.tell() - cd_offset
+        count = len(self._entries)
+        self._fp.write(_END_RECORD.pack(b'PK\x05\x06', 0, 0, count, count, cd_size, cd_offset, 0))
+        if self._own_file:
+            self._fp.close()
+        self._fp = None
+
+def compress_entry(data, level):
+    """Return (raw, crc, file_size, compress_type) for one zip entry.
+
+    zlib releases the GIL while it works, so this is safe to fan out over
+    a thread pool.
+    """
+    if level is None:
+        return data, zlib.crc32(data), len(data), zipfile.ZIP_STORED
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    raw = compressor.compress(data) + compressor.flush()
+    return raw, zlib.crc32(data), len(data), zipfile.ZIP_DEFLATED
+
+def compression_level(name, compression=DEFAULT_COMPRESSION):
+    """zlib level (or None for stored) for a part name under `compression`"""
+    ext = posixpath.splitext(name)[1][1:].lower()
+    return compression.get(ext, DEFAULT_LEVEL)
+
+def _dos_date_time(date_time):
+    year, month, day, hour, minute, second = date_time
+    dos_date = (max(year, 1980) - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | second // 2
+    return dos_time, dos_date
+
+# ============================================================================
+# SAVE
+# ============================================================================
+
+def iter_presentation_entries(prs):
+    """Yield (name, data) for every zip entry of a python-pptx Presentation,
+    in the same order prs.save() writes them"""
+    package = prs.part.package
+    parts = list(package.iter_parts())
+
+    content_types = ContentTypes({'rels': CT_RELATIONSHIPS, 'xml': CT_XML})
+    for part in parts:
+        content_types.add(part.partname.membername, part.content_type)
+
+    yield CONTENT_TYPES_PART, content_types.to_xml()
+    yield ROOT_RELS_PART, package._rels.xml
+    for part in parts:
+        # Parts spilled to disk (deck_spill.py) hand over their compressed entry
+        yield part.partname.membername, getattr(part, 'spooled', None) or part.blob
+        if len(part.rels):
+            yield part.partname.rels_uri.membername, part.rels.xml
+
+def write_entries(file, entries, workers=None, compression=DEFAULT_COMPRESSION,
+                  date_time=None, hashes=False):
+    """Compress (name, data) entries concurrently and write them in order.
+
+    `data` is bytes or a SpooledEntry, which is copied as already compressed.
+    Entries are consumed as they are written, with at most a few per worker
+    in flight, so a generator of entries is never held in memory at once.
+    With `hashes`, returns [(name, size, sha256)] for a build manifest.
+    """
+    workers = workers or min(8, os.cpu_count() or 1)
+
+    def compress(entry):
+        name, data = entry
+        if isinstance(data, SpooledEntry):
+            return data.read_raw(), data.sha256 if hashes else None
+        result = compress_entry(data, compression_level(name, compression))
+        digest = hashlib.sha256(data).hexdigest() if hashes else None
+        return result, digest
+
+    manifest = []
+
+    def write(name, result, digest):
+        writer.write_compressed(name, *result)
+        manifest.append((name, result[2], digest))
+
+    with PackageWriter(file, date_time=date_time) as writer:
+        if workers == 1:
+            for entry in entries:
+                write(entry[0], *compress(entry))
+        else:
+            # Results are written in submission order, so the zip layout
+            # does not depend on which thread finishes first
+            with ThreadPoolExecutor(workers) as executor:
+                pending = deque()
+                for entry in entries:
+                    pending.append((entry[0], executor.submit(compress, entry)))
+                    if len(pending) >= 4 * workers:
+                        name, future = pending.popleft()
+                        write(name, *future.result())
+                while pending:
+                    name, future = pending.popleft()
+                    write(name, *future.result())
+
+    return manifest if hashes else None
+
+# ============================================================================
+# SPOOLING
+# ============================================================================
+
+class SpooledEntry(namedtuple('SpooledEntry', 'spool offset compress_size crc file_size compress_type sha256')):
+    """A zip entry payload compressed into a PartSpool"""
+
+    __slots__ = ()
+
+    def read_raw(self):
+        """(raw, crc, file_size, compress_type), as compress_entry() returns"""
+        return self.spool.read(self.offset, self.compress_size), self.crc, self.file_size, self.compress_type
+
+    def read(self):
+        """Uncompressed payload"""
+        raw = self.spool.read(self.offset, self.compress_size)
+        if self.compress_type == zipfile.ZIP_STORED:
+            return raw
+        return zlib.decompress(raw, -15)
+
+class PartSpool:
+    """Anonymous temporary file holding compressed part payloads.
+
+    Parts are compressed once, when they are spooled; writing the package
+    later copies the compressed bytes as they are.
+    """
+
+    def __init__(self, dir=None):
+        self._fp = tempfile.TemporaryFile(dir=dir)
+        self._lock = threading.Lock()
+        self.size = 0
+
+    def add(self, name, data, compression=DEFAULT_COMPRESSION):
+        """Compress and append one part; returns its SpooledEntry"""
+        raw, crc, file_size, compress_type = compress_entry(data, compression_level(name, compression))
+        with self._lock:
+            offset = self.size
+            self._fp.seek(offset)
+            self._fp.write(raw)
+            self.size += len(raw)
+        return SpooledEntry(
+            self, offset, len(raw), crc, file_size, compress_type, hashlib.sha256(data).hexdigest()
+        )
+
+    def read(self, offset, size):
+        with self._lock:
+            self._fp.seek(offset)
+            return self._fp.read(size)
+
+    def close(self):
+        self._fp.close()
+
+# ============================================================================
+# REPRODUCIBLE BUILDS
+# ============================================================================
+
+def reproducible_datetime():
+    """Build timestamp for reproducible output: $SOURCE_DATE_EPOCH, clamped
+    to 1980-01-01 (the earliest time a zip entry can carry)"""
+    epoch = int(os.environ.get('SOURCE_DATE_EPOCH', ZIP_EPOCH))
+    return datetime.fromtimestamp(max(epoch, ZIP_EPOCH), timezone.utc).replace(tzinfo=None)
+
+def normalize_core_properties(prs, when):
+    """Pin docProps/core.xml fields that otherwise record the build time"""
+    core = prs.core_properties
+    core.created = when
+    core.modified = when
+    core.last_printed = when
+    core.last_modified_by = ''
+    core.revision = 1
+
+def write_build_manifest(deck_path, manifest):
+    """Write DECK.pptx.manifest.json: deck hash plus per-part sizes and hashes"""
+    with open(deck_path, 'rb') as f:
+        deck_digest = hashlib.sha256(f.read()).hexdigest()
+
+    data = {
+        'deck': os.path.basename(deck_path),
+        'sha256': deck_digest,
+        'parts': [
+            {'name': name, 'size': size, 'sha256': digest}
+            for name, size, digest in manifest
+        ],
+    }
+    manifest_path = deck_path + '.manifest.json'
+    with open(manifest_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+    return manifest_path
+
+@contextmanager
+def atomic_write(path, mode_from=None):
+    """Open a temporary file next to `path` for writing; it replaces `path`
+    only when the block finishes without an exception.
+
+    The result takes the permissions of `mode_from` (a file rewritten into a
+    copy) when given, else keeps those of an existing `path`; a new file
+    gets the usual umask-based mode, as if opened directly.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    tmp_path = os.path.join(directory, f'.{name}.{os.urandom(4).hex()}.tmp')
+    try:
+        with open(tmp_path, 'xb') as f:
+            yield f
+        mode_from = mode_from or path
+        if os.path.exists(mode_from):
+            shutil.copymode(mode_from, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+def save_presentation(prs, file, workers=None, compression=DEFAULT_COMPRESSION,
+                      reproducible=False):
+    """Save a python-pptx Presentation, deflating parts on a thread pool.
+
+    With `reproducible`, zip timestamps and core properties are pinned so the
+    same inputs always give byte-identical files, and the per-part manifest
+    [(name, size, sha256)] is returned. A path is written atomically: a failed
+    save leaves any previous deck there untouched.
+    """
+    date_time = None
+    if reproducible:
+        when = reproducible_datetime()
+        normalize_core_properties(prs, when)
+        date_time = when.timetuple()[:6]
+
+    with atomic_write(file) if isinstance(file, str) else nullcontext(file) as f:
+        return write_entries(
+            f, iter_presentation_entries(prs), workers=workers,
+            compression=compression, date_time=date_time, hashes=reproducible
+        )
@@ -0,0 +1,364 @@
+# -*- coding: utf-8 -*-
+"""
+Parity between the Python (python-pptx) and JS (pptxgenjs) deck generators.
+
+Both generators build the Module 1 deck from the same content. This harness
+runs each one as a child process (wall time, peak RSS, output size), then
+normalizes both packages to per-slide shape lists - kind, text, geometry and
+colors, with theme color slots resolved to RGB - and diffs them. Shapes are
+aligned per slide on their text (untexted shapes on their geometry kind), so
+a reordered or split shape shows up as such rather than as a cascade of
+mismatches.
+
+Usage:
+    python deck_parity.py run [--repeat N] [--json]
+    python deck_parity.py compare PYTHON.pptx JS.pptx [--json]
+
+`run` needs node and pptxgenjs (npm install in the repository root).
+"""
+
+from collections import Counter, namedtuple
+from deck_index import shape_text
+from deck_package import NS, slide_part_names
+from deck_theme import SCHEME_SLOTS, THEME_PART, resolve_luminance
+import argparse
+import difflib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+import zipfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+GENERATORS = {
+    'python': [sys.executable, os.path.join(HERE, 'create_presentation.py'), '-q', '--out'],
+    'js': ['node', os.path.join(HERE, 'create_presentation.cjs')],
+}
+
+EMU_PER_INCH = 914400
+GEOMETRY_TOLERANCE = EMU_PER_INCH // 100  # Differences under 0.01" are rounding
+
+# Slide master color map used by both generators (<p:clrMap>)
+COLOR_MAP = {'tx1': 'dk1', 'bg1': 'lt1', 'tx2': 'dk2', 'bg2': 'lt2'}
+
+Build = namedtuple('Build', 'seconds peak_rss_mb bytes')
+Shape = namedtuple('Shape', 'kind text x y cx cy fill line text_colors')
+ShapeDiff = namedtuple('ShapeDiff', 'slide change python js fields')
+
+def _a(tag):
+    return f"{{{NS['a']}}}{tag}"
+
+def _p(tag):
+    return f"{{{NS['p']}}}{tag}"
+
+_SHAPE_TAGS = {_p('sp'), _p('pic'), _p('cxnSp'), _p('graphicFrame')}
+_COLOR_TAGS = {_a('srgbClr'), _a('schemeClr'), _a('sysClr'), _a('prstClr')}
+
+# ============================================================================
+# BUILD
+# ============================================================================
+
+def run_generator(name, out_path):
+    """Run one generator into `out_path`; returns its Build stats.
+
+    Raises RuntimeError when the generator can't be started or fails.
+    """
+    start = time.perf_counter()
+    try:
+        proc = subprocess.Popen(
+            GENERATORS[name] + [out_path], cwd=HERE,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        raise RuntimeError(f"{name} generator needs {GENERATORS[name][0]!r}, which is not installed") from None
+    stderr = proc.stderr.read()
+    # wait4() gives this child's own rusage (ru_maxrss is in KiB on Linux)
+    _, status, usage = os.wait4(proc.pid, 0)
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    seconds = time.perf_counter() - start
+    if proc.returncode != 0 and b"Cannot find module 'pptxgenjs'" in stderr:
+        raise RuntimeError(f"{name} generator needs pptxgenjs: run npm install in the repository root")
+    if proc.returncode != 0 or not os.path.exists(out_path):
+        raise RuntimeError(f"{name} generator failed ({proc.returncode}): {stderr.decode(errors='replace').strip()}")
+    return Build(seconds, usage.ru_maxrss / 1024, os.path.getsize(out_path))
+
+def build_both(out_dir, repeat=1):
+    """Build the deck with each generator `repeat` times.
+
+    Returns ({name: Build}, {name: path}); seconds is the median over runs,
+    peak memory the maximum.
+    """
+    builds, paths = {}, {}
+    for name in GENERATORS:
+        paths[name] = os.path.join(out_dir, f'{name}.pptx')
+        runs = [run_generator(name, paths[name]) for _ in range(repeat)]
+        builds[name] = Build(
+            statistics.median(run.seconds for run in runs),
+            max(run.peak_rss_mb for run in runs),
+            runs[-1].bytes,
+        )
+    return builds, paths
+
+# ============================================================================
+# NORMALIZE
+# ============================================================================
+
+def read_theme_colors(zf):
+    """Return {slot: 'RRGGBB'} from the deck's theme color scheme"""
+    if THEME_PART not in zf.NameToInfo:
+        return {}
+    root = ET.fromstring(zf.read(THEME_PART))
+    clr_scheme = root.find('a:themeElements/a:clrScheme', NS)
+    colors = {}
+    for slot in SCHEME_SLOTS:
+        elem = clr_scheme.find(f'a:{slot}', NS) if clr_scheme is not None else None
+        color = elem[0] if elem is not None and len(elem) else None
+        if color is not None:
+            colors[slot] = (color.get('val') if color.tag == _a('srgbClr') else color.get('lastClr')) or ''
+    return colors
+
+def _color(parent, theme):
+    """RGB of the first color under `parent`'s solid fill, or None"""
+    if parent is None:
+        return None
+    fill = parent.find('a:solidFill', NS)
+    if fill is None:
+        return None
+    color = next((child for child in fill if child.tag in _COLOR_TAGS), None)
+    if color is None:
+        return None
+    if color.tag == _a('schemeClr'):
+        slot = color.get('val')
+        hex_value = theme.get(COLOR_MAP.get(slot, slot))
+        return resolve_luminance(hex_value, color).upper() if hex_value else slot.upper()
+    if color.tag == _a('sysClr'):
+        return (color.get('lastClr') or color.get('val')).upper()
+    return color.get('val').upper()
+
+def _text_colors(elem, theme):
+    """Distinct run colors of a shape, in order (run properties, else paragraph defaults)"""
+    colors = []
+    for para in elem.iter(_a('p')):
+        default = _color(para.find('a:pPr/a:defRPr', NS), theme)
+        for run in para.iterfind('a:r', NS):
+            color = _color(run.find('a:rPr', NS), theme) or default
+            if color and color not in colors:
+                colors.append(color)
+    return tuple(colors)
+
+def _shape_kind(elem):
+    if elem.tag == _p('sp'):
+        geom = elem.find('p:spPr/a:prstGeom', NS)
+        return geom.get('prst') if geom is not None else 'custom'
+    return elem.tag.rsplit('}', 1)[1]
+
+def normalize_shape(elem, theme):
+    """Normalized Shape for one spTree child"""
+    sp_pr = elem.find('p:spPr', NS)
+    # The shape's own transform only: a:ext also names extension list entries
+    xfrm = elem.find('p:xfrm' if elem.tag == _p('graphicFrame') else 'p:spPr/a:xfrm', NS)
+    off = xfrm.find('a:off', NS) if xfrm is not None else None
+    ext = xfrm.find('a:ext', NS) if xfrm is not None else None
+    return Shape(
+        _shape_kind(elem),
+        shape_text(elem),
+        int(off.get('x', 0)) if off is not None else 0,
+        int(off.get('y', 0)) if off is not None else 0,
+        int(ext.get('cx', 0)) if ext is not None else 0,
+        int(ext.get('cy', 0)) if ext is not None else 0,
+        _color(sp_pr, theme),
+        _color(sp_pr.find('a:ln', NS), theme) if sp_pr is not None else None,
+        _text_colors(elem, theme),
+    )
+
+def normalize_deck(path):
+    """Return [(background RGB, [Shape, ...]), ...] for every slide of a deck"""
+    slides = []
+    with zipfile.ZipFile(path) as zf:
+        theme = read_theme_colors(zf)
+        for part_name in slide_part_names(zf):
+            root = ET.fromstring(zf.read(part_name))
+            background = _color(root.find('p:cSld/p:bg/p:bgPr', NS), theme)
+            sp_tree = root.find('p:cSld/p:spTree', NS)
+            shapes = [
+                normalize_shape(elem, theme)
+                for elem in sp_tree.iter() if elem.tag in _SHAPE_TAGS
+            ]
+            slides.append((background, shapes))
+    return slides
+
+# ============================================================================
+# DIFF
+# ============================================================================
+
+def _key(shape):
+    return shape.text or shape.kind
+
+def _field_diffs(a, b, tolerance):
+    """{field: (python, js)} for the fields where two aligned shapes differ"""
+    fields = {}
+    for field in ('kind', 'text', 'fill', 'line', 'text_colors'):
+        if getattr(a, field) != getattr(b, field):
+            fields[field] = (getattr(a, field), getattr(b, field))
+    for field in ('x', 'y', 'cx', 'cy'):
+        if abs(getattr(a, field) - getattr(b, field)) > tolerance:
+            fields[field] = (getattr(a, field), getattr(b, field))
+    return fields
+
+def diff_slides(python_slides, js_slides, tolerance=GEOMETRY_TOLERANCE):
+    """ShapeDiffs between two normalized decks (python first)"""
+    diffs = []
+    for number in range(1, max(len(python_slides), len(js_slides)) + 1):
+        if number > len(js_slides):
+            diffs.append(ShapeDiff(number, 'slide', python_slides[number - 1], None, {}))
+            continue
+        if number > len(python_slides):
+            diffs.append(ShapeDiff(number, 'slide', None, js_slides[number - 1], {}))
+            continue
+
+        (py_bg, py_shapes), (js_bg, js_shapes) = python_slides[number - 1], js_slides[number - 1]
+        if py_bg != js_bg:
+            diffs.append(ShapeDiff(number, 'background', None, None, {'fill': (py_bg, js_bg)}))
+
+        matcher = difflib.SequenceMatcher(
+            None, [_key(s) for s in py_shapes], [_key(s) for s in js_shapes], autojunk=False,
+        )
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            # Aligned runs, and the overlap of replaced runs, are compared field by field
+            paired = min(i2 - i1, j2 - j1)
+            for a, b in zip(py_shapes[i1:i1 + paired], js_shapes[j1:j1 + paired]):
+                fields = _field_diffs(a, b, tolerance)
+                if fields:
+                    diffs.append(ShapeDiff(number, 'changed', a, b, fields))
+            for a in py_shapes[i1 + paired:i2]:
+                diffs.append(ShapeDiff(number, 'python-only', a, None, {}))
+            for b in js_shapes[j1 + paired:j2]:
+                diffs.append(ShapeDiff(number, 'js-only', None, b, {}))
+    return diffs
+
+def compare_decks(python_path, js_path, tolerance=GEOMETRY_TOLERANCE):
+    """Normalize two decks and diff them; returns (diffs, shape counts)"""
+    python_slides, js_slides = normalize_deck(python_path), normalize_deck(js_path)
+    counts = {
+        'python': sum(len(shapes) for _, shapes in python_slides),
+        'js': sum(len(shapes) for _, shapes in js_slides),
+    }
+    return diff_slides(python_slides, js_slides, tolerance), counts
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def _inches(emu):
+    return f'{emu / EMU_PER_INCH:.2f}"'
+
+def _describe(shape):
+    label = shape.text.replace('\n', ' / ') if shape.text else f'<{shape.kind}>'
+    if len(label) > 48:
+        label = label[:45] + '...'
+    return f'{label} at ({_inches(shape.x)}, {_inches(shape.y)})'
+
+def _format_value(field, value):
+    if field in ('x', 'y', 'cx', 'cy'):
+        return _inches(value)
+    if field == 'text_colors':
+        return ','.join(value) or '-'
+    return value if value is not None else '-'
+
+def format_report(diffs, counts, builds=None):
+    lines = []
+    if builds:
+        lines.append(f"{'':<14}{'python':>12}{'js':>12}")
+        lines.append(f"{'build time':<14}" + ''.join(f'{builds[n].seconds * 1000:>9.0f} ms' for n in GENERATORS))
+        lines.append(f"{'peak memory':<14}" + ''.join(f'{builds[n].peak_rss_mb:>9.1f} MB' for n in GENERATORS))
+        lines.append(f"{'output size':<14}" + ''.join(f'{builds[n].bytes / 1024:>9.1f} KB' for n in GENERATORS))
+    lines.append(f"{'shapes':<14}{counts['python']:>12}{counts['js']:>12}")
+    lines.append('')
+
+    for diff in diffs:
+        prefix = f'slide {diff.slide:>2}  '
+        if diff.change == 'slide':
+            lines.append(prefix + ('python only' if diff.js is None else 'js only'))
+        elif diff.change == 'background':
+            python, js = diff.fields['fill']
+            lines.append(prefix + f'background: python {python or "-"}, js {js or "-"}')
+        elif diff.change == 'python-only':
+            lines.append(prefix + f'- python only: {_describe(diff.python)}')
+        elif diff.change == 'js-only':
+            lines.append(prefix + f'+ js only: {_describe(diff.js)}')
+        else:
+            changes = '; '.join(
+                f'{field} {_format_value(field, python)} -> {_format_value(field, js)}'
+                for field, (python, js) in diff.fields.items()
+            )
+            lines.append(prefix + f'~ {_describe(diff.python)}: {changes}')
+    by_field = Counter(field for diff in diffs for field in diff.fields)
+    by_field.update(diff.change for diff in diffs if not diff.fields)
+    summary = ', '.join(f'{field} {count}' for field, count in by_field.most_common())
+    lines.append(f"\n{len(diffs)} difference(s)" + (f": {summary}" if summary else ''))
+    return '\n'.join(lines)
+
+def report_dict(diffs, counts, builds=None):
+    """JSON-serializable form of a parity report"""
+    def shape(s):
+        return s._asdict() if isinstance(s, Shape) else None
+    return {
+        'builds': {name: build._asdict() for name, build in builds.items()} if builds else None,
+        'shapes': counts,
+        'differences': [
+            {
+                'slide': diff.slide, 'change': diff.change,
+                'python': shape(diff.python), 'js': shape(diff.js),
+                'fields': {field: list(values) for field, values in diff.fields.items()},
+            }
+            for diff in diffs
+        ],
+    }
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Python vs JS deck generator parity')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='build the deck with both generators and compare')
+    run.add_argument('--repeat', type=int, default=1, help='builds per generator (median time)')
+    run.add_argument('--keep', metavar='DIR', help='keep both decks in DIR')
+    compare = commands.add_parser('compare', help='compare two existing decks')
+    compare.add_argument('python_deck')
+    compare.add_argument('js_deck')
+    for command in (run, compare):
+        command.add_argument('--json', action='store_true', help='print the report as JSON')
+        command.add_argument('--tolerance', type=float, default=GEOMETRY_TOLERANCE / EMU_PER_INCH,
+                             metavar='INCHES', help='ignore geometry differences up to this')
+    args = parser.parse_args(argv)
+    tolerance = round(args.tolerance * EMU_PER_INCH)
+
+    builds = None
+    try:
+        if args.command == 'run':
+            with tempfile.TemporaryDirectory(prefix='deck-parity-') as tmp:
+                out_dir = args.keep or tmp
+                os.makedirs(out_dir, exist_ok=True)
+                builds, paths = build_both(out_dir, args.repeat)
+                diffs, counts = compare_decks(paths['python'], paths['js'], tolerance)
+        else:
+            diffs, counts = compare_decks(args.python_deck, args.js_deck, tolerance)
+    except (RuntimeError, OSError, zipfile.BadZipFile, ET.ParseError) as e:
+        print(f"deck_parity.py: error: {e}", file=sys.stderr)
+        return 2
+
+    if args.json:
+        print(json.dumps(report_dict(diffs, counts, builds), ensure_ascii=False, indent=2))
+    else:
+        print(format_report(diffs, counts, builds))
+    return 1 if diffs else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,252 @@
+# -*- coding: utf-8 -*-
+"""
+Copy fixes for shipped decks without regenerating them.
+
+An edit names a shape and its new text. Only the slide parts that contain a
+matched shape are parsed and rewritten; every other zip entry is copied as
+its raw deflate stream (PackageWriter.copy_entry), so patching a deck costs
+little more than copying it. Decks no edit applies to are left alone, and a
+reproducible build manifest next to a patched deck is brought up to date.
+
+Edits (JSON list):
+    [{"find": "ДО 40 МИНУТ", "text": "ДО 45 МИНУТ"},
+     {"slide": 3, "shape": "TextBox 12", "text": "Git - твоя страховка"},
+     {"slide": 4, "shape": 7, "text": "Первая строка\\nВторая строка"}]
+
+"find" matches shapes by their current text (case and whitespace are
+ignored) on every slide, or only on "slide" when given. "shape" is a shape
+name or id on one slide; such an edit must match. New text keeps the
+formatting of the paragraphs it replaces, but each paragraph becomes a
+single run styled like its first run: bold words, links or color changes
+further along a paragraph are lost. "\\n" starts a new paragraph.
+
+Usage:
+    python deck_patch.py EDITS.json DECK_OR_DIR [...] [--workers N]
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from deck_index import normalize_text, shape_text
+from deck_package import (
+    NS, PackageWriter, atomic_write, compression_level, expand_deck_paths,
+    slide_part_names, write_build_manifest,
+)
+from lxml import etree
+import hashlib
+import json
+import os
+import sys
+import zipfile
+
+PATCH_WORKERS = 8
+
+Edit = namedtuple('Edit', 'slide shape find text')
+
+_SHAPE_TAGS = tuple(f"{{{NS['p']}}}{tag}" for tag in ('sp', 'graphicFrame'))
+_C_NV_PR = f"{{{NS['p']}}}cNvPr"
+_TX_BODY = (f"{{{NS['p']}}}txBody", f"{{{NS['a']}}}txBody")
+_PARA = f"{{{NS['a']}}}p"
+_P_PR = f"{{{NS['a']}}}pPr"
+_RUN = f"{{{NS['a']}}}r"
+_R_PR = f"{{{NS['a']}}}rPr"
+_TEXT = f"{{{NS['a']}}}t"
+_END_PARA_R_PR = f"{{{NS['a']}}}endParaRPr"
+
+# ============================================================================
+# EDITS
+# ============================================================================
+
+def parse_edits(items):
+    """Validate a list of edit dicts into Edit tuples"""
+    edits = []
+    for i, item in enumerate(items):
+        if 'text' not in item or ('find' in item) == ('shape' in item):
+            raise ValueError(f"Edit {i}: needs \"text\" and exactly one of \"find\" or \"shape\"")
+        if 'shape' in item and 'slide' not in item:
+            raise ValueError(f"Edit {i}: \"shape\" needs a \"slide\"")
+        edits.append(Edit(
+            item.get('slide'), item.get('shape'),
+            normalize_text(item['find']) if 'find' in item else None,
+            item['text'],
+        ))
+    return edits
+
+def load_edits(path):
+    with open(path, encoding='utf-8') as f:
+        return parse_edits(json.load(f))
+
+def _matches(edit, elem, text):
+    if edit.find is not None:
+        return normalize_text(text) == edit.find
+    c_nv_pr = next(elem.iter(_C_NV_PR), None)
+    if c_nv_pr is None:
+        return False
+    if isinstance(edit.shape, int):
+        return c_nv_pr.get('id') == str(edit.shape)
+    return c_nv_pr.get('name') == edit.shape
+
+# ============================================================================
+# TEXT
+# ============================================================================
+
+def set_shape_text(elem, text):
+    """Replace a shape's text, keeping paragraph and first-run formatting.
+
+    Each new paragraph is one run: formatting of later runs is dropped.
+    """
+    for tx_body in elem.iter(*_TX_BODY):
+        break
+    else:
+        raise ValueError("Shape has no text body")
+
+    old_paragraphs = tx_body.findall(_PARA)
+    insert_at = list(tx_body).index(old_paragraphs[0])
+    for para in old_paragraphs:
+        tx_body.remove(para)
+
+    for i, line in enumerate(text.split('\n')):
+        # Lines past the old paragraph count take the last paragraph's format
+        template = old_paragraphs[min(i, len(old_paragraphs) - 1)]
+        para = etree.Element(_PARA)
+        p_pr = template.find(_P_PR)
+        if p_pr is not None:
+            para.append(deepcopy(p_pr))
+        run = etree.SubElement(para, _RUN)
+        first_run = template.find(_RUN)
+        r_pr = first_run.find(_R_PR) if first_run is not None else None
+        if r_pr is not None:
+            run.append(deepcopy(r_pr))
+        etree.SubElement(run, _TEXT).text = line
+        end_r_pr = template.find(_END_PARA_R_PR)
+        if end_r_pr is not None:
+            para.append(deepcopy(end_r_pr))
+        tx_body.insert(insert_at + i, para)
+
+def patch_slide(slide_xml, edits):
+    """Apply [(index, Edit)] to one slide part.
+
+    Returns (new XML, or None when no text changed; indexes of the edits
+    whose shape was found).
+    """
+    root = etree.fromstring(slide_xml)
+    found, changed = set(), False
+    for elem in root.iter(*_SHAPE_TAGS):
+        text = shape_text(elem)
+        for i, edit in edits:
+            if _matches(edit, elem, text):
+                found.add(i)
+                if text != edit.text:
+                    set_shape_text(elem, edit.text)
+                    changed = True
+                break
+    if not changed:
+        return None, found
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True), found
+
+# ============================================================================
+# PACKAGE
+# ============================================================================
+
+def patch_deck(path, edits, out_path=None):
+    """Apply edits to a deck; returns the number of slide parts rewritten.
+
+    Nothing is written when no text changes. `out_path` (the deck itself by
+    default) is replaced atomically and takes the deck's permissions. Raises
+    LookupError for a "shape" edit whose slide or shape does not exist.
+    """
+    out_path = out_path or path
+    patched, found = {}, set()
+    with zipfile.ZipFile(path) as zf:
+        for number, slide_name in enumerate(slide_part_names(zf), start=1):
+            slide_edits = [
+                (i, edit) for i, edit in enumerate(edits)
+                if edit.slide in (None, number)
+            ]
+            if not slide_edits:
+                continue
+            xml, slide_found = patch_slide(zf.read(slide_name), slide_edits)
+            found |= slide_found
+            if xml is not None:
+                patched[slide_name] = xml
+
+        missing = [
+            edit for i, edit in enumerate(edits)
+            if edit.shape is not None and i not in found
+        ]
+        if missing:
+            raise LookupError(f"No shape {missing[0].shape!r} on slide {missing[0].slide}")
+        if not patched:
+            return 0
+
+        infos = zf.infolist()
+        # Keep the source's entry timestamp so reproducible decks stay reproducible
+        with open(path, 'rb') as fp, atomic_write(out_path, mode_from=path) as f, \
+                PackageWriter(f, infos[0].date_time) as writer:
+            for info in infos:
+                if info.filename in patched:
+                    xml = patched[info.filename]
+                    writer.write(info.filename, xml, level=compression_level(info.filename))
+                else:
+                    writer.copy_entry(fp, info)
+
+    _update_manifest(path, out_path, patched)
+    return len(patched)
+
+def _update_manifest(path, out_path, patched):
+    """Refresh the reproducible build manifest, if the deck has one"""
+    manifest_path = path + '.manifest.json'
+    if not os.path.exists(manifest_path):
+        return
+    with open(manifest_path, encoding='utf-8') as f:
+        parts = json.load(f)['parts']
+    manifest = [
+        (part['name'], len(patched[part['name']]), hashlib.sha256(patched[part['name']]).hexdigest())
+        if part['name'] in patched else (part['name'], part['size'], part['sha256'])
+        for part in parts
+    ]
+    write_build_manifest(out_path, manifest)
+
+def patch_decks(paths, edits, workers=PATCH_WORKERS):
+    """Patch every deck in `paths` (decks or directories) in place.
+
+    Decks are patched on a thread pool (zip I/O, zlib and lxml release the
+    GIL). Returns [(path, parts rewritten or the exception raised)] in path order.
+    """
+    def patch_one(deck):
+        try:
+            return deck, patch_deck(deck, edits)
+        except (OSError, LookupError, ValueError, zipfile.BadZipFile, etree.XMLSyntaxError) as e:
+            return deck, e
+
+    with ThreadPoolExecutor(workers) as executor:
+        return list(executor.map(patch_one, expand_deck_paths(paths)))
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv):
+    workers = PATCH_WORKERS
+    if '--workers' in argv:
+        i = argv.index('--workers')
+        workers = int(argv[i + 1])
+        argv = argv[:i] + argv[i + 2:]
+    if len(argv) < 2:
+        print(__doc__.strip())
+        return 2
+
+    edits = load_edits(argv[0])
+    failed = patched = 0
+    for deck, result in patch_decks(argv[1:], edits, workers):
+        if isinstance(result, Exception):
+            print(f"Failed: {deck}: {result}", file=sys.stderr)
+            failed += 1
+        elif result:
+            print(f"Patched {result} slide(s): {deck}")
+            patched += 1
+    print(f"\n{patched} deck(s) patched, {failed} failed")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+"""
+Memory-budgeted builds: finished slides are spilled to disk.
+
+python-pptx keeps every slide's lxml tree alive until the deck is saved, so
+memory grows with the slide count. A SlideSpool takes each slide once it is
+finished; while the slides still in memory exceed the budget, the oldest
+are compressed into a PartSpool (one temporary file)
+and their parts - the slide, its notes slide and charts - are swapped for
+SpilledPart stubs that keep only the part name, content type and
+relationships. save_presentation() then copies the spilled entries into the
+package without recompressing them.
+
+The memory a slide holds is estimated from its serialized size. Spilled
+slides can no longer be edited or read back through prs.slides.
+
+Usage:
+    python create_presentation.py --memory-budget 64 ...   # MB of slide trees
+"""
+
+from collections import deque
+from deck_package import PartSpool
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.package import Part, XmlPart
+import gc
+
+# Parts that belong to one slide only and go to disk with it
+SLIDE_OWNED_RELTYPES = (RT.NOTES_SLIDE, RT.CHART)
+
+# Resident memory of a python-pptx slide per byte of its XML (measured on
+# the Module 1 slides: ~145 MB of trees for 12.4 MB of XML)
+TREE_BYTES_PER_XML_BYTE = 12
+
+# python-pptx wrappers form reference cycles (slide <-> shapes, shape <->
+# line format), and a cycle holding one element proxy keeps the whole slide
+# tree alive. Spilled slides have usually reached the oldest GC generation,
+# so collect explicitly once this much has been spilled since the last time.
+COLLECT_EVERY = 16 * 2**20
+
+class SpilledPart(Part):
+    """Stand-in for a part whose payload lives in a PartSpool"""
+
+    def __init__(self, part, spooled):
+        super().__init__(part.partname, part.content_type, part.package)
+        self.__dict__['_rels'] = part.rels  # python-pptx lazyproperty slot
+        self.spooled = spooled
+
+    @property
+    def blob(self):
+        return self.spooled.read()
+
+def _retarget(rel, part):
+    rel._target = part
+    rel.__dict__.pop('target_part', None)  # python-pptx lazyproperty cache
+
+class SlideSpool:
+    """Spill finished slides of `prs` once they take more than `budget` bytes"""
+
+    def __init__(self, prs, budget, dir=None):
+        self.prs = prs
+        self.budget = budget
+        self.spool = PartSpool(dir=dir)
+        self.resident = deque()  # (slide rId, slide part, estimated bytes)
+        self.resident_bytes = 0
+        self.spilled = 0
+        self._uncollected = 0
+
+    def finish(self, rId, slide, xml_size):
+        """Record a finished slide (its rId in the presentation part), then spill down to budget"""
+        size = xml_size * TREE_BYTES_PER_XML_BYTE
+        self.resident.append((rId, slide.part, size))
+        self.resident_bytes += size
+        while self.resident_bytes > self.budget and self.resident:
+            rId, part, size = self.resident.popleft()
+            self.resident_bytes -= size
+            self._spill(rId, part)
+            self._uncollected += size
+        if self._uncollected >= max(self.budget // 2, COLLECT_EVERY):
+            gc.collect()
+            self._uncollected = 0
+
+    def _spill(self, rId, slide_part):
+        owned = [slide_part] + [
+            rel.target_part for rel in slide_part.rels.values()
+            if not rel.is_external and rel.reltype in SLIDE_OWNED_RELTYPES
+            and isinstance(rel.target_part, XmlPart)
+        ]
+        stubs = {
+            part: SpilledPart(part, self.spool.add(part.partname.membername, part.blob))
+            for part in owned
+        }
+
+        # Point every relationship that can reach these parts at the stubs:
+        # the presentation's slide rel, and the owned parts' own rels (notes -> slide)
+        _retarget(self.prs.part.rels[rId], stubs[slide_part])
+        for part in owned:
+            for rel in part.rels.values():
+                if not rel.is_external and rel._target in stubs:
+                    _retarget(rel, stubs[rel._target])
+        for part in owned:
+            # Drop the tree and python-pptx's cached wrappers (which reference
+            # the part back)
+            part.__dict__.clear()
+        self.spilled += 1
+
+    def close(self):
+        self.spool.close()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+"""
+Theme palette helpers for generated decks.
+
+Shapes in generated decks reference theme color slots (<a:schemeClr>), so
+the brand palette lives in the theme parts: ppt/theme/theme1.xml, plus one
+more per extra slide or notes master. Re-skinning an existing deck rewrites
+those zip entries and copies everything else.
+
+Usage:
+    python deck_theme.py palette.json DECK.pptx [DECK.pptx ...]
+"""
+
+from deck_package import PackageWriter, atomic_write, compression_level
+from lxml import etree
+import colorsys
+import json
+import re
+import sys
+import zipfile
+
+THEME_PART = 'ppt/theme/theme1.xml'
+THEME_PART_RE = re.compile(r'ppt/theme/theme\d+\.xml')
+DRAWINGML_NS = 'http://schemas.openxmlformats.org/drawingml/2006/main'
+
+# Order of slots inside <a:clrScheme>, fixed by the DrawingML schema
+SCHEME_SLOTS = (
+    'dk1', 'lt1', 'dk2', 'lt2',
+    'accent1', 'accent2', 'accent3', 'accent4', 'accent5', 'accent6',
+    'hlink', 'folHlink',
+)
+
+# ============================================================================
+# PALETTE
+# ============================================================================
+
+def normalize_palette(palette):
+    """Return {slot: 'RRGGBB'} from a palette of RGBColor or hex string values"""
+    normalized = {}
+    for slot, value in palette.items():
+        if slot not in SCHEME_SLOTS:
+            raise ValueError(f"Unknown theme color slot: {slot}")
+        hex_value = str(value).lstrip('#').upper()
+        if len(hex_value) != 6:
+            raise ValueError(f"Bad color for {slot}: {value!r}")
+        int(hex_value, 16)
+        normalized[slot] = hex_value
+    return normalized
+
+def load_palette(path):
+    """Load a palette JSON file ({"accent1": "#00FF88", ...})"""
+    with open(path, encoding='utf-8') as f:
+        return normalize_palette(json.load(f))
+
+def adjust_luminance(hex_value, lum_mod=1.0, lum_off=0.0):
+    """'RRGGBB' with its HSL lightness scaled by `lum_mod` and shifted by `lum_off`"""
+    r, g, b = (int(hex_value[i:i + 2], 16) / 255 for i in (0, 2, 4))
+    hue, lightness, saturation = colorsys.rgb_to_hls(r, g, b)
+    lightness = min(max(lightness * lum_mod + lum_off, 0.0), 1.0)
+    return ''.join(f'{round(c * 255):02X}' for c in colorsys.hls_to_rgb(hue, lightness, saturation))
+
+def apply_brightness(hex_value, brightness):
+    """'RRGGBB' shaded (brightness < 0) or tinted (> 0) as ColorFormat.brightness writes it"""
+    # Same 1/100000 steps as the <a:lumMod>/<a:lumOff> values in the XML
+    if brightness < 0:
+        return adjust_luminance(hex_value, round(1 + brightness, 5))
+    return adjust_luminance(hex_value, round(1 - brightness, 5), round(brightness, 5))
+
+def resolve_luminance(hex_value, color):
+    """Apply a color element's <a:lumMod>/<a:lumOff> children (tints, shades) to 'RRGGBB'"""
+    lum_mod = color.find(f'{{{DRAWINGML_NS}}}lumMod')
+    lum_off = color.find(f'{{{DRAWINGML_NS}}}lumOff')
+    if lum_mod is None and lum_off is None:
+        return hex_value
+    return adjust_luminance(
+        hex_value,
+        int(lum_mod.get('val')) / 100000 if lum_mod is not None else 1.0,
+        int(lum_off.get('val')) / 100000 if lum_off is not None else 0.0,
+    )
+
+def apply_palette(theme_xml, palette, name=None):
+    """Return theme XML bytes with clrScheme slots replaced by `palette`"""
+    palette = normalize_palette(palette)
+    root = etree.fromstring(theme_xml)
+    clr_scheme = root.find(f'{{{DRAWINGML_NS}}}themeElements/{{{DRAWINGML_NS}}}clrScheme')
+    if clr_scheme is None:
+        raise ValueError("Theme part has no <a:clrScheme>")
+
+    if name:
+        clr_scheme.set('name', name)
+
+    for slot in SCHEME_SLOTS:
+        if slot not in palette:
+            continue
+        slot_el = clr_scheme.find(f'{{{DRAWINGML_NS}}}{slot}')
+        if slot_el is None:
+            slot_el = etree.SubElement(clr_scheme, f'{{{DRAWINGML_NS}}}{slot}')
+        for child in list(slot_el):
+            slot_el.remove(child)
+        etree.SubElement(slot_el, f'{{{DRAWINGML_NS}}}srgbClr', val=palette[slot])
+
+    # Keep the schema order even if slots had to be created
+    clr_scheme[:] = sorted(
+        clr_scheme, key=lambda el: SCHEME_SLOTS.index(etree.QName(el).localname)
+    )
+
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+def apply_fonts(theme_xml, major=None, minor=None):
+    """Return theme XML bytes with the heading (major) / body (minor) latin fonts set"""
+    root = etree.fromstring(theme_xml)
+    font_scheme = root.find(f'{{{DRAWINGML_NS}}}themeElements/{{{DRAWINGML_NS}}}fontScheme')
+    if font_scheme is None:
+        raise ValueError("Theme part has no <a:fontScheme>")
+
+    for tag, typeface in (('majorFont', major), ('minorFont', minor)):
+        if typeface:
+            latin = font_scheme.find(f'{{{DRAWINGML_NS}}}{tag}/{{{DRAWINGML_NS}}}latin')
+            latin.set('typeface', typeface)
+
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+# ============================================================================
+# RE-SKIN
+# ============================================================================
+
+def reskin_deck(path, palette, out_path=None, name=None):
+    """Rewrite the theme palette of a .pptx without touching any slide part.
+
+    Only the theme parts (every ppt/theme/themeN.xml) are recompressed;
+    every other entry is copied as its raw deflate stream. The result
+    replaces `out_path` atomically and keeps the source file's permissions.
+    """
+    out_path = out_path or path
+    with open(path, 'rb') as fp, zipfile.ZipFile(fp) as src:
+        infos = src.infolist()
+        with atomic_write(out_path, mode_from=path) as f, \
+                PackageWriter(f, infos[0].date_time if infos else None) as dst:
+            for info in infos:
+                if THEME_PART_RE.fullmatch(info.filename):
+                    data = apply_palette(src.read(info), palette, name=name)
+                    dst.write(info.filename, data, level=compression_level(info.filename))
+                else:
+                    dst.copy_entry(fp, info)
+
+    return out_path
+
+def main(argv):
+    if len(argv) < 2:
+        print(__doc__.strip())
+        return 2
+
+    palette = load_palette(argv[0])
+    for deck in argv[1:]:
+        reskin_deck(deck, palette)
+        print(f"Re-skinned: {deck}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
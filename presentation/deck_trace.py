@@ -0,0 +1,307 @@
+# -*- coding: utf-8 -*-
+"""
+Record and replay render traces.
+
+While a trace is being recorded, every top-level primitive call of one deck
+(the @counted shape helpers, add_slide, write_notes, linked media) is
+written out with its arguments - geometry, text, colors, chart and table
+data - as one gzipped JSON line. The brand and slide size go into the
+header. Replaying the trace re-runs those calls against a fresh deck, so a
+slow production build can be reproduced and profiled without its
+transcripts, exports or brand packs, and traces double as realistic
+benchmark workloads.
+
+Recording follows the calling thread (a context variable): record around a
+synchronous build, not around aiter_presentation() or worker processes.
+Streamed arguments such as transcript chunks are buffered per call.
+
+Usage:
+    python create_presentation.py --trace build.trace.gz [...]
+    python deck_trace.py replay build.trace.gz [--out DECK.pptx] [--repeat N] [--profile]
+    python deck_trace.py stats build.trace.gz
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from pptx.dml.color import RGBColor
+from pptx.presentation import Presentation
+from pptx.slide import Slide, SlideLayout
+from pptx.util import Emu, Length
+from types import MappingProxyType, SimpleNamespace
+import argparse
+import functools
+import gzip
+import importlib
+import json
+import os
+import statistics
+import sys
+import time
+import weakref
+
+TRACE_FORMAT = 'deck-trace'
+TRACE_VERSION = 1
+
+# Primitive name -> traced function, filled in as modules are imported
+PRIMITIVES = {}
+
+RECORDER = ContextVar('deck_trace_recorder', default=None)
+
+# ============================================================================
+# RECORDING
+# ============================================================================
+
+def traced(func):
+    """Mark a render primitive: calls are recorded while a trace is active"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        recorder = RECORDER.get()
+        if recorder is None:
+            return func(*args, **kwargs)
+        return recorder.call(func, args, kwargs)
+
+    PRIMITIVES[func.__name__] = wrapper
+    return wrapper
+
+class TraceRecorder:
+    """Writes the primitive calls of one deck to a gzipped JSON-lines file"""
+
+    def __init__(self, path):
+        self.path = path
+        self.calls = 0
+        self._out = gzip.open(path, 'wt', encoding='utf-8')
+        self._package = None
+        self._slides = weakref.WeakKeyDictionary()  # slide part -> trace index
+        self._depth = 0
+
+    def call(self, func, args, kwargs):
+        if self._depth:
+            return func(*args, **kwargs)  # Nested primitive: replayed by its caller
+
+        # Buffer streamed arguments so they can be written and still consumed
+        args = [list(arg) if isinstance(arg, Iterator) else arg for arg in args]
+        kwargs = {k: list(v) if isinstance(v, Iterator) else v for k, v in kwargs.items()}
+        if self._package is None:
+            self._start(args[0])
+        event = {'call': func.__name__, 'args': [self._encode(arg) for arg in args]}
+        if kwargs:
+            event['kwargs'] = {k: self._encode(v) for k, v in kwargs.items()}
+
+        self._depth += 1
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            self._depth -= 1
+        event['us'] = round((time.perf_counter() - start) * 1e6)
+
+        if isinstance(result, Slide):
+            self._slides.setdefault(result.part, len(self._slides))
+        self._out.write(json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self.calls += 1
+        return result
+
+    def _start(self, target):
+        from render_context import context_of
+        context = context_of(target)
+        self._package = target.part.package
+        header = {
+            'format': TRACE_FORMAT, 'version': TRACE_VERSION,
+            'brand': encode_brand(context.brand),
+            'slide_width': context.slide_width, 'slide_height': context.slide_height,
+        }
+        self._out.write(json.dumps(header, ensure_ascii=False, separators=(',', ':')) + '\n')
+
+    def _encode(self, value):
+        if value is None or isinstance(value, (bool, str, float)):
+            return value
+        if isinstance(value, Enum):
+            cls = type(value)
+            return {'$': 'enum', 'type': f'{cls.__module__}.{cls.__qualname__}', 'name': value.name}
+        if isinstance(value, Length):
+            return {'$': 'emu', 'v': int(value)}
+        if isinstance(value, int):
+            return value
+        if isinstance(value, RGBColor):
+            return {'$': 'rgb', 'v': str(value)}
+        if isinstance(value, Presentation):
+            self._check_package(value.part.package)
+            return {'$': 'deck'}
+        if isinstance(value, SlideLayout):
+            return {'$': 'layout', 'i': value.slide_master.slide_layouts.index(value)}
+        if isinstance(value, Slide):
+            self._check_package(value.part.package)
+            if value.part not in self._slides:
+                raise ValueError("Slide was not created through add_slide() while recording")
+            return {'$': 'slide', 'i': self._slides[value.part]}
+        if isinstance(value, tuple) and hasattr(value, '_fields'):
+            return {'$': 'record', 'v': {k: self._encode(v) for k, v in value._asdict().items()}}
+        if isinstance(value, (list, tuple)):
+            return [self._encode(item) for item in value]
+        if isinstance(value, dict):
+            return {'$': 'dict', 'v': [[self._encode(k), self._encode(v)] for k, v in value.items()]}
+        if hasattr(value, 'tolist'):
+            return self._encode(value.tolist())  # numpy arrays and scalars
+        raise TypeError(f"Can't trace argument of type {type(value).__name__}")
+
+    def _check_package(self, package):
+        if package is not self._package:
+            raise ValueError("A trace records a single deck")
+
+    def close(self):
+        self._out.close()
+
+@contextmanager
+def record_trace(path):
+    """Record the primitive calls made in this context (one deck) to `path`"""
+    recorder = TraceRecorder(path)
+    token = RECORDER.set(recorder)
+    try:
+        yield recorder
+    finally:
+        RECORDER.reset(token)
+        recorder.close()
+
+# ============================================================================
+# BRANDS
+# ============================================================================
+
+def encode_brand(brand):
+    return {
+        'name': brand.name, 'key': brand.key,
+        'palette': dict(brand.palette), 'fonts': dict(brand.fonts),
+        'margin': brand.margin, 'content_left': brand.content_left,
+        'content_top': brand.content_top,
+    }
+
+def decode_brand(data):
+    from brand_pack import Brand
+    return Brand(
+        name=data['name'], key=data['key'],
+        palette=MappingProxyType(data['palette']), fonts=MappingProxyType(data['fonts']),
+        margin=Emu(data['margin']), content_left=Emu(data['content_left']),
+        content_top=Emu(data['content_top']),
+    )
+
+# ============================================================================
+# REPLAY
+# ============================================================================
+
+def _decode(value, prs, slides):
+    if isinstance(value, list):
+        return [_decode(item, prs, slides) for item in value]
+    if not isinstance(value, dict):
+        return value
+
+    kind = value['$']
+    if kind == 'emu':
+        return Emu(value['v'])
+    if kind == 'enum':
+        module, _, name = value['type'].rpartition('.')
+        if not module.startswith('pptx.enum.'):
+            raise ValueError(f"Unexpected enum type in trace: {value['type']}")
+        return getattr(importlib.import_module(module), name)[value['name']]
+    if kind == 'rgb':
+        return RGBColor.from_string(value['v'])
+    if kind == 'deck':
+        return prs
+    if kind == 'layout':
+        return prs.slide_layouts[value['i']]
+    if kind == 'slide':
+        return slides[value['i']]
+    if kind == 'record':
+        return SimpleNamespace(**{k: _decode(v, prs, slides) for k, v in value['v'].items()})
+    if kind == 'dict':
+        return {_decode(k, prs, slides): _decode(v, prs, slides) for k, v in value['v']}
+    raise ValueError(f"Unknown trace value: {kind}")
+
+def read_trace(path):
+    """Return (header, iterator over call events) of a trace file"""
+    f = gzip.open(path, 'rt', encoding='utf-8')
+    header = json.loads(f.readline() or 'null')
+    if not header or header.get('format') != TRACE_FORMAT or header.get('version') != TRACE_VERSION:
+        f.close()
+        raise ValueError(f"{path} is not a version {TRACE_VERSION} deck trace")
+
+    def events():
+        with f:
+            for line in f:
+                yield json.loads(line)
+    return header, events()
+
+def replay_trace(path, output_path=None, reproducible=False):
+    """Re-run a trace against a fresh deck; returns the Presentation (saved if `output_path`)"""
+    import create_presentation as cp  # Imports every module that defines primitives
+    from deck_package import save_presentation
+    from deck_trace import PRIMITIVES  # The registry they filled, also when run as a script
+    header, events = read_trace(path)
+    prs = cp.new_presentation(decode_brand(header['brand']), header['slide_width'], header['slide_height'])
+    slides = []
+    for event in events:
+        func = PRIMITIVES[event['call']]
+        args = [_decode(arg, prs, slides) for arg in event['args']]
+        kwargs = {k: _decode(v, prs, slides) for k, v in event.get('kwargs', {}).items()}
+        result = func(*args, **kwargs)
+        if isinstance(result, Slide):
+            slides.append(result)
+    if output_path:
+        save_presentation(prs, output_path, reproducible=reproducible)
+    return prs
+
+def trace_stats(path):
+    """{primitive: (calls, recorded microseconds)} for a trace, busiest first"""
+    _, events = read_trace(path)
+    stats = {}
+    for event in events:
+        calls, us = stats.get(event['call'], (0, 0))
+        stats[event['call']] = (calls + 1, us + event.get('us', 0))
+    return dict(sorted(stats.items(), key=lambda item: -item[1][1]))
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Replay and inspect deck render traces')
+    commands = parser.add_subparsers(dest='command', required=True)
+    replay = commands.add_parser('replay', help='re-run a trace')
+    replay.add_argument('trace')
+    replay.add_argument('--out', help='save the replayed deck here')
+    replay.add_argument('--repeat', type=int, default=1, help='replays to time (median is printed)')
+    replay.add_argument('--profile', action='store_true', help='print a cProfile summary of one replay')
+    stats = commands.add_parser('stats', help='calls and recorded time per primitive')
+    stats.add_argument('trace')
+    args = parser.parse_args(argv)
+
+    if args.command == 'stats':
+        total = 0
+        for name, (calls, us) in trace_stats(args.trace).items():
+            print(f"{name:<24} {calls:>7} calls  {us / 1000:>9.1f} ms")
+            total += us
+        print(f"\n{total / 1000:.1f} ms recorded in primitives")
+        return 0
+
+    if args.profile:
+        import cProfile
+        import pstats
+        profiler = cProfile.Profile()
+        profiler.runcall(replay_trace, args.trace, args.out)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(25)
+        return 0
+
+    reproducible = bool(os.environ.get('SOURCE_DATE_EPOCH'))
+    seconds = []
+    for i in range(args.repeat):
+        start = time.perf_counter()
+        prs = replay_trace(args.trace, args.out if i == 0 else None, reproducible)
+        seconds.append(time.perf_counter() - start)
+    print(f"Replayed {len(prs.slides)} slide(s): median {statistics.median(seconds) * 1000:.1f} ms "
+          f"over {args.repeat} run(s)")
+    if args.out:
+        print(f"Presentation saved to: {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
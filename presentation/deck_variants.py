@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Prefix-sharing builds: deck variants reuse the slides they have in common.
+
+Per-cohort or per-locale variants of a deck usually share their first
+slides (title, overview, program) and differ only further on - other
+transcripts in the lesson notes, other slides at the end. Each slide of a
+job is identified by what goes into it: the slide builder (or imported
+slide), the transcript and media of the lesson it holds, and the progress
+export on the results slide. Jobs with the
+same brand, slide size and build mode are arranged in a prefix tree over
+those keys; every run of slides two or more jobs share is rendered once, as
+a snapshot package, and each variant is composed from the snapshots along
+its path plus its own remaining slides (deck_compose.compose_decks(), raw
+entry copies, slides renumbered). Jobs that share nothing are rendered
+directly.
+
+Usage:
+    paths = render_variants(jobs)              # jobs as built by create_presentation._job()
+    paths = render_variants(jobs, pool)        # snapshots rendered on a DeckWorkerPool
+
+    python create_presentation.py --spec cohort_a.json --spec cohort_b.json [...] [--workers N]
+"""
+
+from brand_pack import DEFAULT_BRAND
+from collections import namedtuple
+from concurrent.futures import Future
+from deck_compose import compose_decks
+from deck_package import reproducible_datetime, write_build_manifest
+from deck_workers import _package_manifest, job_slide_numbers, render_chunk, repeats_lesson_slides
+from lesson_notes import LESSON_SLIDES
+import create_presentation as cp
+import hashlib
+import json
+import os
+import tempfile
+
+# A run of slides [start, end) of jobs[job]'s slide list, rendered as one package
+Segment = namedtuple('Segment', 'job start end shared')
+
+_SLIDE_LESSONS = {number: lesson for lesson, number in LESSON_SLIDES.items()}
+
+# ============================================================================
+# PLAN
+# ============================================================================
+
+def slide_keys(job):
+    """One key per slide of a job: equal keys render to the same slide XML"""
+    numbers = job_slide_numbers(job)
+    deck = job.get('deck')
+    if deck is not None:
+        return [
+            hashlib.sha256(json.dumps(deck['slides'][n - 1], sort_keys=True).encode('utf-8')).hexdigest()
+            for n in numbers
+        ]
+
+    transcripts = job['transcripts'] or {}
+    keys = []
+    for number in numbers:
+        lesson = _SLIDE_LESSONS.get(number)
+        keys.append((
+            number,
+            transcripts.get(lesson) if lesson else None,
+            job['media'] if lesson else None,
+            job.get('results') if number == cp.RESULTS_SLIDE else None,
+        ))
+    return keys
+
+def _group_key(job):
+    """Jobs can only share slides within one group (same theme, size and package mode)"""
+    if repeats_lesson_slides(job):
+        return id(job)  # Render alone
+    deck = job.get('deck')
+    size = (deck['slide_width'], deck['slide_height']) if deck is not None else None
+    return job['variant'] or DEFAULT_BRAND, size, job['reproducible']
+
+def plan_variants(jobs):
+    """(segments, [segment indexes per job]) for rendering `jobs` with shared prefixes"""
+    segments, paths = [], [[] for _ in jobs]
+
+    def split(members, start):
+        # members: [(job index, keys)] agreeing on keys[:start]
+        if len(members) == 1:
+            i, keys = members[0]
+            if start < len(keys):
+                paths[i].append(len(segments))
+                segments.append(Segment(i, start, len(keys), False))
+            return
+        end = start
+        while all(len(keys) > end for _, keys in members) and len({keys[end] for _, keys in members}) == 1:
+            end += 1
+        if end > start:
+            for i, _ in members:
+                paths[i].append(len(segments))
+            segments.append(Segment(members[0][0], start, end, True))
+        branches = {}
+        for i, keys in members:
+            if len(keys) > end:
+                branches.setdefault(keys[end], []).append((i, keys))
+        for branch in branches.values():
+            split(branch, end)
+
+    groups = {}
+    for i, job in enumerate(jobs):
+        groups.setdefault(_group_key(job), []).append((i, slide_keys(job)))
+    for members in groups.values():
+        split(members, 0)
+    return segments, paths
+
+# ============================================================================
+# RENDER
+# ============================================================================
+
+def render_variants(jobs, pool=None):
+    """Render jobs, sharing common leading slides; returns output paths in job order.
+
+    Snapshots and unshared jobs are rendered on `pool` (a DeckWorkerPool)
+    when given, else one after another in this process.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    segments, paths = plan_variants(jobs)
+    out_paths = [job['out'] or cp.default_output_path(job['variant'], job['slides']) for job in jobs]
+
+    def submit(job, chunk=False):
+        if pool is not None:
+            return pool.submit_chunk(job) if chunk else pool.submit(job)
+        future = Future()
+        future.set_result(render_chunk(job) if chunk else cp.render_job(job))
+        return future
+
+    out_dir = os.path.dirname(os.path.abspath(out_paths[0]))
+    with tempfile.TemporaryDirectory(prefix='.deck-snapshots-', dir=out_dir) as tmp:
+        futures = {}
+        for index, segment in enumerate(segments):
+            job = jobs[segment.job]
+            if not segment.shared and paths[segment.job] == [index]:
+                # Shares nothing: render straight to its output
+                futures[index] = submit(dict(job, out=out_paths[segment.job]))
+                continue
+            numbers = job_slide_numbers(job)[segment.start:segment.end]
+            snapshot = dict(
+                job, slides=','.join(map(str, numbers)),
+                out=os.path.join(tmp, f'segment{index:04d}.pptx'),
+            )
+            futures[index] = submit(snapshot, chunk=True)
+
+        for i, job in enumerate(jobs):
+            if len(paths[i]) == 1 and not segments[paths[i][0]].shared:
+                futures[paths[i][0]].result()
+                continue
+            sources = [(futures[index].result(), None) for index in paths[i]]
+            date_time = reproducible_datetime().timetuple()[:6] if job['reproducible'] else None
+            compose_decks(sources, out_paths[i], date_time)
+            if job['reproducible']:
+                write_build_manifest(out_paths[i], _package_manifest(out_paths[i]))
+            cp.count_deck(out_paths[i], len(job_slide_numbers(job)))
+    return out_paths
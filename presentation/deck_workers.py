@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""
+Fork-server worker pool for rendering many decks.
+
+A spawned worker pays again for importing python-pptx and lxml, reading and
+parsing the default template, compiling brand packs and their theme parts,
+and warming python-pptx's lazy lookups - about a quarter of a second before
+it renders anything. DeckWorkerPool does all of that once in the parent
+(preload()), moves the result out of the garbage collector's reach
+(gc.freeze()), and then forks the workers: they start with everything
+already loaded and share those pages copy-on-write.
+
+One large deck can also be split across the workers (render_deck()): each
+renders a contiguous run of its slides into a chunk deck, and the parent
+assembles the chunks in order with deck_compose.compose_decks(), which
+renumbers their slides and copies their entries without recompressing
+them. The composed deck counts as one rendered deck, not one per chunk.
+
+Usage:
+    with DeckWorkerPool(4, brands=['cyber_architecture']) as pool:
+        paths = list(pool.map(jobs))     # jobs as built by create_presentation._job()
+        path = pool.render_deck(job)     # one job, slides split across workers
+
+    python create_presentation.py --spec a.json --spec b.json --workers 4
+    python create_presentation.py --slides 1-11,1-11,1-11 --workers 4
+
+Create the pool before starting threads (metrics server, thread pools):
+forking a multi-threaded process is unsafe, so the pool forks all of its
+workers up front, and uses spawned workers that run preload() themselves
+when other threads are already running or fork is unavailable. Deck
+metrics are counted in the workers and sent back with each result; the
+parent merges them into its own, so its /metrics covers the whole pool
+(deck_workers_busy only counts renders in progress in the parent).
+"""
+
+from brand_pack import DEFAULT_BRAND, get_brand
+from concurrent.futures import Future, ProcessPoolExecutor
+from deck_compose import compose_decks, parse_slide_ranges
+from deck_metrics import merge_metrics, metrics_delta, snapshot_metrics
+from deck_package import reproducible_datetime, write_build_manifest
+from lesson_notes import LESSON_SLIDES
+import create_presentation as cp
+import gc
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+import zipfile
+
+# Chunks per worker when splitting one deck: more than one evens out slow
+# chunks; fewer keeps per-chunk overhead (template, masters, zip) down
+CHUNKS_PER_WORKER = 2
+MIN_CHUNK_SLIDES = 8
+
+def preload(brands=(DEFAULT_BRAND,)):
+    """Load everything a render needs into this process: template, brands, theme parts.
+
+    One throwaway deck per brand also warms python-pptx's lazily built
+    lookups (shape factories, oxml element classes, autoshape definitions).
+    """
+    for name in brands:
+        prs = cp.new_presentation(get_brand(name))  # Caches the brand and its theme part
+        cp.render_slides(prs, cp.select_slides())
+
+def render_chunk(job):
+    """Render a job's slides as a chunk of a deck composed later; returns its path"""
+    for _ in cp.iter_presentation(chunk=True, **cp._job_kwargs(job)):
+        pass
+    return job['out']
+
+def _measured(func, *args):
+    """Run one task in a worker; returns (result, metrics the task recorded)"""
+    before = snapshot_metrics()
+    result = func(*args)
+    return result, metrics_delta(before)
+
+def job_slide_numbers(job):
+    """The slide numbers a job renders, in order"""
+    if job['slides']:
+        return parse_slide_ranges(job['slides'])
+    if job.get('deck'):
+        return list(range(1, len(job['deck']['slides']) + 1))
+    return [entry.number for entry in cp.select_slides()]
+
+def repeats_lesson_slides(job):
+    """True when a lesson slide occurs more than once in the job.
+
+    Notes and media go on the last copy of a lesson slide in the whole deck,
+    which a chunk or snapshot holding only part of it can't know: such jobs
+    must be rendered in one piece.
+    """
+    if job.get('deck') is not None:
+        return False
+    lessons = set(LESSON_SLIDES.values())
+    numbers = [n for n in job_slide_numbers(job) if n in lessons]
+    return len(set(numbers)) != len(numbers)
+
+def split_slides(numbers, chunks):
+    """Split slide numbers into at most `chunks` contiguous runs of near-equal size"""
+    chunks = max(1, min(chunks, len(numbers)))
+    size, extra = divmod(len(numbers), chunks)
+    runs, start = [], 0
+    for i in range(chunks):
+        end = start + size + (i < extra)
+        runs.append(numbers[start:end])
+        start = end
+    return runs
+
+def _package_manifest(path):
+    """[(name, size, sha256)] of every entry of a written package"""
+    with zipfile.ZipFile(path) as zf:
+        return [
+            (info.filename, info.file_size, hashlib.sha256(zf.read(info)).hexdigest())
+            for info in zf.infolist()
+        ]
+
+class DeckWorkerPool:
+    """Process pool whose workers are forked from a preloaded parent"""
+
+    def __init__(self, workers=None, brands=(DEFAULT_BRAND,), start_method=None):
+        brands = tuple(brands)
+        threaded = threading.active_count() > 1
+        if start_method is None:
+            can_fork = 'fork' in multiprocessing.get_all_start_methods() and not threaded
+            start_method = 'fork' if can_fork else 'spawn'
+        elif start_method == 'fork' and threaded:
+            raise RuntimeError(
+                "DeckWorkerPool can't fork: other threads are running "
+                "(create the pool before starting them, or use start_method='spawn')"
+            )
+        context = multiprocessing.get_context(start_method)
+        workers = workers or os.cpu_count()
+
+        if start_method == 'fork':
+            preload(brands)
+            # Preloaded objects live until exit; keep the collector from
+            # touching (and so un-sharing) their pages in every worker
+            gc.collect()
+            gc.freeze()
+            self._executor = ProcessPoolExecutor(workers, mp_context=context)
+            # The first task forks every worker, before the executor starts
+            # its manager thread: do it now, while this is the only thread
+            self._executor.submit(os.getpid).result()
+        else:
+            self._executor = ProcessPoolExecutor(
+                workers, mp_context=context, initializer=preload, initargs=(brands,)
+            )
+        self.start_method = start_method
+        self.workers = workers
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _submit(self, func, *args):
+        """Run func(*args) in a worker; merges its metrics here and returns a Future of its result"""
+        future = Future()
+
+        def done(task):
+            try:
+                result, delta = task.result()
+            except BaseException as e:
+                future.set_exception(e)
+                return
+            merge_metrics(delta)
+            future.set_result(result)
+
+        self._executor.submit(_measured, func, *args).add_done_callback(done)
+        return future
+
+    def submit(self, job):
+        """Render one job (create_presentation._job() dict); returns a Future of its path"""
+        return self._submit(cp.render_job, job)
+
+    def submit_chunk(self, job):
+        """Render a job's slides as a chunk (render_chunk()); returns a Future of its path"""
+        return self._submit(render_chunk, job)
+
+    def map(self, jobs):
+        """Render jobs in parallel; yields output paths in job order"""
+        futures = [self.submit(job) for job in jobs]
+        return (future.result() for future in futures)
+
+    def render_deck(self, job, chunks=None):
+        """Render one job with its slides split across the workers; returns its path.
+
+        Slides are cut into `chunks` contiguous runs (CHUNKS_PER_WORKER per
+        worker by default, at least MIN_CHUNK_SLIDES each), rendered in
+        parallel and composed in order. Lesson notes and media land on the
+        lesson slides of whichever chunk holds them; jobs that repeat a
+        lesson slide are rendered whole (repeats_lesson_slides()).
+        """
+        numbers = job_slide_numbers(job)
+        if chunks is None:
+            chunks = min(self.workers * CHUNKS_PER_WORKER,
+                         len(numbers) // MIN_CHUNK_SLIDES)
+        if chunks <= 1 or repeats_lesson_slides(job):
+            return self.submit(job).result()
+
+        out_path = job['out'] or cp.default_output_path(job['variant'], job['slides'])
+        out_dir = os.path.dirname(os.path.abspath(out_path))
+        with tempfile.TemporaryDirectory(prefix='.deck-chunks-', dir=out_dir) as tmp:
+            futures = []
+            for i, run in enumerate(split_slides(numbers, chunks)):
+                chunk = dict(
+                    job, slides=','.join(map(str, run)),
+                    out=os.path.join(tmp, f'chunk{i:04d}.pptx'),
+                )
+                futures.append(self.submit_chunk(chunk))
+
+            # Chunks are assembled in slide order, whatever order they finish in
+            chunk_paths = [future.result() for future in futures]
+            date_time = reproducible_datetime().timetuple()[:6] if job['reproducible'] else None
+            compose_decks([(path, None) for path in chunk_paths], out_path, date_time)
+
+        if job['reproducible']:
+            write_build_manifest(out_path, _package_manifest(out_path))
+        cp.count_deck(out_path, len(numbers))
+        return out_path
+
+    def close(self):
+        self._executor.shutdown()
+        if self.start_method == 'fork':
+            gc.unfreeze()
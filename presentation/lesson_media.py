@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+"""
+Lesson clips on lesson slides, linked rather than embedded.
+
+Videos, GIFs and poster images stay in platform storage: slides only get
+external relationships (TargetMode="External") to their URLs, so a deck with
+every lesson clip stays in the hundreds of kilobytes. For offline
+distribution, pack_deck() downloads every linked target once and embeds it
+as a media part; all other entries are copied without recompression.
+
+Media map (JSON, lesson -> clip):
+    {"1.1": {"video": "https://cdn.example.com/lesson_1_1.mp4",
+             "poster": "https://cdn.example.com/lesson_1_1.jpg"},
+     "1.2": {"gif": "https://cdn.example.com/lesson_1_2.gif"}}
+
+Usage:
+    python lesson_media.py link DECK.pptx MEDIA.json
+    python lesson_media.py pack DECK.pptx [OUT.pptx]
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from deck_layout import LayoutSlide
+from deck_metrics import counted
+from deck_package import (
+    CONTENT_TYPES_PART, NS, ContentTypes, PackageWriter, atomic_write, compression_level,
+    read_rels, relative_target, rels_name, serialize_rels, slide_part_names,
+)
+from lesson_notes import LESSON_SLIDES
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.shapes.picture import CT_Picture
+from pptx.util import Inches
+from urllib.parse import unquote, urlsplit
+from urllib.request import urlopen
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import sys
+import zipfile
+
+# Bottom-right corner of the lesson slides, clear of cards and the footer
+CLIP_LEFT = Inches(11.0)
+CLIP_TOP = Inches(6.2)
+CLIP_WIDTH = Inches(1.78)
+CLIP_HEIGHT = Inches(1.0)
+
+MEDIA_TYPES = {
+    'mp4': 'video/mp4',
+    'm4v': 'video/x-m4v',
+    'mov': 'video/quicktime',
+    'webm': 'video/webm',
+    'gif': 'image/gif',
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'jpeg': 'image/jpeg',
+    'webp': 'image/webp',
+}
+
+LINKED_RELTYPES = (RT.VIDEO, RT.MEDIA, RT.IMAGE)
+FETCH_WORKERS = 8
+
+_R_LINK = f"{{{NS['r']}}}link"
+_R_EMBED = f"{{{NS['r']}}}embed"
+_P14_MEDIA = '{http://schemas.microsoft.com/office/powerpoint/2010/main}media'
+_BLIP = f"{{{NS['a']}}}blip"
+
+# ============================================================================
+# LINKED SHAPES
+# ============================================================================
+
+def _link_instead_of_embed(element):
+    element.set(_R_LINK, element.attrib.pop(_R_EMBED))
+
+@counted
+def add_linked_video(slide, left, top, width, height, url, poster_url):
+    """Add a video that plays from `url`; the poster frame is linked too"""
+    if isinstance(slide, LayoutSlide):
+        return slide.record('video', left, top, width, height, url)
+
+    part = slide.part
+    video_rId = part.relate_to(url, RT.VIDEO, is_external=True)
+    media_rId = part.relate_to(url, RT.MEDIA, is_external=True)
+    poster_rId = part.relate_to(poster_url, RT.IMAGE, is_external=True)
+
+    shapes = slide.shapes
+    shape_id = shapes._next_shape_id
+    pic = CT_Picture.new_video_pic(
+        shape_id, f'Lesson clip {shape_id}', video_rId, media_rId, poster_rId,
+        left, top, width, height
+    )
+    _link_instead_of_embed(next(pic.iter(_P14_MEDIA)))
+    _link_instead_of_embed(next(pic.iter(_BLIP)))
+    shapes._spTree.append(pic)
+    shapes._add_video_timing(pic)
+    return shapes._shape_factory(pic)
+
+@counted
+def add_linked_picture(slide, left, top, width, height, url):
+    """Add a picture (e.g. an animated GIF) that is loaded from `url`"""
+    if isinstance(slide, LayoutSlide):
+        return slide.record('picture', left, top, width, height, url)
+
+    rId = slide.part.relate_to(url, RT.IMAGE, is_external=True)
+    shapes = slide.shapes
+    shape_id = shapes._next_shape_id
+    pic = shapes._spTree.add_pic(
+        shape_id, f'Lesson clip {shape_id}', posixpath.basename(urlsplit(url).path),
+        rId, left, top, width, height
+    )
+    _link_instead_of_embed(next(pic.iter(_BLIP)))
+    return shapes._shape_factory(pic)
+
+def load_media_map(path):
+    """Load a lesson media map; relative local paths resolve against its directory"""
+    with open(path, encoding='utf-8') as f:
+        media = json.load(f)
+    base = os.path.dirname(os.path.abspath(path))
+    for clip in media.values():
+        for key, target in clip.items():
+            if not urlsplit(target).scheme:
+                clip[key] = 'file://' + os.path.join(base, target)
+    return media
+
+def add_lesson_media(prs, media, lesson_slides=LESSON_SLIDES):
+    """Link {lesson: {"video"/"poster" or "gif": url}} into the matching slides"""
+    slides = prs.slides
+    for lesson, clip in media.items():
+        if lesson not in lesson_slides:
+            raise ValueError(f"No slide for lesson {lesson}")
+        slide = slides[lesson_slides[lesson] - 1]
+        if 'video' in clip:
+            if 'poster' not in clip:
+                raise ValueError(f"Lesson {lesson}: a linked video needs a poster image")
+            add_linked_video(
+                slide, CLIP_LEFT, CLIP_TOP, CLIP_WIDTH, CLIP_HEIGHT, clip['video'], clip['poster']
+            )
+        elif 'gif' in clip:
+            add_linked_picture(slide, CLIP_LEFT, CLIP_TOP, CLIP_WIDTH, CLIP_HEIGHT, clip['gif'])
+        else:
+            raise ValueError(f"Lesson {lesson}: expected 'video' or 'gif'")
+
+# ============================================================================
+# PACK
+# ============================================================================
+
+def fetch_media(url):
+    """Return the bytes behind a http(s)://, file:// URL or local path"""
+    parts = urlsplit(url)
+    if parts.scheme in ('', 'file'):
+        with open(unquote(parts.path) if parts.scheme else url, 'rb') as f:
+            return f.read()
+    with urlopen(url, timeout=60) as response:
+        return response.read()
+
+def _media_extension(url):
+    ext = posixpath.splitext(urlsplit(url).path)[1][1:].lower()
+    if ext in MEDIA_TYPES:
+        return ext
+    guessed = mimetypes.guess_extension(mimetypes.guess_type(url)[0] or '') or '.bin'
+    return guessed[1:]
+
+def pack_deck(path, out_path=None, fetch=fetch_media, workers=FETCH_WORKERS):
+    """Embed every linked video, GIF and poster so the deck works offline.
+
+    Each distinct URL is fetched once (concurrently) and stored as one media
+    part, however many slides link it. Returns the number of parts embedded.
+    """
+    out_path = out_path or path
+    with zipfile.ZipFile(path) as zf:
+        slide_rels = {name: read_rels(zf, name) for name in slide_part_names(zf)}
+        urls = sorted({
+            target
+            for rels in slide_rels.values()
+            for reltype, target, is_external in rels.values()
+            if is_external and reltype in LINKED_RELTYPES
+        })
+        with ThreadPoolExecutor(workers) as executor:
+            blobs = dict(zip(urls, executor.map(fetch, urls)))
+
+        media_parts = {
+            url: f"ppt/media/linked_{hashlib.sha256(url.encode('utf-8')).hexdigest()[:16]}"
+                 f".{_media_extension(url)}"
+            for url in urls
+        }
+        content_types = ContentTypes.from_zip(zf)
+        for url, part_name in media_parts.items():
+            ext = posixpath.splitext(part_name)[1][1:]
+            content_types.add(part_name, MEDIA_TYPES.get(ext, 'application/octet-stream'))
+
+        replaced = {CONTENT_TYPES_PART: content_types.to_xml()}
+        for slide_name, rels in slide_rels.items():
+            packed = {
+                rId for rId, (reltype, target, is_external) in rels.items()
+                if is_external and reltype in LINKED_RELTYPES
+            }
+            if not packed:
+                continue
+            replaced[rels_name(slide_name)] = serialize_rels([
+                (rId, reltype, relative_target(slide_name, media_parts[target]), False)
+                if rId in packed else
+                (rId, reltype, target if is_external else relative_target(slide_name, target), is_external)
+                for rId, (reltype, target, is_external) in rels.items()
+            ])
+            replaced[slide_name] = _embed_links(zf.read(slide_name), packed)
+
+        with open(path, 'rb') as fp, atomic_write(out_path, mode_from=path) as f, \
+                PackageWriter(f) as writer:
+            for info in zf.infolist():
+                if info.filename in replaced:
+                    writer.write(info.filename, replaced[info.filename])
+                else:
+                    writer.copy_entry(fp, info)
+            for url, part_name in media_parts.items():
+                writer.write(part_name, blobs[url], level=compression_level(part_name))
+
+    return len(media_parts)
+
+def _embed_links(slide_xml, rIds):
+    """Point blips and p14:media at embedded parts; a:videoFile keeps r:link"""
+    root = etree.fromstring(slide_xml)
+    for tag in (_BLIP, _P14_MEDIA):
+        for element in root.iter(tag):
+            if element.get(_R_LINK) in rIds:
+                element.set(_R_EMBED, element.attrib.pop(_R_LINK))
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8', standalone=True)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv):
+    if len(argv) >= 3 and argv[0] == 'link':
+        from deck_package import save_presentation
+        from pptx import Presentation
+        prs = Presentation(argv[1])
+        add_lesson_media(prs, load_media_map(argv[2]))
+        save_presentation(prs, argv[1])
+        print(f"Linked media written to: {argv[1]}")
+        return 0
+
+    if len(argv) in (2, 3) and argv[0] == 'pack':
+        out_path = argv[2] if len(argv) == 3 else None
+        count = pack_deck(argv[1], out_path)
+        print(f"Embedded {count} media file(s) into: {out_path or argv[1]}")
+        return 0
+
+    print(__doc__.strip())
+    return 2
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+"""
+Speaker notes for lesson slides, built from lesson transcripts.
+
+Transcripts are the SRT/VTT exports stored by the backend
+(video_transcriptions.transcript_srt / transcript_vtt). They are read cue by
+cue, grouped into fixed time windows, and each window is written as one
+notes paragraph ("[MM:SS] text") as soon as it is complete. Every cue ends up
+in the notes; only the current window is held besides the notes themselves.
+Length caps per window (`chunk_chars`) and per slide (`max_chars`) are opt-in,
+and log a warning whenever they drop text.
+
+Usage:
+    python lesson_notes.py DECK.pptx LESSON=TRANSCRIPT [LESSON=TRANSCRIPT ...]
+    python lesson_notes.py DECK.pptx lesson_1_1.vtt lesson_1_2.srt ...
+"""
+
+from collections import namedtuple
+from pptx import Presentation
+from deck_package import save_presentation
+from deck_trace import traced
+import logging
+import os
+import re
+import sys
+
+# Lesson number -> 1-based slide number in the Module 1 deck
+LESSON_SLIDES = {
+    '1.1': 4,
+    '1.2': 5,
+    '1.3': 6,
+    '1.4': 7,
+    '1.5': 8,
+    '1.6': 9,
+}
+
+WINDOW_SECONDS = 60      # One notes paragraph per minute of video
+CHUNK_CHARS = None       # Text kept per window (None: all of it)
+MAX_NOTES_CHARS = None   # Text kept per slide (None: all of it)
+
+Cue = namedtuple('Cue', 'start end text')
+Chunk = namedtuple('Chunk', 'start text')
+
+_TIMING_RE = re.compile(
+    r'(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})\s*-->\s*(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{3})'
+)
+_TAG_RE = re.compile(r'<[^>]+>')
+_LESSON_RE = re.compile(r'(\d+)[._-](\d+)')
+
+log = logging.getLogger(__name__)
+
+# ============================================================================
+# TRANSCRIPT STREAM
+# ============================================================================
+
+def _seconds(hours, minutes, seconds, millis):
+    return int(hours or 0) * 3600 + int(minutes) * 60 + int(seconds) + int(millis) / 1000
+
+def iter_cues(lines):
+    """Yield Cue records from SRT or WebVTT lines, one cue at a time"""
+    start = end = None
+    text = []
+    for line in lines:
+        line = line.strip()
+        timing = _TIMING_RE.search(line)
+        if timing:
+            start = _seconds(*timing.groups()[:4])
+            end = _seconds(*timing.groups()[4:])
+            text = []
+        elif not line:
+            if start is not None and text:
+                yield Cue(start, end, ' '.join(text))
+            start = None
+            text = []
+        elif start is not None:
+            text.append(_TAG_RE.sub('', line))
+    if start is not None and text:
+        yield Cue(start, end, ' '.join(text))
+
+def iter_chunks(cues, window=WINDOW_SECONDS, chunk_chars=CHUNK_CHARS):
+    """Group cues into time windows; with `chunk_chars`, clip each window to that length"""
+    chunk_start = None
+    parts = []
+    for cue in cues:
+        if chunk_start is not None and cue.start >= chunk_start + window:
+            yield Chunk(chunk_start, _clip(chunk_start, ' '.join(parts), chunk_chars))
+            chunk_start = None
+            parts = []
+        if chunk_start is None:
+            chunk_start = cue.start - cue.start % window
+        parts.append(cue.text)
+    if chunk_start is not None:
+        yield Chunk(chunk_start, _clip(chunk_start, ' '.join(parts), chunk_chars))
+
+def _clip(start, text, limit):
+    if limit is None or len(text) <= limit:
+        return text
+    clipped = text[:limit].rsplit(' ', 1)[0]
+    log.warning("Notes window [%s] clipped to %d chars: %d chars dropped",
+                _timestamp(start), limit, len(text) - len(clipped))
+    return clipped + '…'
+
+def _timestamp(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
+
+# ============================================================================
+# NOTES
+# ============================================================================
+
+@traced
+def write_notes(slide, chunks, max_chars=MAX_NOTES_CHARS):
+    """Append chunks to a slide's notes as they arrive; return chars written.
+
+    With `max_chars`, windows that would go past it are left out (and
+    logged); the stream is still read to the end.
+    """
+    tf = slide.notes_slide.notes_text_frame
+    written = 0
+    skipped_from = None
+    skipped_chars = 0
+
+    for chunk in chunks:
+        line = f"[{_timestamp(chunk.start)}] {chunk.text}"
+        if skipped_from is not None or (max_chars is not None and written + len(line) > max_chars):
+            # Keep draining the stream so the caller's file is read to the end
+            if skipped_from is None:
+                skipped_from = chunk.start
+            skipped_chars += len(line)
+            continue
+
+        p = tf.paragraphs[0] if not written else tf.add_paragraph()
+        p.text = line
+        written += len(line)
+
+    if skipped_from is not None:
+        tf.add_paragraph().text = f"[{_timestamp(skipped_from)}+] …"
+        log.warning("Notes capped at %d chars: %d chars from [%s] on dropped",
+                    max_chars, skipped_chars, _timestamp(skipped_from))
+    return written
+
+def lesson_for_path(path):
+    """Infer the lesson number from a file name like lesson_1_3.vtt"""
+    match = _LESSON_RE.search(os.path.basename(path))
+    if not match:
+        raise ValueError(f"Cannot infer lesson from file name: {path}")
+    return f"{match.group(1)}.{match.group(2)}"
+
+def add_lesson_notes(prs, transcripts, lesson_slides=LESSON_SLIDES,
+                     max_chars=MAX_NOTES_CHARS, **chunk_options):
+    """Write notes for {lesson: transcript_path} into the matching slides.
+
+    Transcripts are processed one at a time and streamed from disk, so a full
+    course's notes never need every transcript in memory at once. `max_chars`
+    and `chunk_chars` (see write_notes(), iter_chunks()) opt into length caps.
+    """
+    slides = prs.slides
+    for lesson, path in transcripts.items():
+        if lesson not in lesson_slides:
+            raise ValueError(f"No slide for lesson {lesson}")
+        slide = slides[lesson_slides[lesson] - 1]
+        with open(path, encoding='utf-8-sig') as f:
+            write_notes(slide, iter_chunks(iter_cues(f), **chunk_options), max_chars)
+
+def parse_transcript_args(args):
+    """Parse "LESSON=PATH" or bare PATH arguments into {lesson: path}"""
+    transcripts = {}
+    for arg in args:
+        lesson, sep, path = arg.partition('=')
+        if not sep:
+            lesson, path = lesson_for_path(arg), arg
+        transcripts[lesson] = path
+    return transcripts
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv):
+    if len(argv) < 2:
+        print(__doc__.strip())
+        return 2
+
+    deck = argv[0]
+    prs = Presentation(deck)
+    add_lesson_notes(prs, parse_transcript_args(argv[1:]))
+    save_presentation(prs, deck)
+    print(f"Notes written to: {deck}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""
+Performance regression gate for the deck generator.
+
+Runs generator benchmarks (benchmarks.py) several times, each run in a fresh
+child process so its peak RSS is its own, and compares time, peak memory
+and output size against a committed baseline. Each metric is summarized by
+its median and a distribution-free confidence interval (order statistics of
+the runs, at least 95% coverage, so at least 6 runs); a metric regresses
+when its median is worse than the baseline's by more than its threshold and
+the two intervals do not overlap, so one noisy run cannot fail the gate. Needs nothing beyond the generator's own
+dependencies.
+
+Usage:
+    python perf_gate.py record [NAME ...] [--runs N] [--scale N]
+    python perf_gate.py check [NAME ...] [--runs N] [--threshold METRIC=FRACTION ...]
+
+Baselines are machine-specific: record them on the box that runs the gate.
+"""
+
+from math import comb
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, 'perf_baseline.json')
+
+GATE_BENCHMARKS = ('deck', 'build', 'save_serial', 'analytics')
+DEFAULT_RUNS = 7
+DEFAULT_SCALE = 5
+CONFIDENCE = 0.95
+
+# Allowed slowdown / growth before a metric counts as regressed
+THRESHOLDS = {'seconds': 0.10, 'peak_rss_mb': 0.10, 'bytes': 0.02}
+METRICS = tuple(THRESHOLDS)
+
+# ============================================================================
+# SAMPLES
+# ============================================================================
+
+def run_sample(name, scale):
+    """Run one benchmark in a child process; returns {metric: value}"""
+    # stderr goes to a file: with two pipes, a child filling the one not
+    # being read would block, and so would this process
+    with tempfile.TemporaryFile() as err_file:
+        proc = subprocess.Popen(
+            [sys.executable, os.path.join(HERE, 'benchmarks.py'), name, '--scale', str(scale), '--json'],
+            cwd=HERE, stdout=subprocess.PIPE, stderr=err_file,
+        )
+        stdout = proc.stdout.read()
+        proc.stdout.close()
+        # wait4() gives this child's own rusage (ru_maxrss is in KiB on Linux)
+        _, status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(status)
+        err_file.seek(0)
+        stderr = err_file.read()
+    if proc.returncode != 0:
+        raise RuntimeError(f"Benchmark {name} failed: {stderr.decode(errors='replace').strip()}")
+
+    metrics = json.loads(stdout)[name]
+    sample = {'seconds': metrics['seconds'], 'peak_rss_mb': usage.ru_maxrss / 1024}
+    if 'bytes' in metrics:
+        sample['bytes'] = metrics['bytes']
+    return sample
+
+def collect(names, runs, scale, verbose=True):
+    """{name: {metric: [value per run]}}; benchmarks are interleaved run by run"""
+    samples = {name: {} for name in names}
+    for i in range(runs):
+        for name in names:
+            for metric, value in run_sample(name, scale).items():
+                samples[name].setdefault(metric, []).append(value)
+        if verbose:
+            print(f"run {i + 1}/{runs} done", file=sys.stderr)
+    return samples
+
+# ============================================================================
+# STATISTICS
+# ============================================================================
+
+def ci_order(n, confidence=CONFIDENCE):
+    """(k, coverage) of the median confidence interval for `n` runs.
+
+    [x(k), x(n-1-k)] (sorted, 0-based) covers the true median with
+    probability 1 - 2 * P(Binomial(n, 1/2) <= k); k is the largest index
+    that keeps that at or above `confidence`. Raises ValueError when even
+    min..max (k = 0) falls short: too few runs.
+    """
+    def coverage(k):
+        return 1 - 2 * sum(comb(n, i) for i in range(k + 1)) / 2 ** n
+
+    if coverage(0) < confidence:
+        raise ValueError(f"{n} runs give no {confidence:.0%} confidence interval: "
+                         f"use at least {min_runs(confidence)}")
+    k = 0
+    while k + 1 < n - 2 - k and coverage(k + 1) >= confidence:
+        k += 1
+    return k, coverage(k)
+
+def min_runs(confidence=CONFIDENCE):
+    """Fewest runs whose min..max covers the median with `confidence`"""
+    n = 2
+    while 1 - 2 / 2 ** n < confidence:
+        n += 1
+    return n
+
+def median_ci(values, confidence=CONFIDENCE):
+    """(median, low, high): the median and an order-statistic confidence interval.
+
+    See ci_order(); raises ValueError for too few values.
+    """
+    xs = sorted(values)
+    k, _ = ci_order(len(xs), confidence)
+    return statistics.median(xs), xs[k], xs[len(xs) - 1 - k]
+
+def compare_metric(baseline, current, threshold):
+    """Verdict for one metric: 'regressed', 'improved' or 'ok', plus the relative change"""
+    base_median, base_low, base_high = median_ci(baseline)
+    median, low, high = median_ci(current)
+    change = (median - base_median) / base_median if base_median else 0.0
+    if change > threshold and low > base_high:
+        return 'regressed', change
+    if change < -threshold and high < base_low:
+        return 'improved', change
+    return 'ok', change
+
+# ============================================================================
+# BASELINE
+# ============================================================================
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'cpus': os.cpu_count(),
+    }
+
+def write_baseline(path, samples, runs, scale):
+    data = {'scale': scale, 'runs': runs, 'environment': environment(), 'benchmarks': samples}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+def load_baseline(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+# ============================================================================
+# REPORT
+# ============================================================================
+
+def _format(metric, value):
+    if metric == 'seconds':
+        return f'{value * 1000:.1f} ms'
+    if metric == 'peak_rss_mb':
+        return f'{value:.1f} MB'
+    return f'{value / 1024:.1f} KB'
+
+def _interval(metric, values):
+    median, low, high = median_ci(values)
+    return f'{_format(metric, median)} [{_format(metric, low)} .. {_format(metric, high)}]'
+
+def check(baseline, samples, thresholds=THRESHOLDS):
+    """Compare samples against a baseline; returns (report rows, regressed?)"""
+    rows, regressed = [], False
+    for name, metrics in samples.items():
+        base_metrics = baseline['benchmarks'].get(name)
+        if base_metrics is None:
+            rows.append((name, '-', '-', '-', '-', 'no baseline'))
+            continue
+        for metric in METRICS:
+            if metric not in metrics or metric not in base_metrics:
+                continue
+            verdict, change = compare_metric(base_metrics[metric], metrics[metric], thresholds[metric])
+            regressed = regressed or verdict == 'regressed'
+            rows.append((
+                name, metric, _interval(metric, base_metrics[metric]),
+                _interval(metric, metrics[metric]), f'{change:+.1%}',
+                verdict.upper() if verdict == 'regressed' else verdict,
+            ))
+    return rows, regressed
+
+def format_report(rows):
+    header = ('benchmark', 'metric', 'baseline median [CI]', 'current median [CI]', 'change', 'verdict')
+    widths = [max(len(str(row[i])) for row in [header, *rows]) for i in range(len(header))]
+    lines = ['  '.join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip()
+             for row in [header, *rows]]
+    lines.insert(1, '  '.join('-' * width for width in widths))
+    return '\n'.join(lines)
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def _parse_thresholds(items):
+    thresholds = dict(THRESHOLDS)
+    for item in items:
+        metric, _, value = item.partition('=')
+        if metric not in THRESHOLDS or not value:
+            raise SystemExit(f"Bad --threshold {item!r}: use one of {', '.join(METRICS)}=FRACTION")
+        thresholds[metric] = float(value)
+    return thresholds
+
+def main(argv):
+    parser = argparse.ArgumentParser(description='Performance regression gate')
+    parser.add_argument('command', choices=('record', 'check'))
+    parser.add_argument('names', nargs='*', metavar='NAME',
+                        help=f"benchmarks to run (default: {' '.join(GATE_BENCHMARKS)})")
+    parser.add_argument('--runs', type=int, help=f'runs per benchmark (default: {DEFAULT_RUNS}, or the baseline\'s)')
+    parser.add_argument('--scale', type=int, help=f'benchmark scale (default: {DEFAULT_SCALE}, or the baseline\'s)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON path')
+    parser.add_argument('--threshold', action='append', default=[], metavar='METRIC=FRACTION',
+                        help='allowed regression, e.g. seconds=0.15 (defaults: ' +
+                        ', '.join(f'{m}={t}' for m, t in THRESHOLDS.items()) + ')')
+    args = parser.parse_args(argv)
+    if args.runs is not None and args.runs < min_runs():
+        parser.error(f"--runs {args.runs} gives no {CONFIDENCE:.0%} confidence interval: use at least {min_runs()}")
+
+    if args.command == 'record':
+        names = args.names or list(GATE_BENCHMARKS)
+        runs, scale = args.runs or DEFAULT_RUNS, args.scale or DEFAULT_SCALE
+        write_baseline(args.baseline, collect(names, runs, scale), runs, scale)
+        print(f"Baseline written to: {args.baseline}")
+        return 0
+
+    thresholds = _parse_thresholds(args.threshold)
+    baseline = load_baseline(args.baseline)
+    names = args.names or list(baseline['benchmarks'])
+    runs, scale = args.runs or baseline['runs'], args.scale or baseline['scale']
+    if scale != baseline['scale']:
+        print(f"Scale {scale} differs from the baseline's ({baseline['scale']})", file=sys.stderr)
+        return 2
+    if baseline['runs'] < min_runs():
+        print(f"The baseline has {baseline['runs']} runs, too few for {CONFIDENCE:.0%} confidence "
+              f"intervals: record it again with --runs {min_runs()} or more", file=sys.stderr)
+        return 2
+    if baseline.get('environment') != environment():
+        print(f"Warning: baseline was recorded on {baseline.get('environment')}, "
+              f"this is {environment()}", file=sys.stderr)
+
+    rows, regressed = check(baseline, collect(names, runs, scale), thresholds)
+    print(format_report(rows))
+    _, coverage = ci_order(runs)
+    _, base_coverage = ci_order(baseline['runs'])
+    print(f"\n{'FAIL: performance regressed' if regressed else 'OK'} "
+          f"({runs} runs, {coverage:.1%} confidence intervals; "
+          f"baseline {baseline['runs']} runs, {base_coverage:.1%})")
+    return 1 if regressed else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,358 @@
+# -*- coding: utf-8 -*-
+"""
+Publish generated decks to S3-compatible object storage.
+
+Works with Supabase Storage's S3 endpoint, MinIO or any other S3 stand-in.
+All requests go through a small pool of keep-alive connections; decks whose
+sha256 already matches the remote object's metadata are skipped, and large
+decks are sent as concurrent multipart uploads. Decks found in a directory
+keep their path relative to it in the object key (PREFIX/a/deck.pptx), and
+decks that would share a key are refused before anything is uploaded.
+
+Usage:
+    python publish_decks.py [DECK_OR_DIR ...]
+
+Environment:
+    DECK_STORAGE_ENDPOINT    e.g. https://<project>.supabase.co/storage/v1/s3
+                             or http://127.0.0.1:9000
+    DECK_STORAGE_BUCKET      bucket name
+    DECK_STORAGE_ACCESS_KEY  S3 access key id
+    DECK_STORAGE_SECRET_KEY  S3 secret access key
+    DECK_STORAGE_REGION      signing region (default: us-east-1)
+    DECK_STORAGE_PREFIX      key prefix (default: decks/)
+"""
+
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from deck_metrics import UPLOAD_BYTES, UPLOADS
+from deck_package import expand_deck_paths
+from urllib.parse import quote, urlsplit
+from xml.etree import ElementTree as ET
+import hashlib
+import hmac
+import http.client
+import os
+import queue
+import sys
+
+MULTIPART_THRESHOLD = 16 * 1024 * 1024
+PART_SIZE = 8 * 1024 * 1024          # S3 requires >= 5 MiB for all but the last part
+POOL_SIZE = 8
+HASH_META = 'x-amz-meta-sha256'
+PPTX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+
+PublishResult = namedtuple('PublishResult', 'path key status size')
+
+class StorageError(Exception):
+    """Object storage returned an unexpected response"""
+
+    def __init__(self, method, path, status, body):
+        super().__init__(f"{method} {path} -> HTTP {status}: {body[:200]!r}")
+        self.status = status
+
+# ============================================================================
+# CONNECTION POOL
+# ============================================================================
+
+class ConnectionPool:
+    """Fixed-size pool of keep-alive HTTP(S) connections to one host"""
+
+    def __init__(self, endpoint, size=POOL_SIZE, timeout=60):
+        url = urlsplit(endpoint)
+        self.scheme = url.scheme
+        self.host = url.netloc
+        self.base_path = url.path.rstrip('/')
+        self._timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._slots = queue.Queue()
+        for _ in range(size):
+            self._slots.put(None)
+
+    def _new_connection(self):
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return cls(self.host, timeout=self._timeout)
+
+    def request(self, method, path, headers, body=b''):
+        """Send a request and return (status, headers, body).
+
+        A connection taken from the idle pool may have been closed by the
+        server meanwhile; the request then fails before the server reads it
+        and is sent once more on a fresh connection. A request that fails on
+        a fresh connection may have reached the server (e.g. POST ?uploads)
+        and is not resent.
+        """
+        self._slots.get()
+        conn = None
+        try:
+            try:
+                conn, pooled = self._idle.get_nowait(), True
+            except queue.Empty:
+                conn, pooled = self._new_connection(), False
+            try:
+                response, data = self._send(conn, method, path, headers, body)
+            except (http.client.RemoteDisconnected, ConnectionResetError,
+                    BrokenPipeError, http.client.CannotSendRequest):
+                if not pooled:
+                    raise
+                conn.close()
+                conn = self._new_connection()
+                response, data = self._send(conn, method, path, headers, body)
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._idle.put(conn)
+            conn = None
+            return response.status, {k.lower(): v for k, v in response.getheaders()}, data
+        except BaseException:
+            # Timeouts, TLS errors, ...: the connection's state is unknown
+            if conn is not None:
+                conn.close()
+            raise
+        finally:
+            self._slots.put(None)
+
+    @staticmethod
+    def _send(conn, method, path, headers, body):
+        conn.request(method, path, body=body, headers=headers)
+        response = conn.getresponse()
+        return response, response.read()
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+# ============================================================================
+# S3 CLIENT
+# ============================================================================
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+def _hmac(key, msg):
+    return hmac.new(key, msg.encode('utf-8'), hashlib.sha256).digest()
+
+class S3Client:
+    """Just enough of the S3 API (SigV4, path-style) to publish decks"""
+
+    def __init__(self, endpoint, bucket, access_key, secret_key,
+                 region='us-east-1', pool_size=POOL_SIZE):
+        self.pool = ConnectionPool(endpoint, size=pool_size)
+        self.bucket = bucket
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region = region
+
+    @classmethod
+    def from_env(cls, pool_size=POOL_SIZE):
+        env = os.environ
+        return cls(
+            env['DECK_STORAGE_ENDPOINT'], env['DECK_STORAGE_BUCKET'],
+            env['DECK_STORAGE_ACCESS_KEY'], env['DECK_STORAGE_SECRET_KEY'],
+            region=env.get('DECK_STORAGE_REGION', 'us-east-1'), pool_size=pool_size,
+        )
+
+    def close(self):
+        self.pool.close()
+
+    def _signed_headers(self, method, path, query, headers, payload_hash):
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime('%Y%m%dT%H%M%SZ')
+        scope = f"{now.strftime('%Y%m%d')}/{self.region}/s3/aws4_request"
+
+        headers = {k.lower(): str(v).strip() for k, v in headers.items()}
+        headers['host'] = self.pool.host
+        headers['x-amz-date'] = amz_date
+        headers['x-amz-content-sha256'] = payload_hash
+
+        signed = ';'.join(sorted(headers))
+        canonical_query = '&'.join(
+            f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" for k, v in sorted(query.items())
+        )
+        canonical_request = '\n'.join([
+            method, path, canonical_query,
+            ''.join(f'{k}:{headers[k]}\n' for k in sorted(headers)),
+            signed, payload_hash,
+        ])
+        string_to_sign = '\n'.join([
+            'AWS4-HMAC-SHA256', amz_date, scope, _sha256(canonical_request.encode('utf-8')),
+        ])
+
+        key = _hmac(('AWS4' + self.secret_key).encode('utf-8'), now.strftime('%Y%m%d'))
+        for part in (self.region, 's3', 'aws4_request'):
+            key = _hmac(key, part)
+        signature = hmac.new(key, string_to_sign.encode('utf-8'), hashlib.sha256).hexdigest()
+
+        headers['authorization'] = (
+            f'AWS4-HMAC-SHA256 Credential={self.access_key}/{scope}, '
+            f'SignedHeaders={signed}, Signature={signature}'
+        )
+        return headers
+
+    def _request(self, method, key, query=None, headers=None, body=b'', ok=(200,)):
+        query = query or {}
+        path = quote(f'{self.pool.base_path}/{self.bucket}/{key}', safe='/-_.~')
+        headers = self._signed_headers(method, path, query, headers or {}, _sha256(body))
+        if query:
+            path += '?' + '&'.join(
+                f"{quote(k, safe='-_.~')}={quote(v, safe='-_.~')}" if v else quote(k, safe='-_.~')
+                for k, v in sorted(query.items())
+            )
+        status, response_headers, data = self.pool.request(method, path, headers, body)
+        if status not in ok:
+            raise StorageError(method, path, status, data)
+        return status, response_headers, data
+
+    def head_object(self, key):
+        """Return the object's headers, or None if it does not exist"""
+        status, headers, _ = self._request('HEAD', key, ok=(200, 404))
+        return headers if status == 200 else None
+
+    def put_object(self, key, body, headers):
+        self._request('PUT', key, headers=headers, body=body)
+        UPLOAD_BYTES.inc(len(body))
+
+    def create_multipart_upload(self, key, headers):
+        _, _, data = self._request('POST', key, query={'uploads': ''}, headers=headers)
+        root = ET.fromstring(data)
+        return root.find('{*}UploadId').text
+
+    def upload_part(self, key, upload_id, number, body):
+        _, headers, _ = self._request(
+            'PUT', key, query={'partNumber': str(number), 'uploadId': upload_id}, body=body
+        )
+        UPLOAD_BYTES.inc(len(body))
+        return headers['etag']
+
+    def complete_multipart_upload(self, key, upload_id, etags):
+        body = ''.join(
+            f'<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>'
+            for number, etag in enumerate(etags, start=1)
+        )
+        body = f'<CompleteMultipartUpload>{body}</CompleteMultipartUpload>'.encode('utf-8')
+        self._request('POST', key, query={'uploadId': upload_id}, body=body)
+
+    def abort_multipart_upload(self, key, upload_id):
+        self._request('DELETE', key, query={'uploadId': upload_id}, ok=(200, 204, 404))
+
+# ============================================================================
+# PUBLISH
+# ============================================================================
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _read_range(path, offset, size):
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        return f.read(size)
+
+def _multipart_upload(client, executor, path, key, size, headers):
+    upload_id = client.create_multipart_upload(key, headers)
+    offsets = range(0, size, PART_SIZE)
+    try:
+        # Each task reads only its own part, so at most pool-size parts are
+        # in memory at once
+        futures = [
+            executor.submit(
+                lambda n, off: client.upload_part(key, upload_id, n, _read_range(path, off, PART_SIZE)),
+                number, offset
+            )
+            for number, offset in enumerate(offsets, start=1)
+        ]
+        etags = [future.result() for future in futures]
+        client.complete_multipart_upload(key, upload_id, etags)
+    except BaseException:
+        client.abort_multipart_upload(key, upload_id)
+        raise
+
+def deck_keys(paths, prefix='decks/'):
+    """[(deck path, object key)] for decks and directories of decks.
+
+    A deck given directly is keyed by its file name; decks found in a
+    directory by their path relative to it. Raises ValueError if two
+    different decks would get the same key.
+    """
+    keys, owners = [], {}
+    for path in paths:
+        root = os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path))
+        for deck in expand_deck_paths([path]):
+            key = prefix + os.path.relpath(deck, root).replace(os.sep, '/')
+            if key in owners:
+                if owners[key] != deck:
+                    raise ValueError(f"{owners[key]} and {deck} would both be published as {key}")
+                continue  # Same deck given twice
+            owners[key] = deck
+            keys.append((deck, key))
+    return keys
+
+def publish_deck(client, path, key, part_executor=None):
+    """Upload one deck to `key` unless the remote copy already has the same sha256"""
+    size = os.path.getsize(path)
+    digest = file_sha256(path)
+
+    remote = client.head_object(key)
+    if remote is not None and remote.get(HASH_META) == digest:
+        UPLOADS.labels('skipped').inc()
+        return PublishResult(path, key, 'skipped', size)
+
+    headers = {'content-type': PPTX_CONTENT_TYPE, HASH_META: digest}
+    if size >= MULTIPART_THRESHOLD and part_executor is not None:
+        _multipart_upload(client, part_executor, path, key, size, headers)
+    else:
+        with open(path, 'rb') as f:
+            client.put_object(key, f.read(), headers)
+
+    UPLOADS.labels('uploaded').inc()
+    return PublishResult(path, key, 'uploaded', size)
+
+def publish_decks(paths, client, prefix='decks/', workers=POOL_SIZE):
+    """Publish decks concurrently; returns PublishResult list in input order.
+
+    Keys come from deck_keys(): colliding decks raise ValueError before
+    any request is sent.
+    """
+    decks = deck_keys(paths, prefix)
+    # Separate executors so deck-level tasks never wait on part uploads
+    # queued behind other decks
+    with ThreadPoolExecutor(workers) as deck_executor, \
+            ThreadPoolExecutor(workers) as part_executor:
+        return list(deck_executor.map(
+            lambda deck: publish_deck(client, *deck, part_executor), decks
+        ))
+
+# ============================================================================
+# MAIN
+# ============================================================================
+
+def main(argv):
+    if any(arg in ('-h', '--help') for arg in argv):
+        print(__doc__.strip())
+        return 0
+
+    paths = argv or [os.path.dirname(os.path.abspath(__file__))]
+    client = S3Client.from_env()
+    try:
+        results = publish_decks(paths, client, prefix=os.environ.get('DECK_STORAGE_PREFIX', 'decks/'))
+    except ValueError as e:
+        print(f"Nothing published: {e}", file=sys.stderr)
+        return 2
+    finally:
+        client.close()
+
+    for result in results:
+        print(f"{result.status:<9} {result.key}  ({result.size} bytes)")
+    uploaded = sum(result.status == 'uploaded' for result in results)
+    print(f"\n{uploaded} uploaded, {len(results) - uploaded} unchanged")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Per-deck render state.
+
+Everything a render mutates or varies per deck - the brand, the slide size
+and the slide partname/id counters - lives in one RenderContext bound to the
+deck's package, not in module globals. Shape helpers find it from the slide
+they draw on with context_of(), so any number of decks can be rendered at
+once on a thread pool. The only state shared between decks is immutable
+(compiled brands) or lock-protected (brand_pack's caches, deck_metrics).
+
+A single deck is still single-threaded: build one deck per thread.
+"""
+
+from brand_pack import get_brand
+
+MIN_SLIDE_ID = 256  # ECMA-376: slide ids start at 256
+
+class RenderContext:
+    """Brand, slide size and id counters for one deck"""
+
+    __slots__ = ('brand', 'slide_width', 'slide_height', 'next_slide_number', 'next_slide_id')
+
+    def __init__(self, brand, slide_width, slide_height):
+        self.brand = brand
+        self.slide_width = slide_width
+        self.slide_height = slide_height
+        self.next_slide_number = 1
+        self.next_slide_id = MIN_SLIDE_ID
+
+def bind_context(prs, context):
+    """Attach `context` to a python-pptx Presentation, continuing its slide counters.
+
+    Slide partnames of an opened deck need not be contiguous (slides get
+    deleted or reordered), so numbering continues after the highest one.
+    """
+    sldIdLst = prs.slides._sldIdLst
+    context.next_slide_number = max([0] + [
+        part.partname.idx for part in prs.part.package.iter_parts()
+        if part.partname.startswith('/ppt/slides/slide')
+    ]) + 1
+    context.next_slide_id = max([MIN_SLIDE_ID - 1] + [sldId.id for sldId in sldIdLst]) + 1
+    prs.part.package.render_context = context
+    return context
+
+def context_of(obj):
+    """RenderContext of the deck a presentation or slide belongs to.
+
+    Decks that were never bound get a default-brand context sized like the deck.
+    """
+    context = getattr(obj, 'context', None)  # Dry-run layout decks and slides carry theirs
+    if context is not None:
+        return context
+
+    package = obj.part.package
+    context = getattr(package, 'render_context', None)
+    if context is None:
+        prs = package.presentation_part.presentation
+        context = bind_context(prs, RenderContext(get_brand(), prs.slide_width, prs.slide_height))
+    return context
+
+def brand_of(obj):
+    """Brand of the deck a presentation or slide belongs to"""
+    return context_of(obj).brand
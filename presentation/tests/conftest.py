@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+"""Shared fixtures for the deck generator tests (run from presentation/: pytest tests)"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import create_presentation as cp  # noqa: E402
+
+
+@pytest.fixture
+def small_deck(tmp_path):
+    """Path of a freshly built two-slide deck (title and overview)"""
+    path = str(tmp_path / 'deck.pptx')
+    cp.create_presentation(slides=[1, 2], output_path=path, verbose=False)
+    return path
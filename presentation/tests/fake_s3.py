@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""In-process stand-in for an S3 endpoint: the calls publish_decks.S3Client makes"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
+from urllib.parse import parse_qs, unquote, urlsplit
+import hashlib
+import itertools
+
+
+class FakeS3:
+    """Objects are kept in memory as {key: (body, sha256 metadata)}; no signature checks"""
+
+    def __init__(self, bucket='decks'):
+        self.bucket = bucket
+        self.objects = {}
+        self.requests = []
+        self.drop = 0          # Close this many connections without answering
+        self.hang_up = 0       # Answer, then close this many kept-alive connections
+        self._uploads = {}
+        self._ids = itertools.count(1)
+        self._lock = Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = Thread(target=self._server.serve_forever, args=(0.05,), daemon=True)
+
+    @property
+    def endpoint(self):
+        return f'http://127.0.0.1:{self._server.server_address[1]}'
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def _handler(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status, body=b'', headers=()):
+                self.send_response(status)
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                if self.command != 'HEAD':
+                    self.wfile.write(body)
+
+            def _handle(self):
+                url = urlsplit(self.path)
+                key = unquote(url.path).split(f'/{fake.bucket}/', 1)[1]
+                query = {k: v[0] for k, v in parse_qs(url.query, keep_blank_values=True).items()}
+                body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+                with fake._lock:
+                    fake.requests.append((self.command, key, sorted(query)))
+                    if fake.drop:
+                        fake.drop -= 1
+                        self.close_connection = True
+                        return
+                    self._dispatch(key, query, body)
+                    if fake.hang_up:
+                        # The client still thinks the connection is open
+                        fake.hang_up -= 1
+                        self.close_connection = True
+
+            def _dispatch(self, key, query, body):
+                meta = self.headers.get('x-amz-meta-sha256')
+                if self.command == 'HEAD':
+                    if key not in fake.objects:
+                        return self._reply(404)
+                    return self._reply(200, headers=[('x-amz-meta-sha256', fake.objects[key][1])])
+                if self.command == 'PUT' and 'partNumber' in query:
+                    parts = fake._uploads[query['uploadId']][1]
+                    parts[int(query['partNumber'])] = body
+                    return self._reply(200, headers=[('ETag', f'"{hashlib.md5(body).hexdigest()}"')])
+                if self.command == 'PUT':
+                    fake.objects[key] = (body, meta)
+                    return self._reply(200)
+                if self.command == 'POST' and 'uploads' in query:
+                    upload_id = str(next(fake._ids))
+                    fake._uploads[upload_id] = (meta, {})
+                    xml = f'<InitiateMultipartUploadResult><UploadId>{upload_id}</UploadId></InitiateMultipartUploadResult>'
+                    return self._reply(200, xml.encode())
+                if self.command == 'POST' and 'uploadId' in query:
+                    meta, parts = fake._uploads.pop(query['uploadId'])
+                    fake.objects[key] = (b''.join(parts[n] for n in sorted(parts)), meta)
+                    return self._reply(200, b'<CompleteMultipartUploadResult/>')
+                if self.command == 'DELETE':
+                    fake._uploads.pop(query.get('uploadId'), None)
+                    return self._reply(204)
+                return self._reply(400)
+
+            do_HEAD = do_GET = do_PUT = do_POST = do_DELETE = _handle
+
+        return Handler
@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+import json
+
+import pytest
+
+from brand_pack import DEFAULT_BRAND, brand_path, compile_brand, get_brand
+
+
+def _pack():
+    with open(brand_path(DEFAULT_BRAND), encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_get_brand_is_cached_while_unchanged():
+    brand = get_brand()
+    assert brand is get_brand(DEFAULT_BRAND)
+    assert set(brand.fonts) == {'heading', 'body', 'mono'}
+
+
+def test_compile_brand_needs_every_slot_and_role():
+    data = _pack()
+    assert compile_brand(data).palette == get_brand().palette
+    del data['fonts']['mono']
+    with pytest.raises(ValueError, match='mono'):
+        compile_brand(data)
+    data = _pack()
+    del data['palette']['accent6']
+    with pytest.raises(ValueError, match='accent6'):
+        compile_brand(data)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+import create_presentation as cp
+from deck_package import slide_part_names
+
+HERE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize('slides, message', [
+    ('12', 'No such slide'),
+    ('0-3', 'Bad slide range'),
+    ('abc', 'Bad slide range'),
+])
+def test_bad_slides_are_usage_errors(slides, message, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        cp.main(['--slides', slides, '--dry-run'])
+    assert exit_info.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_dry_run_piped_into_head_exits_quietly():
+    proc = subprocess.run(
+        f'"{sys.executable}" create_presentation.py --dry-run | head -c 10',
+        shell=True, cwd=HERE, capture_output=True,
+    )
+    assert proc.stdout.startswith(b'{')
+    assert b'Traceback' not in proc.stderr
+
+
+def test_render_subset(tmp_path):
+    out = str(tmp_path / 'subset.pptx')
+    assert cp.main(['--slides', '4-5', '--out', out, '-q']) == 0
+    with zipfile.ZipFile(out) as zf:
+        assert slide_part_names(zf) == ['ppt/slides/slide1.xml', 'ppt/slides/slide2.xml']
+
+
+def test_slide_xml_is_measured_only_on_request(tmp_path):
+    def sizes(**kwargs):
+        events = cp.iter_presentation(slides=[1, 2], output_path=str(tmp_path / 'deck.pptx'), **kwargs)
+        return [event.xml_bytes for event in events if isinstance(event, cp.SlideBuilt)]
+
+    assert sizes() == [None, None]
+    assert all(size > 1000 for size in sizes(measure_xml=True))
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import json
+
+import numpy as np
+
+import create_presentation as cp
+from deck_analytics import (
+    _lesson_labels, _short_ids, funnel_summary, group_by, leaderboard, load_table,
+    module_summary, percentiles, progress_summary, top_n,
+)
+
+ROWS = [
+    # user, lesson id, lesson number, progress, completed, watch seconds
+    ('u1', 'a1b2c3d4-0000-4000-8000-000000000001', '1.1', 100, True, 600),
+    ('u1', 'a1b2c3d4-0000-4000-8000-000000000002', '1.2', 100, True, 1200),
+    ('u2', 'a1b2c3d4-0000-4000-8000-000000000001', '1.1', 100, True, 300),
+    ('u2', 'a1b2c3d4-0000-4000-8000-000000000002', '1.2', 40, False, 120),
+    ('u3', 'a1b2c3d4-0000-4000-8000-000000000001', '1.1', 10, False, 60),
+]
+HEADER = ['tripwire_user_id', 'lesson_id', 'lesson_number', 'video_progress_percent',
+          'is_completed', 'watch_time_seconds']
+
+
+def _export(tmp_path, header=HEADER, rows=ROWS):
+    path = tmp_path / 'progress.json'
+    path.write_text(json.dumps({'data': [dict(zip(header, row)) for row in rows]}), encoding='utf-8')
+    return str(path)
+
+
+def test_group_by_and_percentiles():
+    groups, sums = group_by(np.array(['b', 'a', 'b']), np.array([1.0, np.nan, 2.0]))
+    assert groups.tolist() == ['a', 'b'] and sums.tolist() == [0.0, 3.0]
+    _, counts = group_by(np.array([2, 1, 2]), agg='count')
+    assert counts.tolist() == [1, 2]
+    assert percentiles([1, 2, 3, np.nan], qs=(50,)) == {50: 2.0}
+
+
+def test_top_n():
+    keys, values = top_n(np.array(['a', 'b', 'c']), np.array([1.0, 3.0, 2.0]), n=2)
+    assert keys.tolist() == ['b', 'c'] and values.tolist() == [3.0, 2.0]
+
+
+def test_load_table_json_lines(tmp_path):
+    path = tmp_path / 'funnel.jsonl'
+    path.write_text('{"proftest_count": 10, "purchase_count": 2}\n{"proftest_count": 30, "purchase_count": "3"}\n')
+    table = load_table(str(path))
+    assert funnel_summary(table) == [('Профтест', 40.0, None), ('Покупка', 5.0, 12.5)]
+
+
+def test_leaderboard_and_module_summary(tmp_path):
+    table = load_table(_export(tmp_path))
+    assert leaderboard(table, n=2) == [('u1', 2, 100.0), ('u2', 1, 70.0)]
+    summary = module_summary(table)
+    assert (summary['students'], summary['finished']) == (3, 1)
+    assert summary['watch_minutes_p50'] == 5.0
+
+
+def test_lesson_labels_use_the_export_not_db_ids(tmp_path):
+    table = load_table(_export(tmp_path))
+    lessons = np.unique(table['lesson_id'])
+    assert _lesson_labels(table, lessons, 'lesson_id') == ['Урок 1.1', 'Урок 1.2']
+
+    header = [name for name in HEADER if name != 'lesson_number']
+    rows = [row[:2] + row[3:] for row in ROWS]
+    table = load_table(_export(tmp_path, header, rows))
+    labels = _lesson_labels(table, np.unique(table['lesson_id']), 'lesson_id')
+    assert labels == ['ID ' + ROWS[0][1], 'ID ' + ROWS[1][1]]  # Shared prefix: widened until distinct
+    assert _short_ids(['a' * 20 + 'x', 'b' * 20, 'c' * 10]) == ['aaaaaaaa…', 'bbbbbbbb…', 'c' * 10]
+
+
+def test_lesson_numbers_are_text_in_course_order(tmp_path):
+    header = ['tripwire_user_id', 'lesson_id', 'lesson_number', 'is_completed', 'watch_time_seconds']
+    rows = [('u1', 'c', '1.10', True, 60), ('u1', 'a', '1.1', True, 60), ('u1', 'b', '1.2', False, 60)]
+    path = tmp_path / 'progress.csv'
+    path.write_text('\n'.join(','.join(map(str, row)) for row in [header, *rows]), encoding='utf-8')
+    table = load_table(str(path))
+    summary = progress_summary(table)
+    assert summary['lessons'].tolist() == ['a', 'b', 'c']
+    assert summary['completion_pct'].tolist() == [100.0, 0.0, 100.0]
+    assert _lesson_labels(table, summary['lessons'], 'lesson_id') == ['Урок 1.1', 'Урок 1.2', 'Урок 1.10']
+
+
+def test_results_slide_takes_export_numbers(tmp_path):
+    layout = cp.layout_presentation([cp.RESULTS_SLIDE], results=_export(tmp_path))
+    texts = [shape['text'] for shape in layout.to_dict()['slides'][0]['shapes'] if shape.get('text')]
+    assert any(text.startswith('3 студентов • 1 (33%)') for text in texts)
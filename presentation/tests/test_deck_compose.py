@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+import zipfile
+
+import pytest
+
+import deck_compose
+from deck_compose import compose_decks, parse_slide_ranges, split_deck
+from deck_package import slide_part_names
+
+
+def test_parse_slide_ranges():
+    assert parse_slide_ranges('1-3,5') == [1, 2, 3, 5]
+    assert parse_slide_ranges(' 4 , 2-2 ') == [4, 2]
+    for bad in ('0-3', '3-1', 'x', '1-y', ',', ''):
+        with pytest.raises(ValueError, match='slide'):
+            parse_slide_ranges(bad)
+
+
+def test_split_and_compose_round_trip(small_deck, tmp_path):
+    parts = split_deck(small_deck, {'first': [1], 'second': [2]}, str(tmp_path / 'parts'))
+    out = str(tmp_path / 'joined.pptx')
+    compose_decks([(parts[1], None), (parts[0], None), (small_deck, [2])], out)
+    with zipfile.ZipFile(out) as zf:
+        assert zf.testzip() is None
+        assert len(slide_part_names(zf)) == 3
+
+
+def test_main_reports_bad_ranges(small_deck, tmp_path, capsys):
+    assert deck_compose.main(['split', small_deck, str(tmp_path), 'x=0-1']) == 2
+    assert 'Bad slide range' in capsys.readouterr().err
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import shutil
+
+import pytest
+
+import create_presentation as cp
+from deck_import import import_decks, main, spec_entries, spec_paths
+from deck_parity import compare_decks
+
+
+def _decks(tmp_path, small_deck):
+    for name in ('a', 'b'):
+        os.makedirs(tmp_path / 'in' / name)
+        shutil.copy(small_deck, tmp_path / 'in' / name / 'deck.pptx')
+    return str(tmp_path / 'in')
+
+
+def test_spec_paths_mirror_directories(tmp_path, small_deck):
+    decks = _decks(tmp_path, small_deck)
+    out_dir = str(tmp_path / 'specs')
+    assert [spec for _, spec in spec_paths([decks], out_dir)] == [
+        os.path.join(out_dir, 'a', 'deck.spec.json'), os.path.join(out_dir, 'b', 'deck.spec.json'),
+    ]
+    assert [spec for _, spec in spec_paths([decks])] == [
+        os.path.join(decks, 'a', 'deck.spec.json'), os.path.join(decks, 'b', 'deck.spec.json'),
+    ]
+
+
+def test_same_named_decks_are_rejected(tmp_path, small_deck, capsys):
+    decks = _decks(tmp_path, small_deck)
+    paths = [os.path.join(decks, 'a', 'deck.pptx'), os.path.join(decks, 'b', 'deck.pptx')]
+    with pytest.raises(ValueError, match='would both be imported'):
+        spec_paths(paths, str(tmp_path / 'specs'))
+    assert main([*paths, '--out-dir', str(tmp_path / 'specs'), '--workers', '1']) == 2
+    assert 'would both be imported' in capsys.readouterr().err
+
+
+def test_import_round_trip(tmp_path, small_deck):
+    [(_, spec_path, result)] = import_decks([small_deck], str(tmp_path / 'specs'), workers=1)
+    assert result[0] == 2 and result[3] == 0  # two slides, no approximate colors
+    with open(spec_path, encoding='utf-8') as f:
+        deck = json.load(f)['deck']
+    assert [entry.number for entry in spec_entries(deck)] == [1, 2]
+    out_path = str(tmp_path / 'imported.pptx')
+    cp.create_presentation(deck=deck, output_path=out_path, verbose=False)
+    diffs, _ = compare_decks(small_deck, out_path)
+    assert diffs == []
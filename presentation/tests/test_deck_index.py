@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import os
+import xml.etree.ElementTree as ET
+
+from deck_index import DeckIndex, _shape_text, iter_deck_text, normalize_text, tokenize
+from deck_package import NS
+
+SHAPE = f"""
+<p:sp xmlns:p="{NS['p']}" xmlns:a="{NS['a']}">
+  <p:nvSpPr>
+    <p:cNvPr id="2" name="Box">
+      <a:extLst><a:ext uri="{{FF2B5EF4-FFF2-40B4-BE49-F238E27FC236}}"/></a:extLst>
+    </p:cNvPr>
+    <p:cNvSpPr/><p:nvPr/>
+  </p:nvSpPr>
+  <p:spPr><a:xfrm><a:off x="10" y="20"/><a:ext cx="300" cy="400"/></a:xfrm></p:spPr>
+  <p:txBody><a:bodyPr/><a:p><a:r><a:t>Git push</a:t></a:r></a:p></p:txBody>
+</p:sp>
+"""
+
+
+def test_tokenize_and_normalize():
+    assert tokenize('Git push, ГИТ  Пуш!') == ['git', 'push', 'гит', 'пуш']
+    assert normalize_text('  Быстрый\n СТАРТ ') == 'быстрый старт'
+
+
+def test_shape_geometry_comes_from_its_transform():
+    shape = _shape_text(ET.fromstring(SHAPE), 3)
+    assert (shape.slide, shape.shape_id, shape.name, shape.text) == (3, 2, 'Box', 'Git push')
+    assert (shape.x, shape.y, shape.cx, shape.cy) == (10, 20, 300, 400)
+
+
+def test_index_and_search(tmp_path, small_deck):
+    texts = [shape.text for shape in iter_deck_text(small_deck)]
+    assert 'БЫСТРЫЙ' in texts
+    with DeckIndex(str(tmp_path / 'index.sqlite')) as index:
+        assert index.update([small_deck]) == (1, 0, 0)
+        assert index.update([small_deck]) == (0, 1, 0)
+        hits = index.search('быстрый')
+        assert [(hit.slide, hit.text) for hit in hits] == [(1, 'БЫСТРЫЙ')]
+        assert index.search('no such words') == []
+        os.remove(small_deck)
+        assert index.update([]) == (0, 0, 1)
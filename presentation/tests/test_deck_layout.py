@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+import create_presentation as cp
+from deck_layout import check_layout
+
+
+def test_layout_records_run_styles():
+    layout = cp.layout_presentation([2])
+    shapes = layout.to_dict()['slides'][0]['shapes']
+    number = next(shape for shape in shapes if shape['kind'] == 'number')
+    assert number['runs'] == [
+        {'text': number['text'], 'font': 'Arial Black', 'size': 36, 'bold': True, 'color': 'ACCENT_1'},
+    ]
+    cards = [shape for shape in shapes if shape['kind'] == 'card']
+    assert cards and all(shape['runs'] == [] for shape in cards)
+    texts = [shape for shape in shapes if shape['kind'] == 'text']
+    assert all(len(shape['runs']) == 1 and shape['runs'][0]['size'] for shape in texts)
+
+
+def test_check_layout_reports_bad_shapes():
+    layout = cp.layout_presentation([1])
+    assert check_layout(layout) == []
+    slide = layout.slides[0]
+    slide.record('text', -1, 0, 10, 10, 'left of the slide')
+    slide.record('rectangle', 0, 0, 0, 10)
+    assert check_layout(layout) == [
+        "slide 1 shape %d (text 'left of the slide'): outside the slide" % (len(slide.shapes) - 1),
+        "slide 1 shape %d (rectangle): empty size 0x10" % len(slide.shapes),
+    ]
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+import os
+import stat
+import threading
+
+from deck_metrics import (
+    Counter, Histogram, dump_metrics, merge_metrics, metrics_delta, render_metrics, snapshot_metrics,
+)
+
+CALLS = Counter('test_calls_total', 'Calls', ('kind',))
+SECONDS = Histogram('test_seconds', 'Seconds', buckets=(0.1, 1))
+
+
+def test_counter_sums_threads():
+    child = CALLS.labels('threads')
+    start = child.value
+    workers = [threading.Thread(target=lambda: [child.inc() for _ in range(1000)]) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert child.value - start == 4000
+
+
+def test_histogram_exposition():
+    SECONDS.observe(0.05)
+    SECONDS.observe(5)
+    text = render_metrics()
+    assert 'test_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_seconds_bucket{le="+Inf"} 2' in text
+    assert 'test_seconds_count 2' in text
+
+
+def test_delta_and_merge():
+    before = snapshot_metrics()
+    CALLS.labels('delta').inc(3)
+    delta = metrics_delta(before)
+    assert delta == {('test_calls_total', ('delta',)): [3]}
+
+    merge_metrics(delta)  # As if a worker had sent it back
+    assert CALLS.labels('delta').value == 6
+
+
+def test_dump_metrics_is_world_readable(tmp_path):
+    path = tmp_path / 'deck.prom'
+    umask = os.umask(0o022)
+    try:
+        dump_metrics(str(path))
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    assert 'test_seconds_count' in path.read_text(encoding='utf-8')
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+import zipfile
+
+import pytest
+
+import create_presentation as cp
+from deck_package import (
+    ContentTypes, PackageWriter, atomic_write, compression_level, read_raw_entry,
+    relative_target, rels_name, resolve_target, save_presentation, slide_part_names,
+)
+
+
+def test_part_names():
+    assert rels_name('ppt/slides/slide1.xml') == 'ppt/slides/_rels/slide1.xml.rels'
+    assert resolve_target('ppt/slides/slide1.xml', '../media/image1.png') == 'ppt/media/image1.png'
+    assert resolve_target('ppt/slides/slide1.xml', '/ppt/media/image1.png') == 'ppt/media/image1.png'
+    assert relative_target('ppt/slides/slide1.xml', 'ppt/media/image1.png') == '../media/image1.png'
+
+
+def test_compression_level():
+    assert compression_level('ppt/media/image1.png') is None
+    assert compression_level('ppt/slides/slide1.xml') == 1
+    assert compression_level('docProps/thumbnail.bin') == 6
+
+
+def test_content_types_override_only_when_needed():
+    types = ContentTypes({'xml': 'application/xml'})
+    types.add('ppt/presentation.xml', 'application/vnd.presentation+xml')
+    types.add('docProps/app.xml', 'application/xml')
+    assert types.get('ppt/presentation.xml') == 'application/vnd.presentation+xml'
+    assert types.get('docProps/app.xml') == 'application/xml'
+
+
+def test_package_writer_round_trip():
+    buf = io.BytesIO()
+    with PackageWriter(buf, (2024, 1, 2, 3, 4, 6)) as writer:
+        writer.write('a.xml', b'<a/>' * 100, level=1)
+        writer.write('b.png', b'\x89PNG', level=None)
+        with pytest.raises(ValueError):
+            writer.write('a.xml', b'')
+
+    copy = io.BytesIO()
+    with zipfile.ZipFile(buf) as src, PackageWriter(copy) as writer:
+        for info in src.infolist():
+            writer.copy_entry(buf, info, 'copy/' + info.filename)
+        assert read_raw_entry(buf, src.getinfo('b.png')) == b'\x89PNG'
+
+    with zipfile.ZipFile(copy) as zf:
+        assert zf.testzip() is None
+        assert zf.read('copy/a.xml') == b'<a/>' * 100
+        assert zf.getinfo('copy/b.png').compress_type == zipfile.ZIP_STORED
+
+
+def test_package_writer_skips_central_directory_on_error():
+    buf = io.BytesIO()
+    with pytest.raises(RuntimeError):
+        with PackageWriter(buf) as writer:
+            writer.write('a.xml', b'<a/>')
+            raise RuntimeError('boom')
+    with pytest.raises(zipfile.BadZipFile):
+        zipfile.ZipFile(buf)
+
+
+def test_atomic_write_keeps_old_file_on_error(tmp_path):
+    path = tmp_path / 'deck.pptx'
+    path.write_bytes(b'old')
+    os.chmod(path, 0o640)
+    with pytest.raises(RuntimeError):
+        with atomic_write(str(path)) as f:
+            f.write(b'partial')
+            raise RuntimeError('boom')
+    assert path.read_bytes() == b'old'
+    assert os.listdir(tmp_path) == ['deck.pptx']
+
+    with atomic_write(str(path)) as f:
+        f.write(b'new')
+    assert path.read_bytes() == b'new'
+    assert os.stat(path).st_mode & 0o777 == 0o640
+
+    copy = tmp_path / 'copy.pptx'
+    with atomic_write(str(copy), mode_from=str(path)) as f:
+        f.write(b'copy')
+    assert os.stat(copy).st_mode & 0o777 == 0o640
+
+
+def test_save_presentation_is_reproducible(tmp_path, monkeypatch):
+    monkeypatch.setenv('SOURCE_DATE_EPOCH', '1700000000')
+    digests = []
+    for name in ('a.pptx', 'b.pptx'):
+        prs = cp.new_presentation()
+        cp.render_slides(prs, cp.select_slides([1]))
+        manifest = save_presentation(prs, str(tmp_path / name), workers=2, reproducible=True)
+        digests.append(manifest)
+    assert digests[0] == digests[1]
+    assert (tmp_path / 'a.pptx').read_bytes() == (tmp_path / 'b.pptx').read_bytes()
+    with zipfile.ZipFile(tmp_path / 'a.pptx') as zf:
+        assert slide_part_names(zf) == ['ppt/slides/slide1.xml']
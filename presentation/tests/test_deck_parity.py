@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+import xml.etree.ElementTree as ET
+
+import deck_parity
+from deck_package import NS
+
+SHAPE = f"""
+<p:sp xmlns:p="{NS['p']}" xmlns:a="{NS['a']}">
+  <p:nvSpPr>
+    <p:cNvPr id="2" name="Box">
+      <a:extLst><a:ext uri="{{FF2B5EF4-FFF2-40B4-BE49-F238E27FC236}}"/></a:extLst>
+    </p:cNvPr>
+    <p:cNvSpPr/><p:nvPr/>
+  </p:nvSpPr>
+  <p:spPr>
+    <a:xfrm><a:off x="914400" y="457200"/><a:ext cx="1828800" cy="914400"/></a:xfrm>
+    <a:prstGeom prst="rect"/>
+    <a:solidFill><a:schemeClr val="accent1"><a:lumMod val="50000"/></a:schemeClr></a:solidFill>
+  </p:spPr>
+</p:sp>
+"""
+
+
+def test_normalize_shape_reads_the_shape_transform():
+    shape = deck_parity.normalize_shape(ET.fromstring(SHAPE), {'accent1': '00FF88'})
+    assert (shape.kind, shape.x, shape.y, shape.cx, shape.cy) == ('rect', 914400, 457200, 1828800, 914400)
+    assert shape.fill == '008044'
+
+
+def test_compare_a_deck_with_itself(small_deck):
+    diffs, counts = deck_parity.compare_decks(small_deck, small_deck)
+    assert diffs == [] and counts['python'] == counts['js'] > 0
+
+
+def test_run_reports_a_missing_generator(monkeypatch, capsys):
+    monkeypatch.setitem(deck_parity.GENERATORS, 'python', ['no-such-generator'])
+    assert deck_parity.main(['run']) == 2
+    assert 'not installed' in capsys.readouterr().err
+
+
+def test_compare_reports_a_missing_deck(small_deck, tmp_path, capsys):
+    assert deck_parity.main(['compare', small_deck, str(tmp_path / 'missing.pptx')]) == 2
+    assert capsys.readouterr().err.startswith('deck_parity.py: error: ')
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import os
+import stat
+
+import pytest
+from lxml import etree
+
+from deck_index import shape_text
+from deck_package import NS
+from deck_parity import normalize_deck
+from deck_patch import Edit, parse_edits, patch_deck, set_shape_text
+
+
+def test_parse_edits():
+    edits = parse_edits([
+        {'find': '  Быстрый ', 'text': 'Новый'},
+        {'slide': 3, 'shape': 'TextBox 12', 'text': 'x'},
+    ])
+    assert edits == [Edit(None, None, 'быстрый', 'Новый'), Edit(3, 'TextBox 12', None, 'x')]
+
+
+@pytest.mark.parametrize('item, message', [
+    ({'find': 'a'}, 'needs "text"'),
+    ({'find': 'a', 'shape': 1, 'slide': 1, 'text': 'b'}, 'exactly one'),
+    ({'shape': 1, 'text': 'b'}, '"shape" needs a "slide"'),
+])
+def test_parse_edits_rejects(item, message):
+    with pytest.raises(ValueError, match=message):
+        parse_edits([item])
+
+
+def test_new_text_takes_the_first_run_format():
+    elem = etree.fromstring(f"""
+        <p:sp xmlns:p="{NS['p']}" xmlns:a="{NS['a']}"><p:txBody><a:bodyPr/><a:p>
+          <a:r><a:rPr sz="2000"/><a:t>Old </a:t></a:r><a:r><a:rPr b="1"/><a:t>bold</a:t></a:r>
+        </a:p></p:txBody></p:sp>""")
+    set_shape_text(elem, 'One\nTwo')
+    assert shape_text(elem) == 'One\nTwo'
+    assert [r.get('sz') for r in elem.iter(f"{{{NS['a']}}}rPr")] == ['2000', '2000']
+
+
+def test_patch_deck_keeps_the_deck_mode(small_deck, tmp_path):
+    os.chmod(small_deck, 0o644)
+    out_path = str(tmp_path / 'patched.pptx')
+    assert patch_deck(small_deck, parse_edits([{'find': 'Быстрый', 'text': 'Новый'}]), out_path) == 1
+    assert stat.S_IMODE(os.stat(out_path).st_mode) == 0o644
+    texts = [shape.text for shape in normalize_deck(out_path)[0][1]]
+    assert 'Новый' in texts and 'БЫСТРЫЙ' not in texts
+
+    with pytest.raises(LookupError):
+        patch_deck(small_deck, parse_edits([{'slide': 1, 'shape': 'Nope', 'text': 'x'}]))
@@ -0,0 +1,13 @@
+# -*- coding: utf-8 -*-
+import create_presentation as cp
+from deck_parity import normalize_deck
+
+
+def test_spilled_build_matches_in_memory(tmp_path):
+    paths = {}
+    for name, budget in (('memory', None), ('spilled', 1)):
+        paths[name] = str(tmp_path / f'{name}.pptx')
+        events = list(cp.iter_presentation(slides=[1, 2, 3], output_path=paths[name], memory_budget=budget))
+        sizes = [event.xml_bytes for event in events if isinstance(event, cp.SlideBuilt)]
+        assert all(sizes) == (budget is not None)  # The spool needs slide sizes
+    assert normalize_deck(paths['spilled']) == normalize_deck(paths['memory'])
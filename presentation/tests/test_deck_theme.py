@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import os
+import stat
+import zipfile
+
+import pytest
+
+import create_presentation as cp
+from deck_package import read_raw_entry
+from deck_theme import (
+    THEME_PART, THEME_PART_RE, adjust_luminance, apply_brightness, apply_palette, normalize_palette,
+    reskin_deck,
+)
+
+
+def test_normalize_palette():
+    assert normalize_palette({'accent1': '#00ff88'}) == {'accent1': '00FF88'}
+    with pytest.raises(ValueError):
+        normalize_palette({'accent9': '#00FF88'})
+    with pytest.raises(ValueError):
+        normalize_palette({'accent1': '#0F8'})
+
+
+def test_adjust_luminance():
+    assert adjust_luminance('00FF88') == '00FF88'
+    assert adjust_luminance('00FF88', 0.0) == '000000'
+    assert adjust_luminance('000000', 0.0, 1.0) == 'FFFFFF'
+
+
+def test_tints_stay_distinct_from_their_slot():
+    assert apply_brightness('0A0A0A', cp.CARD_EDGE.brightness) == '202020'
+    assert apply_brightness('00FF88', cp.ACID_15.brightness) == '002614'
+
+
+def test_apply_palette_rewrites_slots(small_deck):
+    with zipfile.ZipFile(small_deck) as zf:
+        theme = zf.read(THEME_PART)
+    patched = apply_palette(theme, {'accent1': '#123456'}, name='Test')
+    assert b'val="123456"' in patched
+    assert b'name="Test"' in patched
+
+
+def test_brand_accent_and_link_slots_are_usable_colors():
+    palette = cp.get_brand().palette
+    for slot in ('accent3', 'accent4', 'accent5', 'accent6', 'hlink', 'folHlink'):
+        # Not a near-black tint: some channel is well above the background
+        assert max(int(palette[slot][i:i + 2], 16) for i in (0, 2, 4)) > 0x80, slot
+
+
+def test_reskin_copies_untouched_entries_raw(small_deck, tmp_path):
+    os.chmod(small_deck, 0o644)
+    out = str(tmp_path / 'reskinned.pptx')
+    reskin_deck(small_deck, {'accent1': '#FF0000'}, out_path=out)
+
+    assert stat.S_IMODE(os.stat(out).st_mode) == 0o644
+    with open(small_deck, 'rb') as f1, open(out, 'rb') as f2, \
+            zipfile.ZipFile(f1) as src, zipfile.ZipFile(f2) as dst:
+        assert dst.testzip() is None
+        assert dst.namelist() == src.namelist()
+        for info in src.infolist():
+            if THEME_PART_RE.fullmatch(info.filename):
+                assert b'FF0000' in dst.read(info.filename)
+            else:
+                assert read_raw_entry(f2, dst.getinfo(info.filename)) == read_raw_entry(f1, info)
+
+
+def test_reskin_rewrites_every_theme(small_deck, tmp_path):
+    two_themes = str(tmp_path / 'two_themes.pptx')
+    with zipfile.ZipFile(small_deck) as src, zipfile.ZipFile(two_themes, 'w', zipfile.ZIP_DEFLATED) as dst:
+        for name in src.namelist():
+            dst.writestr(name, src.read(name))
+        dst.writestr('ppt/theme/theme9.xml', src.read(THEME_PART))
+    reskin_deck(two_themes, {'accent1': '#FF0000'})
+    with zipfile.ZipFile(two_themes) as zf:
+        assert all(b'FF0000' in zf.read(name) for name in (THEME_PART, 'ppt/theme/theme9.xml'))
+    assert os.listdir(tmp_path).count('two_themes.pptx') == 1 and len(os.listdir(tmp_path)) == 2
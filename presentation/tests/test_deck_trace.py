@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import create_presentation as cp
+from deck_parity import compare_decks
+from deck_trace import read_trace, record_trace, replay_trace, trace_stats
+
+
+def test_record_and_replay(tmp_path):
+    trace_path, deck_path = str(tmp_path / 'build.trace.gz'), str(tmp_path / 'deck.pptx')
+    with record_trace(trace_path) as recorder:
+        cp.create_presentation(slides=[1, 2], output_path=deck_path, verbose=False)
+    assert recorder.calls > 0
+    stats = trace_stats(trace_path)
+    assert sum(calls for calls, _ in stats.values()) == recorder.calls
+
+    replayed = str(tmp_path / 'replayed.pptx')
+    replay_trace(trace_path, replayed)
+    diffs, _ = compare_decks(deck_path, replayed)
+    assert diffs == []
+
+
+def test_read_trace_rejects_other_files(tmp_path, small_deck):
+    with pytest.raises(OSError):
+        read_trace(small_deck)
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+import zipfile
+
+import create_presentation as cp
+from deck_metrics import DECKS_RENDERED
+from deck_package import slide_part_names
+from deck_variants import Segment, plan_variants, render_variants
+
+
+def _job(tmp_path, name, slides, **options):
+    args = cp.parse_args(['--out', str(tmp_path / f'{name}.pptx'), '--slides', slides])
+    return cp._job(args, options)
+
+
+def test_plan_variants_shares_prefixes(tmp_path):
+    jobs = [_job(tmp_path, 'a', '1-4'), _job(tmp_path, 'b', '1-3,5'), _job(tmp_path, 'c', '6')]
+    segments, paths = plan_variants(jobs)
+    assert segments == [
+        Segment(0, 0, 3, True), Segment(0, 3, 4, False), Segment(1, 3, 4, False), Segment(2, 0, 1, False),
+    ]
+    assert paths == [[0, 1], [0, 2], [3]]
+
+
+def test_plan_variants_keeps_brands_apart(tmp_path):
+    jobs = [_job(tmp_path, 'a', '1-2'), _job(tmp_path, 'b', '1-2', variant='not-the-default')]
+    segments, paths = plan_variants(jobs)
+    assert [segment.shared for segment in segments] == [False, False] and paths == [[0], [1]]
+
+
+def test_render_variants(tmp_path):
+    jobs = [_job(tmp_path, 'a', '1-3'), _job(tmp_path, 'b', '1-2,4')]
+    rendered = DECKS_RENDERED.labels().value
+    paths = render_variants(jobs)
+    assert DECKS_RENDERED.labels().value == rendered + 2
+    for path in paths:
+        with zipfile.ZipFile(path) as zf:
+            assert len(slide_part_names(zf)) == 3
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import threading
+import zipfile
+
+import pytest
+
+import create_presentation as cp
+from deck_metrics import DECKS_RENDERED
+from deck_package import slide_part_names
+from deck_workers import DeckWorkerPool, job_slide_numbers, repeats_lesson_slides, split_slides
+
+
+def _job(tmp_path, **options):
+    args = cp.parse_args(['--out', str(tmp_path / 'deck.pptx'), *options.pop('argv', ())])
+    return cp._job(args, options)
+
+
+def test_split_slides():
+    assert split_slides([1, 2, 3, 4, 5], 2) == [[1, 2, 3], [4, 5]]
+    assert split_slides([1, 2], 5) == [[1], [2]]
+    assert split_slides([7], 0) == [[7]]
+
+
+def test_job_slide_numbers(tmp_path):
+    assert job_slide_numbers(_job(tmp_path, argv=['--slides', '4-6,2'])) == [4, 5, 6, 2]
+    assert job_slide_numbers(_job(tmp_path)) == [entry.number for entry in cp.select_slides()]
+
+
+def test_pool_refuses_to_fork_with_threads_running():
+    stop = threading.Event()
+    thread = threading.Thread(target=stop.wait)
+    thread.start()
+    try:
+        with pytest.raises(RuntimeError):
+            DeckWorkerPool(1, start_method='fork')
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_pool_renders_and_merges_worker_metrics(tmp_path):
+    job = _job(tmp_path, argv=['--slides', '1-3'])
+    with DeckWorkerPool(1) as pool:
+        rendered = DECKS_RENDERED.labels().value
+        path = pool.submit(job).result()
+        assert DECKS_RENDERED.labels().value == rendered + 1
+    with zipfile.ZipFile(path) as zf:
+        assert len(slide_part_names(zf)) == 3
+
+
+def test_render_deck_counts_one_deck(tmp_path):
+    job = _job(tmp_path, argv=['--slides', '1-6'])
+    with DeckWorkerPool(1) as pool:
+        rendered = DECKS_RENDERED.labels().value
+        path = pool.render_deck(job, chunks=3)
+        assert DECKS_RENDERED.labels().value == rendered + 1
+    with zipfile.ZipFile(path) as zf:
+        assert slide_part_names(zf) == [f'ppt/slides/slide{n}.xml' for n in range(1, 7)]
+
+
+def test_repeated_lesson_slides_are_rendered_whole(tmp_path, monkeypatch):
+    job = _job(tmp_path, argv=['--slides', '3-4,3-4'])
+    assert repeats_lesson_slides(job)
+    assert not repeats_lesson_slides(_job(tmp_path, argv=['--slides', '1-3,1-3']))
+    with DeckWorkerPool(1) as pool:
+        monkeypatch.setattr(pool, 'submit_chunk', lambda job: pytest.fail('split into chunks'))
+        path = pool.render_deck(job, chunks=2)
+    with zipfile.ZipFile(path) as zf:
+        assert len(slide_part_names(zf)) == 4
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+import stat
+import zipfile
+
+import pytest
+
+import create_presentation as cp
+from deck_package import read_rels
+from lesson_media import load_media_map, pack_deck
+from lesson_notes import LESSON_SLIDES
+
+CLIPS = {'1.1': {'video': 'https://cdn.example.com/l11.mp4', 'poster': 'l11.jpg'}}
+
+
+def _deck(tmp_path, media):
+    path = str(tmp_path / 'deck.pptx')
+    cp.create_presentation(slides=[LESSON_SLIDES['1.1']], output_path=path, verbose=False, media=media)
+    return path
+
+
+def test_load_media_map_resolves_local_paths(tmp_path):
+    path = tmp_path / 'media.json'
+    path.write_text(json.dumps(CLIPS))
+    clip = load_media_map(str(path))['1.1']
+    assert clip['video'] == CLIPS['1.1']['video']
+    assert clip['poster'] == 'file://' + str(tmp_path / 'l11.jpg')
+
+
+def test_clips_are_linked_then_packed(tmp_path):
+    path = _deck(tmp_path, CLIPS)
+    os.chmod(path, 0o644)
+    with zipfile.ZipFile(path) as zf:
+        rels = read_rels(zf, 'ppt/slides/slide1.xml').values()
+        assert {target for _, target, external in rels if external} == set(CLIPS['1.1'].values())
+
+    fetched = []
+    assert pack_deck(path, fetch=lambda url: fetched.append(url) or b'media', workers=1) == 2
+    assert sorted(fetched) == sorted(CLIPS['1.1'].values())
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o644
+    with zipfile.ZipFile(path) as zf:
+        assert not any(external for _, _, external in read_rels(zf, 'ppt/slides/slide1.xml').values())
+
+
+def test_video_needs_a_poster(tmp_path):
+    with pytest.raises(ValueError, match='poster'):
+        _deck(tmp_path, {'1.1': {'video': 'https://cdn.example.com/l11.mp4'}})
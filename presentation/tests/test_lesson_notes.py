@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+import logging
+
+import pytest
+
+import create_presentation as cp
+from lesson_notes import (
+    Chunk, Cue, iter_chunks, iter_cues, lesson_for_path, parse_transcript_args, write_notes,
+)
+
+SRT = """1
+00:00:01,000 --> 00:00:04,000
+Привет, <i>это</i> урок
+
+2
+00:00:59,500 --> 00:01:02,000
+вторая фраза
+в две строки
+
+3
+01:00:00,000 --> 01:00:02,000
+через час
+"""
+
+VTT = """WEBVTT
+
+00:05.000 --> 00:07.000
+короткий формат
+"""
+
+
+def _slide():
+    prs = cp.new_presentation()
+    cp.render_slides(prs, cp.select_slides([4]))
+    return prs.slides[0]
+
+
+def test_iter_cues_srt_and_vtt():
+    cues = list(iter_cues(SRT.splitlines()))
+    assert cues == [
+        Cue(1.0, 4.0, 'Привет, это урок'),
+        Cue(59.5, 62.0, 'вторая фраза в две строки'),
+        Cue(3600.0, 3602.0, 'через час'),
+    ]
+    assert list(iter_cues(VTT.splitlines())) == [Cue(5.0, 7.0, 'короткий формат')]
+
+
+def test_iter_chunks_keeps_every_cue():
+    cues = [Cue(i, i + 1, f'word{i} ' * 20) for i in range(120)]
+    chunks = list(iter_chunks(cues))
+    assert [chunk.start for chunk in chunks] == [0, 60]
+    assert sum(len(chunk.text) for chunk in chunks) == len(' '.join(cue.text for cue in cues)) - 1
+
+
+def test_iter_chunks_cap_is_opt_in_and_logged(caplog):
+    cues = [Cue(0, 1, 'a ' * 200)]
+    with caplog.at_level(logging.WARNING, logger='lesson_notes'):
+        chunk, = iter_chunks(cues, chunk_chars=50)
+    assert len(chunk.text) <= 51 and chunk.text.endswith('…')
+    assert 'clipped' in caplog.text
+
+
+def test_write_notes_writes_everything():
+    slide = _slide()
+    chunks = [Chunk(i * 60, 'x' * 5000) for i in range(5)]
+    written = write_notes(slide, iter(chunks))
+    assert written == sum(len(f'[{i:02d}:00] ') + 5000 for i in range(5))
+    assert len(slide.notes_slide.notes_text_frame.paragraphs) == 5
+
+
+def test_write_notes_cap_drains_and_logs(caplog):
+    slide = _slide()
+    consumed = []
+
+    def chunks():
+        for i in range(4):
+            consumed.append(i)
+            yield Chunk(i * 60, 'y' * 100)
+
+    with caplog.at_level(logging.WARNING, logger='lesson_notes'):
+        written = write_notes(slide, chunks(), max_chars=250)
+    assert consumed == [0, 1, 2, 3]
+    assert written == 2 * len('[00:00] ' + 'y' * 100)
+    assert slide.notes_slide.notes_text_frame.paragraphs[-1].text == '[02:00+] …'
+    assert 'capped' in caplog.text
+
+
+def test_lesson_arguments():
+    assert lesson_for_path('/tmp/lesson_1_3.vtt') == '1.3'
+    with pytest.raises(ValueError):
+        lesson_for_path('intro.vtt')
+    assert parse_transcript_args(['1.2=a.srt', 'lesson-1-4.vtt']) == {'1.2': 'a.srt', '1.4': 'lesson-1-4.vtt'}
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+import pytest
+
+import perf_gate
+from perf_gate import ci_order, compare_metric, main, median_ci, min_runs
+
+
+def test_median_ci_order_statistics():
+    assert min_runs() == 6
+    assert ci_order(6) == (0, 0.96875)
+    assert ci_order(9) == (1, 0.9609375)
+    assert median_ci([5, 1, 4, 2, 3, 9, 7, 8, 6]) == (5, 2, 8)
+
+
+def test_median_ci_refuses_too_few_runs():
+    with pytest.raises(ValueError, match='at least 6'):
+        median_ci([1, 2, 3, 4, 5])
+
+
+def test_compare_metric_needs_separated_intervals():
+    baseline = [1.0, 1.01, 1.02, 0.99, 1.0, 1.01]
+    assert compare_metric(baseline, [1.5, 1.52, 1.49, 1.51, 1.5, 1.5], 0.1)[0] == 'regressed'
+    assert compare_metric(baseline, [0.5, 0.52, 0.49, 0.51, 0.5, 0.5], 0.1)[0] == 'improved'
+    assert compare_metric(baseline, [1.0, 3.0, 1.02, 0.99, 1.3, 1.01], 0.1)[0] == 'ok'
+
+
+def test_too_few_runs_is_a_usage_error(capsys):
+    with pytest.raises(SystemExit) as exit:
+        main(['check', '--runs', '3'])
+    assert exit.value.code == 2 and 'at least 6' in capsys.readouterr().err
+
+
+def test_run_sample_survives_a_chatty_benchmark(tmp_path, monkeypatch):
+    (tmp_path / 'benchmarks.py').write_text(
+        "import json, sys\n"
+        "sys.stderr.write('x' * 2**20)\n"
+        "print(json.dumps({sys.argv[1]: {'seconds': 0.5, 'bytes': 10}}))\n"
+    )
+    monkeypatch.setattr(perf_gate, 'HERE', str(tmp_path))
+    sample = perf_gate.run_sample('fake', 1)
+    assert (sample['seconds'], sample['bytes']) == (0.5, 10) and sample['peak_rss_mb'] > 0
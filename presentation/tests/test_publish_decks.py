@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import http.client
+import os
+
+import pytest
+
+import publish_decks
+from fake_s3 import FakeS3
+from publish_decks import S3Client, deck_keys, publish_decks as publish
+
+
+@pytest.fixture
+def storage():
+    with FakeS3() as fake:
+        client = S3Client(fake.endpoint, fake.bucket, 'key', 'secret', pool_size=2)
+        yield fake, client
+        client.close()
+
+
+def _deck(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+
+def test_directory_decks_keep_relative_keys(tmp_path):
+    a = _deck(str(tmp_path / 'a' / 'deck.pptx'), b'a')
+    b = _deck(str(tmp_path / 'b' / 'deck.pptx'), b'b')
+    assert deck_keys([str(tmp_path)], 'decks/') == [(a, 'decks/a/deck.pptx'), (b, 'decks/b/deck.pptx')]
+    # The same deck twice is published once
+    assert deck_keys([a, str(tmp_path / 'a')]) == [(a, 'decks/deck.pptx')]
+
+
+def test_colliding_keys_are_refused_before_upload(tmp_path, storage):
+    fake, client = storage
+    a = _deck(str(tmp_path / 'a' / 'deck.pptx'), b'a')
+    b = _deck(str(tmp_path / 'b' / 'deck.pptx'), b'b')
+    with pytest.raises(ValueError, match='deck.pptx'):
+        publish([a, b], client)
+    assert fake.requests == []
+
+
+def test_unchanged_decks_are_skipped(tmp_path, storage):
+    fake, client = storage
+    _deck(str(tmp_path / 'a' / 'deck.pptx'), b'first')
+    _deck(str(tmp_path / 'b' / 'deck.pptx'), b'second')
+
+    results = publish([str(tmp_path)], client)
+    assert [(r.key, r.status) for r in results] == [('decks/a/deck.pptx', 'uploaded'), ('decks/b/deck.pptx', 'uploaded')]
+    assert fake.objects['decks/b/deck.pptx'] == (b'second', hashlib.sha256(b'second').hexdigest())
+
+    _deck(str(tmp_path / 'b' / 'deck.pptx'), b'changed')
+    results = publish([str(tmp_path)], client)
+    assert [r.status for r in results] == ['skipped', 'uploaded']
+    assert fake.objects['decks/b/deck.pptx'][0] == b'changed'
+
+
+def test_stale_pooled_connection_is_retried(tmp_path, storage):
+    fake, client = storage
+    deck = _deck(str(tmp_path / 'deck.pptx'), b'x' * 100)
+    fake.hang_up = 1  # After the HEAD: the PUT goes out on a closed connection
+    result, = publish([deck], client)
+    assert result.status == 'uploaded'
+    assert fake.objects['decks/deck.pptx'][0] == b'x' * 100
+    assert [method for method, _, _ in fake.requests] == ['HEAD', 'PUT']
+
+
+def test_request_that_reached_the_server_is_not_resent(tmp_path, storage):
+    fake, client = storage
+    deck = _deck(str(tmp_path / 'deck.pptx'), b'x' * 100)
+    fake.drop = 1
+    with pytest.raises(http.client.RemoteDisconnected):
+        publish([deck], client)
+    assert len(fake.requests) == 1
+
+
+def test_failed_connection_is_closed(storage, monkeypatch):
+    fake, client = storage
+    closed = []
+    real_close = http.client.HTTPConnection.close
+    monkeypatch.setattr(http.client.HTTPConnection, 'request', lambda *args, **kwargs: 1 / 0)
+    monkeypatch.setattr(http.client.HTTPConnection, 'close',
+                        lambda conn: closed.append(conn) or real_close(conn))
+    with pytest.raises(ZeroDivisionError):
+        client.head_object('decks/deck.pptx')
+    assert len(closed) == 1 and client.pool._idle.empty()
+
+
+def test_multipart_upload(tmp_path, storage, monkeypatch):
+    fake, client = storage
+    monkeypatch.setattr(publish_decks, 'MULTIPART_THRESHOLD', 1000)
+    monkeypatch.setattr(publish_decks, 'PART_SIZE', 400)
+    content = os.urandom(1500)
+    deck = _deck(str(tmp_path / 'big.pptx'), content)
+    result, = publish([deck], client)
+    assert result.status == 'uploaded'
+    assert fake.objects['decks/big.pptx'] == (content, hashlib.sha256(content).hexdigest())
+    assert sum(method == 'PUT' for method, _, _ in fake.requests) == 4
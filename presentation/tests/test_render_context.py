@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+import zipfile
+
+import create_presentation as cp
+from brand_pack import get_brand
+from deck_package import save_presentation, slide_part_names
+from render_context import MIN_SLIDE_ID, RenderContext, bind_context, context_of
+
+
+def test_new_deck_counters():
+    prs = cp.new_presentation()
+    ctx = context_of(prs)
+    assert (ctx.next_slide_number, ctx.next_slide_id) == (1, MIN_SLIDE_ID)
+    cp.render_slides(prs, cp.select_slides([1, 2]))
+    assert (ctx.next_slide_number, ctx.next_slide_id) == (3, MIN_SLIDE_ID + 2)
+
+
+def test_bind_continues_after_highest_partname(tmp_path):
+    prs = cp.new_presentation()
+    cp.render_slides(prs, cp.select_slides([1, 2, 3]))
+    # Unlist the second slide but keep its part: slide1..3.xml, two listed
+    prs.slides._sldIdLst.remove(prs.slides._sldIdLst[1])
+
+    ctx = bind_context(prs, RenderContext(get_brand(), prs.slide_width, prs.slide_height))
+    assert ctx.next_slide_number == 4
+    cp.add_slide(prs, prs.slide_layouts[6])
+    path = str(tmp_path / 'gaps.pptx')
+    save_presentation(prs, path)
+    with zipfile.ZipFile(path) as zf:
+        assert slide_part_names(zf) == ['ppt/slides/slide1.xml', 'ppt/slides/slide3.xml', 'ppt/slides/slide4.xml']